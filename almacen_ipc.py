@@ -0,0 +1,152 @@
+"""Almacén columnar binario de la serie IPC.
+
+Cada serie se guarda en un directorio con una columna por archivo:
+
+    meta.json   -> número de filas, tipos de las columnas y revisión de datos
+    mes.i32     -> ordinal del mes (año * 12 + mes - 1), int32 little-endian
+    ipc.f64     -> valor del índice, float64 little-endian
+
+Los archivos se abren con ``np.memmap`` (solo lectura), así que cargar la
+serie no parsea texto ni crea objetos Python por fila y las páginas se
+comparten entre procesos que lean el mismo almacén.
+"""
+
+import json
+import os
+from collections import namedtuple
+
+import numpy as np
+
+FORMATO = 1
+COLUMNAS = {"mes": "<i4", "ipc": "<f8"}
+EXTENSIONES = {"<i4": "i32", "<f8": "f64"}
+
+RUTA_NACIONAL = os.path.join(os.path.dirname(os.path.abspath(__file__)), "datos", "ipc_nacional")
+# Artefactos de la ingesta (tabla larga, cubo) y puntero a la última
+DIR_CACHE = os.path.join(os.path.dirname(RUTA_NACIONAL), "cache")
+PUNTERO = os.path.join(DIR_CACHE, "ultimo.json")
+
+SerieIPC = namedtuple("SerieIPC", ["meses", "valores", "revision"])
+
+
+def _ruta_columna(directorio, nombre):
+    return os.path.join(directorio, f"{nombre}.{EXTENSIONES[COLUMNAS[nombre]]}")
+
+
+def leer_meta(directorio):
+    with open(os.path.join(directorio, "meta.json"), encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get("formato") != FORMATO:
+        raise ValueError(f"Formato de almacén no soportado: {meta.get('formato')}")
+    return meta
+
+
+def _escribir_meta(directorio, meta):
+    # Escritura atómica: los lectores ven el meta anterior o el nuevo, nunca uno a medias
+    temporal = os.path.join(directorio, "meta.json.tmp")
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(temporal, os.path.join(directorio, "meta.json"))
+
+
+def escribir_serie(directorio, meses, valores, revision=None):
+    meses = np.ascontiguousarray(meses, dtype=COLUMNAS["mes"])
+    valores = np.ascontiguousarray(valores, dtype=COLUMNAS["ipc"])
+    if meses.shape != valores.shape or meses.ndim != 1:
+        raise ValueError("Las columnas mes e ipc deben ser vectores de igual longitud")
+    if len(meses) > 1 and np.any(np.diff(meses) <= 0):
+        raise ValueError("Los meses deben estar en orden cronológico estricto")
+
+    os.makedirs(directorio, exist_ok=True)
+    if revision is None:
+        try:
+            revision = leer_meta(directorio)["revision"] + 1
+        except (OSError, ValueError, KeyError):
+            revision = 1
+
+    for nombre, columna in (("mes", meses), ("ipc", valores)):
+        temporal = _ruta_columna(directorio, nombre) + ".tmp"
+        columna.tofile(temporal)
+        os.replace(temporal, _ruta_columna(directorio, nombre))
+
+    _escribir_meta(directorio, {
+        "formato": FORMATO,
+        "filas": int(len(meses)),
+        "columnas": COLUMNAS,
+        "revision": int(revision),
+    })
+
+
+def _mapear(ruta, dtype, filas):
+    if filas == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(ruta, dtype=dtype, mode="r", shape=(filas,))
+
+
+def cargar_serie(directorio=RUTA_NACIONAL):
+    meta = leer_meta(directorio)
+    filas = meta["filas"]
+    return SerieIPC(
+        meses=_mapear(_ruta_columna(directorio, "mes"), COLUMNAS["mes"], filas),
+        valores=_mapear(_ruta_columna(directorio, "ipc"), COLUMNAS["ipc"], filas),
+        revision=meta["revision"],
+    )
+
+
+# Conversión entre ordinales de mes y fechas
+def fechas_a_ordinales(fechas):
+    meses = np.asarray(fechas, dtype="datetime64[M]").astype(np.int64)
+    return (meses + 1970 * 12).astype(np.int32)
+
+
+def ordinales_a_fechas(ordinales):
+    return (np.asarray(ordinales, dtype=np.int64) - 1970 * 12).astype("datetime64[M]").astype("datetime64[ns]")
+
+
+def ordinal(anio, mes):
+    return anio * 12 + mes - 1
+
+
+def agregar_meses(directorio, meses, valores):
+    # Actualización incremental: los meses existentes se revisan en su sitio y los
+    # posteriores al último se añaden al final de cada columna, sin reescribir el resto
+    meses = np.asarray(meses, dtype=COLUMNAS["mes"])
+    valores = np.asarray(valores, dtype=COLUMNAS["ipc"])
+    orden = np.argsort(meses, kind="stable")
+    meses, valores = meses[orden], valores[orden]
+    if len(meses) > 1 and np.any(np.diff(meses) == 0):
+        raise ValueError("Hay meses repetidos en la actualización")
+
+    meta = leer_meta(directorio)
+    filas = meta["filas"]
+    actuales = _mapear(_ruta_columna(directorio, "mes"), COLUMNAS["mes"], filas)
+    posiciones = np.searchsorted(actuales, meses)
+    existentes = posiciones < filas
+    if np.any(actuales[posiciones[existentes]] != meses[existentes]):
+        raise ValueError("Solo se pueden revisar meses existentes o añadir meses posteriores al último")
+    # Los meses nuevos siguen sin huecos al último: las columnas son consecutivas por mes y los
+    # indicadores comparan posiciones (un hueco desplazaría, p. ej., la variación anual)
+    anadidos = meses[~existentes]
+    if len(anadidos):
+        primero = actuales[filas - 1] + 1 if filas else anadidos[0]
+        if np.any(anadidos != primero + np.arange(len(anadidos))):
+            raise ValueError("Los meses nuevos deben ser consecutivos a partir del último mes del almacén")
+
+    revisadas = posiciones[existentes]
+    if len(revisadas):
+        with open(_ruta_columna(directorio, "ipc"), "r+b") as f:
+            for posicion, valor in zip(revisadas, valores[existentes]):
+                f.seek(int(posicion) * valores.itemsize)
+                f.write(valor.tobytes())
+
+    nuevas = np.arange(filas, filas + np.count_nonzero(~existentes))
+    if len(nuevas):
+        with open(_ruta_columna(directorio, "mes"), "ab") as f:
+            anadidos.tofile(f)
+        with open(_ruta_columna(directorio, "ipc"), "ab") as f:
+            valores[~existentes].tofile(f)
+
+    # El meta se escribe al final: hasta entonces los lectores siguen viendo `filas` filas
+    meta.update(filas=int(filas + len(nuevas)), revision=int(meta["revision"]) + 1)
+    _escribir_meta(directorio, meta)
+    return revisadas, nuevas
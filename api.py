@@ -0,0 +1,233 @@
+"""API REST de solo lectura sobre los datos del dashboard (``/api/v1``).
+
+Rutas:
+
+* ``/api/v1/series?geografia=&clase=&desde=&hasta=&base=&indicadores=&formato=``:
+  corte de una serie por rango de fechas (``AAAA-MM`` o ``AAAA-MM-DD``), con
+  el índice y los indicadores pedidos. ``formato`` es ``json`` (por defecto),
+  ``csv`` o ``arrow`` (flujo Arrow IPC, requiere ``pyarrow``).
+* ``/api/v1/ultimo``: último mes publicado de la serie nacional.
+* ``/api/v1/dimensiones``: geografías, clases e indicadores disponibles.
+* ``/api/v1/inflacion?geografia=&clase=&desde=&hasta=&monto=``: inflación
+  entre dos meses y, con ``monto``, su equivalente en precios de ``hasta``.
+  Con ``POST`` recibe un CSV con una consulta por fila (cuerpo ``text/csv`` o
+  archivo ``archivo`` de un formulario) y devuelve el mismo CSV con los
+  resultados (ver ``calculadora.py``); ``geografia`` y ``clase`` de la URL se
+  usan en las filas que no las traen.
+
+Cada petición toma una sola instantánea de datos y la usa de principio a fin
+(ETag, cuerpo y versión que se informa), así que una publicación a mitad de
+la petición no mezcla datos de dos versiones. El ETag se deriva de la
+versión de datos y de la petición, así que se calcula antes de construir la
+respuesta: un cliente que consulta periódicamente con
+``If-None-Match`` recibe un 304 sin cuerpo mientras no haya publicación
+nueva. Las respuestas grandes se comprimen con brotli (si está instalado) o
+gzip según ``Accept-Encoding`` (ver ``compresion.py``).
+"""
+
+import csv
+import hashlib
+import io
+import json
+import math
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+except ImportError:  # dependencia opcional: sin ella no hay formato Arrow
+    pa = None
+
+import calculadora
+import compresion
+
+PREFIJO = "/api/v1"
+TIPOS = {
+    "json": "application/json",
+    "csv": "text/csv; charset=utf-8",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+MAX_BYTES_LOTE = 32 * 2 ** 20
+
+
+class ErrorPeticion(Exception):
+    def __init__(self, mensaje, estado=400):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+def _fecha(texto, nombre):
+    try:
+        return np.datetime64(texto, "D")
+    except ValueError:
+        raise ErrorPeticion(f"Fecha no válida en '{nombre}': {texto}")
+
+
+def _ordinal(texto, nombre):
+    # Mes como ordinal (año * 12 + mes - 1), igual que en el almacén
+    return int(_fecha(texto, nombre).astype("datetime64[M]").astype(np.int64)) + 1970 * 12
+
+
+def _json(datos):
+    return json.dumps(datos, ensure_ascii=False, allow_nan=False).encode("utf-8")
+
+
+def _sin_nan(valores):
+    return [None if math.isnan(v) else v for v in valores.tolist()]
+
+
+def _serializar_serie(formato, fechas, columnas, metadatos):
+    dias = fechas.astype("datetime64[D]")
+    if formato == "json":
+        datos = {"fecha": np.datetime_as_string(dias).tolist()}
+        datos.update({nombre: _sin_nan(valores) for nombre, valores in columnas.items()})
+        return _json(dict(metadatos, columnas=list(datos), datos=datos))
+    if formato == "csv":
+        salida = io.StringIO()
+        escritor = csv.writer(salida, lineterminator="\n")
+        escritor.writerow(["fecha", *columnas])
+        filas = zip(np.datetime_as_string(dias).tolist(), *(valores.tolist() for valores in columnas.values()))
+        escritor.writerows([fecha, *("" if math.isnan(v) else repr(v) for v in valores)] for fecha, *valores in filas)
+        return salida.getvalue().encode("utf-8")
+    tabla = pa.table(
+        {"fecha": pa.array(dias), **{nombre: pa.array(valores, from_pandas=True) for nombre, valores in columnas.items()}},
+        metadata={clave: str(valor) for clave, valor in metadatos.items()},
+    )
+    salida = pa.BufferOutputStream()
+    with pa.ipc.new_stream(salida, tabla.schema) as escritor:
+        escritor.write_table(tabla)
+    return salida.getvalue().to_pybytes()
+
+
+def registrar_api(server, instantanea, indicadores, cache=None, minimo=compresion.TAMANO_MIN_COMPRESION):
+    """Registra las rutas de la API en el servidor Flask.
+
+    ``instantanea()`` devuelve los datos actuales (una ``DatosApp``): su
+    ``version`` los identifica, ``obtener_serie(geografia, clase, base)``
+    devuelve una ``SerieIndexada`` y ``tabla_periodos(geografia, clase)`` la
+    ``TablaPeriodos`` de una serie (``KeyError`` si no existe), y
+    ``dimensiones()`` y ``ultimo()`` devuelven diccionarios serializables.
+    ``indicadores`` son los nombres de columna que se pueden pedir. Con
+    ``cache`` (una ``CacheFiguras``) los cuerpos sin comprimir se guardan por
+    versión, ruta y parámetros; los errores no se guardan. ``minimo`` es el
+    tamaño a partir del cual se comprimen los cuerpos, el mismo que recibe
+    ``compresion.registrar_compresion`` (negativo no comprime).
+    """
+    from flask import Response, request
+
+    def comprimir(cuerpo, cabeceras):
+        codificacion = compresion.codificacion(request.accept_encodings)
+        if codificacion and 0 <= minimo <= len(cuerpo):
+            cuerpo = compresion.comprimir(cuerpo, codificacion)
+            cabeceras["Content-Encoding"] = codificacion
+        return cuerpo
+
+    def responder(construir, formato="json", cachear=True):
+        # El ETag depende solo de la versión de datos, la ruta, los parámetros y la codificación:
+        # se compara antes de construir el cuerpo, que se construye con la misma instantánea
+        d = instantanea()
+        codificacion = compresion.codificacion(request.accept_encodings)
+        consulta = "&".join(f"{k}={v}" for k, v in sorted(request.args.items(multi=True)))
+        huella = hashlib.sha1(f"{request.path}?{consulta}".encode("utf-8")).hexdigest()[:16]
+        etiqueta = f"{d.version}-{huella}" + (f"-{codificacion}" if codificacion else "")
+        cabeceras = {"ETag": f'"{etiqueta}"', "Cache-Control": "public, no-cache", "Vary": "Accept-Encoding"}
+
+        # Comparación débil, como la de Flask en el resto de rutas: el ETag llega débil (W/) si alguna
+        # capa posterior lo debilitó al comprimir
+        if request.if_none_match.contains_weak(etiqueta):
+            return Response(status=304, headers=cabeceras)
+        try:
+            if cache is not None and cachear:
+                cuerpo = cache.obtener_o_construir((d.version, "api", request.path, consulta), lambda: construir(d))
+            else:
+                cuerpo = construir(d)
+        except ErrorPeticion as error:
+            return Response(_json({"error": str(error)}), status=error.estado, mimetype=TIPOS["json"])
+        return Response(comprimir(cuerpo, cabeceras), headers=cabeceras, content_type=TIPOS[formato])
+
+    def series():
+        formato = request.args.get("formato", "json")
+        if formato not in TIPOS:
+            return Response(_json({"error": f"Formato no soportado: {formato}"}), status=400, mimetype=TIPOS["json"])
+        if formato == "arrow" and pa is None:
+            return Response(_json({"error": "El formato arrow requiere pyarrow"}), status=406, mimetype=TIPOS["json"])
+
+        def construir(d):
+            geografia = request.args.get("geografia", "Nacional")
+            clase = request.args.get("clase", "0")
+            base = request.args.get("base")
+            pedidos = request.args.get("indicadores")
+            nombres = ["IPC", *indicadores] if pedidos is None else ["IPC", *pedidos.split(",")]
+            desconocidos = [n for n in nombres if n != "IPC" and n not in indicadores]
+            if desconocidos:
+                raise ErrorPeticion(f"Indicadores desconocidos: {', '.join(desconocidos)}")
+            ordinal_base = None if base is None else _ordinal(base, "base")
+            try:
+                serie = d.obtener_serie(geografia, clase, ordinal_base)
+            except KeyError:
+                raise ErrorPeticion(f"Serie no disponible: geografia={geografia}, clase={clase}", estado=404)
+            except ValueError as error:
+                raise ErrorPeticion(str(error))
+            desde = _fecha(request.args.get("desde", "1900-01"), "desde")
+            hasta = _fecha(request.args.get("hasta", "2999-12"), "hasta")
+            fechas, columnas = serie.vista_fechas(desde, hasta)
+            metadatos = {"version": d.version, "geografia": geografia, "clase": clase, "base": base}
+            return _serializar_serie(formato, fechas, {n: columnas[n] for n in dict.fromkeys(nombres)}, metadatos)
+
+        return responder(construir, formato)
+
+    def tabla(d, geografia, clase):
+        try:
+            return d.tabla_periodos(geografia, clase)
+        except KeyError:
+            raise ErrorPeticion(f"Serie no disponible: geografia={geografia}, clase={clase}", estado=404)
+
+    def inflacion():
+        geografia = request.args.get("geografia", "Nacional")
+        clase = request.args.get("clase", "0")
+        if request.method == "POST":
+            return inflacion_lote(geografia, clase)
+
+        # Cada consulta son dos lecturas por posición: no compensa guardarla en la caché
+        def construir(d):
+            faltantes = [p for p in ("desde", "hasta") if p not in request.args]
+            if faltantes:
+                raise ErrorPeticion(f"Faltan parámetros: {', '.join(faltantes)}")
+            desde, hasta = _ordinal(request.args["desde"], "desde"), _ordinal(request.args["hasta"], "hasta")
+            monto = request.args.get("monto")
+            try:
+                monto = None if monto is None else float(monto)
+            except ValueError:
+                raise ErrorPeticion(f"Monto no válido: {monto}")
+            resultado = {k: float(v) for k, v in tabla(d, geografia, clase).calcular(desde, hasta, monto).items()}
+            if math.isnan(resultado["factor"]):
+                raise ErrorPeticion(f"Sin dato para {request.args['desde']} o {request.args['hasta']} en la serie", estado=404)
+            meses = {k: f"{o // 12:04d}-{o % 12 + 1:02d}" for k, o in (("desde", desde), ("hasta", hasta))}
+            return _json(dict(version=d.version, geografia=geografia, clase=clase, **meses, monto=monto, **resultado))
+
+        return responder(construir, cachear=False)
+
+    def inflacion_lote(geografia, clase):
+        error = None
+        if (request.content_length or 0) > MAX_BYTES_LOTE:
+            error = ErrorPeticion(f"El archivo supera {MAX_BYTES_LOTE // 2 ** 20} MB", estado=413)
+        else:
+            archivo = request.files.get("archivo")
+            try:
+                texto = (archivo.read() if archivo is not None else request.get_data()).decode("utf-8-sig")
+                cuerpo = calculadora.resolver_csv(texto, instantanea().tabla_periodos, geografia, clase).encode("utf-8")
+            except UnicodeDecodeError:
+                error = ErrorPeticion("El CSV debe estar en UTF-8")
+            except ValueError as e:
+                error = ErrorPeticion(str(e))
+        if error is not None:
+            return Response(_json({"error": str(error)}), status=error.estado, mimetype=TIPOS["json"])
+        cabeceras = {"Content-Disposition": 'attachment; filename="inflacion.csv"', "Vary": "Accept-Encoding",
+                     "Cache-Control": "no-store"}
+        return Response(comprimir(cuerpo, cabeceras), headers=cabeceras, content_type=TIPOS["csv"])
+
+    server.add_url_rule(f"{PREFIJO}/series", "api_series", series)
+    server.add_url_rule(f"{PREFIJO}/ultimo", "api_ultimo", lambda: responder(lambda d: _json(dict(d.ultimo(), version=d.version))))
+    server.add_url_rule(f"{PREFIJO}/dimensiones", "api_dimensiones",
+                        lambda: responder(lambda d: _json(dict(d.dimensiones(), version=d.version))))
+    server.add_url_rule(f"{PREFIJO}/inflacion", "api_inflacion", inflacion, methods=["GET", "POST"])
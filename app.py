@@ -1,321 +1,829 @@
-import pandas as pd
 import dash
-from dash import dcc, html, Input, Output, State
-import plotly.graph_objects as go
+import flask
+from dash import dcc, html, Input, Output, State, ClientsideFunction
 import os
-from datos_generados import datos
-from datetime import datetime
-
-# Renombrar columnas y limpiar datos
-df = pd.DataFrame(datos, columns=["Mes", "IPC"])
-
-# Convertir IPC a float
-df["IPC"] = df["IPC"].astype(str).str.replace(",", ".").astype(float)
-
-# Convertir fechas: ahora usamos el formato que tienen los datos
-df["Mes"] = pd.to_datetime(df["Mes"], format="%Y-%m-%d %H:%M:%S", errors="coerce")
-
-# Eliminar filas con fechas inválidas
-df = df.dropna(subset=['Mes'])
-
-# Extraer el año
-df["Año"] = df["Mes"].dt.year
-
-# Calcular variación anual
-df["anual"] = df["IPC"].div(df["IPC"].shift(12)).subtract(1).multiply(100)
-
-# Último valor
-ultimo_valor = df["IPC"].iloc[-1] if not df.empty else 0
-ultima_fecha = df["Mes"].iloc[-1].strftime("%b-%Y") if not df.empty else "N/A"
-ultimo_anual = df["anual"].iloc[-1] if not df.empty and not pd.isna(df["anual"].iloc[-1]) else 0
-
-# Obtener años disponibles como enteros
-available_years = sorted(df["Año"].unique().tolist()) if not df.empty else []
-
-# App
-app = dash.Dash(__name__)
-app.title = "Dashboard IPC"
-
-# Layout
-app.layout = html.Div(style={
-    "fontFamily": "Arial, sans-serif",
-    "minHeight": "100vh",
-    "minWidth": "100vw",
-    "background": "linear-gradient(to bottom right, #93c5fd, #1d4ed8, #0f172a)",
-    "margin": "0",
-    "padding": "0",
-    "overflow": "hidden"
-}, children=[
-
-    # Navbar
-    html.Div(style={
-        "position": "fixed",
-        "top": "0",
-        "left": "0",
-        "width": "100%",
-        "background": "linear-gradient(to bottom right, #fff700, #facc15, #b45309)",
-        "padding": "10px 10px",
-        "color": "white",
-        "fontSize": "20px",
-        "fontWeight": "bold",
-        "zIndex": "1000",
-        "boxShadow": "0 2px 4px rgba(0,0,0,0.1)"
-    }, children=[html.Span("Inflación en Ecuador", style={"margin": "40px"})]),
-
-    # Botón hamburguesa
-    html.Div(className="hamburger", id="menu-button", n_clicks=0, children=[
-        html.Span(), html.Span(), html.Span()
-    ]),
-
-    # Sidebar
-    html.Div(id="sidebar", style={
-        "position": "fixed",
-        "top": "0",
-        "left": "0",
-        "height": "100vh",
-        "width": "250px",
-        "backgroundColor": "#1e3a8a",
-        "padding": "20px",
-        "display": "none",
-        "zIndex": "1500",
-        "color": "white"
+import sys
+import base64
+import hashlib
+import json
+import math
+import numpy as np
+import plotly
+from almacen_ipc import DIR_CACHE, PUNTERO, RUTA_NACIONAL, agregar_meses, cargar_serie, ordinales_a_fechas
+from indice_meses import SerieIndexada
+from cache_figuras import CacheFiguras
+from cache_compartida import CacheCompartida
+from ejecutor import EjecutorFiguras
+from figuras import INDICADORES, PUNTOS_MAX, figura_incidencias_json, figura_json, layout_serie
+from cubo_ipc import REGIONES, cargar_cubo, directorio_actual
+from indicadores import Indicadores
+import incidencias
+import metricas
+import nucleo
+import pronostico
+from calculadora import TablaPeriodos, resolver_csv
+from api import registrar_api
+from compresion import registrar_compresion
+from recarga import Recargador, huella_archivos
+from datetime import date, datetime
+
+# Nada de lo que se ejecuta al importar este módulo lee datos: la instantánea se carga la primera
+# vez que se pide (``datos()``) o antes del fork con ``precargar()`` (ver wsgi.py), se recarga sola
+# al publicarse datos nuevos y el layout es una función de ella
+
+# Rangos fijos de las tarjetas de selección (años inclusive)
+RANGOS_ANIOS = {
+    "card-2006-2016": (2006, 2016),
+    "card-2017-2021": (2017, 2021),
+    "card-2022-2025": (2022, 2025),
+}
+
+# Medida de incidencia de cada indicador; las que no tienen descomposición propia (promedio 12 meses)
+# muestran la anual
+MEDIDA_INCIDENCIA = {"mensual": "mensual", "acumulada": "acumulada"}
+
+# Modo cliente: la serie se envía una vez y el filtrado se hace en el navegador (assets/ipc_cliente.js)
+MODO_CLIENTE = os.environ.get("IPC_MODO_CLIENTE", "0") == "1"
+
+# Modo estático (solo lectura): exportar.py escribe en IPC_ESTATICO el layout y las figuras de todos los
+# estados del gráfico, y la app los sirve sin cargar datos; el navegador pide la figura de cada estado como
+# archivo (assets/ipc_estatico.js). La app los sirve en /estatico/; los de cada versión de datos no cambian
+# y pueden publicarse en un CDN (IPC_ESTATICO_URL, al exportar)
+DIR_ESTATICO = os.path.abspath(os.environ["IPC_ESTATICO"]) if os.environ.get("IPC_ESTATICO") else ""
+MODO_ESTATICO = bool(DIR_ESTATICO)
+URL_ESTATICO = os.environ.get("IPC_ESTATICO_URL", "/estatico/")
+
+# Combinaciones de años que se exportan además de cada año y de los rangos fijos: los últimos N años y
+# todos; el resto se compone en el navegador a partir de los archivos de cada año
+ULTIMOS_ANIOS = (2, 3, 5, 10)
+
+# Series (geografía × clase × base), tablas de la calculadora y pronósticos indexados a pedido que guarda
+# cada instantánea: las claves vienen del usuario, así que se acotan con un LRU
+SERIES_MAX = int(os.environ.get("IPC_SERIES_MAX", 64))
+
+# Artefactos derivados que la ingesta guarda junto al cubo: se vigilan para recargar (huella_datos) y su
+# contenido entra en la versión de datos
+ARTEFACTOS_CUBO = ("dimensiones.json", incidencias.ARCHIVO, nucleo.ARCHIVO, pronostico.ARCHIVO, pronostico.ARCHIVO_NACIONAL)
+
+# Huella corta del contenido de los artefactos de un cubo (los que falten no cuentan)
+def huella_artefactos(directorio):
+    h = hashlib.sha1()
+    for nombre in ARTEFACTOS_CUBO:
+        try:
+            with open(os.path.join(directorio, nombre), "rb") as f:
+                h.update(nombre.encode("utf-8") + f.read())
+        except OSError:
+            continue
+    return h.hexdigest()[:8]
+
+
+class DatosApp:
+    """Instantánea de los datos que sirve la app.
+
+    Reúne la serie nacional del almacén, el cubo y las incidencias de la última
+    ingesta y las estructuras derivadas (indicadores, series indexadas). Se
+    construye completa antes de publicarse, reutilizando de la instantánea
+    ``anterior`` lo que no cambió; después solo se indexan las series que se
+    piden.
+    """
+
+    def __init__(self, directorio=RUTA_NACIONAL, anterior=None):
+        # Serie nacional desde el almacén binario (mes como ordinal int32, IPC como float64) y sus
+        # indicadores (variación mensual, acumulada, anual y promedio), calculados una vez por revisión.
+        # El almacén revisa meses en su sitio: la instantánea copia las columnas para que una revisión
+        # posterior no cambie los datos que están sirviendo los callbacks
+        self.directorio = directorio
+        serie = cargar_serie(directorio)
+        self.serie = serie._replace(meses=np.array(serie.meses), valores=np.array(serie.valores))
+        self.indicadores_nacional = self._indicadores_nacional(anterior)
+        self.anios = sorted(set((self.serie.meses // 12).tolist()))
+
+        # Cubo geografía × clase × mes de la última ingesta; sin él solo se muestra la serie nacional.
+        # Si es el mismo de la instantánea ``anterior`` (misma ingesta y mismos artefactos) se reutiliza con
+        # todo lo derivado de él, que no depende del almacén nacional
+        directorio_cubo = directorio_actual()
+        # La huella de los artefactos se toma antes de leerlos: si se reescriben después, la recarga
+        # siguiente trae otra versión
+        self.artefactos = None if directorio_cubo is None else huella_artefactos(directorio_cubo)
+        if anterior is not None and (anterior.cubo.directorio if anterior.cubo is not None else None,
+                                     anterior.artefactos) == (directorio_cubo, self.artefactos):
+            for atributo in ("cubo", "indicadores_cubo", "incidencias", "nucleo", "pronostico_cubo",
+                             "pronostico_nacional", "series_incidencias"):
+                setattr(self, atributo, getattr(anterior, atributo))
+        else:
+            self._cargar_cubo()
+
+        # La versión combina la revisión del almacén, la ingesta del cubo y el contenido de sus artefactos
+        # (una ingesta que los regenera con la misma huella de origen cambia la versión): entra en las
+        # claves de las figuras y en los ETag de la API
+        self.version = f"r{self.serie.revision}-" + (
+            f"{os.path.basename(self.cubo.directorio)}-{self.artefactos}" if self.cubo is not None else "sin-cubo"
+        )
+        self.series = {"Nacional": self._indexar_nacional()}
+        self.series_pedidas = CacheFiguras(SERIES_MAX)
+        self.tablas_periodos = CacheFiguras(SERIES_MAX)
+        self.pronosticos = CacheFiguras(SERIES_MAX)
+
+    # Indicadores de la serie nacional. Si la instantánea ``anterior`` leyó el mismo almacén y este solo
+    # añadió meses al final o revisó algunos, se recalculan desde el primer mes que cambió (ver
+    # ``Indicadores.actualizado``) en lugar de sobre toda la historia
+    def _indicadores_nacional(self, anterior):
+        meses, valores, revision = self.serie.meses, self.serie.valores, self.serie.revision
+        if anterior is not None and anterior.directorio == self.directorio:
+            previos = anterior.serie
+            n = len(previos.meses)
+            if len(meses) >= n and np.array_equal(meses[:n], previos.meses):
+                cambiados = np.flatnonzero(valores[:n] != previos.valores)
+                desde = int(cambiados[0]) if len(cambiados) else n
+                return anterior.indicadores_nacional.actualizado(meses, valores, desde, revision)
+        return Indicadores(meses, valores, revision)
+
+    def _cargar_cubo(self):
+        # Los indicadores de todas las series del cubo se calculan en una sola pasada sobre la matriz
+        # (series × meses)
+        self.cubo = cargar_cubo()
+        self.indicadores_cubo = None if self.cubo is None else Indicadores(
+            self.cubo.ordinales, self.cubo.datos["indice"].reshape(-1, len(self.cubo.ordinales)), self.cubo.directorio
+        )
+        # Incidencias por división y medidas de inflación subyacente precalculadas en la ingesta (ver
+        # incidencias.py y nucleo.py)
+        self.incidencias = None if self.cubo is None else incidencias.cargar(self.cubo.directorio)
+        self.nucleo = None if self.cubo is None else nucleo.cargar(self.cubo.directorio)
+        # Pronósticos a 12 meses (ver pronostico.py), ajustados en la ingesta: el de la serie nacional se
+        # dibuja mientras arranque en el último mes del almacén (tras actualizar_datos, hasta la ingesta siguiente, no)
+        self.pronostico_cubo = None if self.cubo is None else pronostico.cargar(self.cubo.directorio)
+        self.pronostico_nacional = None if self.cubo is None else pronostico.cargar(
+            self.cubo.directorio, pronostico.ARCHIVO_NACIONAL)
+        self.series_incidencias = None if self.incidencias is None else self._indexar_incidencias()
+
+    # Índice ordenado por serie para resolver los clics del gráfico sin recorrer la serie;
+    # las vistas de los rangos fijos se preparan una sola vez al cargar
+    def _indexar_nacional(self):
+        nacional = SerieIndexada(self.serie.meses, **self.indicadores_nacional.fila(0), **self._columnas_nucleo())
+        for desde, hasta in RANGOS_ANIOS.values():
+            nacional.vista_rango(desde, hasta)
+        return nacional
+
+    # Medidas subyacentes alineadas a los meses de la serie nacional (NaN antes del mes base de las
+    # ponderaciones); se dibujan junto a la variación anual
+    def _columnas_nucleo(self):
+        if self.nucleo is None:
+            return {}
+        posiciones = self.serie.meses - int(self.nucleo.ordinales[0])
+        presentes = (posiciones >= 0) & (posiciones < len(self.nucleo.ordinales))
+        columnas = {}
+        for medida in nucleo.MEDIDAS:
+            valores = np.full(len(posiciones), np.nan)
+            valores[presentes] = getattr(self.nucleo, medida)[posiciones[presentes]]
+            columnas[medida] = valores
+        return columnas
+
+    def _indexar_incidencias(self):
+        series = {}
+        for medida in incidencias.MEDIDAS:
+            valores = getattr(self.incidencias, medida)
+            series[medida] = SerieIndexada(self.incidencias.ordinales, total=valores.sum(axis=0),
+                                           **dict(zip(self.incidencias.divisiones.tolist(), valores)))
+            for desde, hasta in RANGOS_ANIOS.values():
+                series[medida].vista_rango(desde, hasta)
+        return series
+
+    # Serie de una geografía y clase (con el índice rebasado al mes ``base`` si se pide): la nacional
+    # general sale del almacén y el resto del cubo; se indexa la primera vez que se pide y se guarda en un
+    # LRU (``SERIES_MAX``)
+    def obtener_serie(self, geografia="Nacional", clase="0", base=None):
+        nacional = geografia == "Nacional" and clase == "0"
+        if nacional and base is None:
+            return self.series["Nacional"]
+        if not nacional and self.cubo is None:
+            raise KeyError((geografia, clase))
+        return self.series_pedidas.obtener_o_construir((geografia, clase, base),
+                                                       lambda: self._indexar_serie(geografia, clase, base))
+
+    def _indexar_serie(self, geografia, clase, base):
+        nacional = geografia == "Nacional" and clase == "0"
+        motor, fila = (self.indicadores_nacional, 0) if nacional else (self.indicadores_cubo, self.cubo.posicion(geografia, clase))
+        # Sin los meses vacíos del principio y del final (ciudades o clases que empiezan más tarde)
+        presentes = np.flatnonzero(~np.isnan(motor.indices[fila]))
+        corte = slice(presentes[0], presentes[-1] + 1) if len(presentes) else slice(0, 0)
+        columnas = motor.fila(fila, base)
+        if nacional:
+            columnas.update(self._columnas_nucleo())
+        return SerieIndexada(motor.ordinales[corte], **{n: v[corte] for n, v in columnas.items()})
+
+    # Índice de la serie alineado por mes para la calculadora de inflación (ver calculadora.py); el
+    # cociente entre meses no depende de la base, así que hay una tabla por serie
+    def tabla_periodos(self, geografia="Nacional", clase="0"):
+        def construir():
+            serie = self.obtener_serie(geografia, clase)
+            return TablaPeriodos(serie.indice.ordinales, serie.columnas["IPC"])
+        return self.tablas_periodos.obtener_o_construir((geografia, clase), construir)
+
+    # Abanico del pronóstico en la escala de la serie (rebasada o no): fechas desde el último mes
+    # observado, que abre el abanico en su valor, y media y bandas de cada mes. None si la serie no tiene
+    # pronóstico o este no arranca en su último mes
+    def pronostico_serie(self, geografia="Nacional", clase="0", base=None):
+        return self.pronosticos.obtener_o_construir((geografia, clase, base),
+                                                    lambda: self._abanico(geografia, clase, base))
+
+    def _abanico(self, geografia, clase, base):
+        nacional = geografia == "Nacional" and clase == "0"
+        modelo, fila = (self.pronostico_nacional, 0) if nacional else (
+            self.pronostico_cubo, None if self.pronostico_cubo is None else self.cubo.posicion(geografia, clase))
+        serie = self.obtener_serie(geografia, clase, base)
+        resultado = None
+        if modelo is not None and len(serie.indice.ordinales) and np.isfinite(modelo.media[fila, 0]) \
+                and modelo.ultimo[fila] == serie.indice.ordinales[-1]:
+            ultimo = serie.columnas["IPC"][-1]
+            ordinales = serie.indice.ordinales[-1] + np.arange(pronostico.HORIZONTE + 1)
+            resultado = {"fechas": ordinales_a_fechas(ordinales)}
+            for campo in pronostico.Pronostico._fields[1:]:
+                resultado[campo] = ultimo * np.concatenate([[1.0], getattr(modelo, campo)[fila]])
+        return resultado
+
+    def nombre_serie(self, geografia, clase):
+        nombre = "IPC General" if clase == "0" else self.cubo.descripcion(clase)
+        return nombre if geografia == "Nacional" else f"{nombre} ({geografia})"
+
+    def opciones_base(self):
+        nacional = self.series["Nacional"]
+        return [{"label": e, "value": int(o)} for e, o in zip(nacional.etiquetas, nacional.indice.ordinales)]
+
+    def opciones_clases(self):
+        if self.cubo is None:
+            return [{"label": "Índice General", "value": "0"}]
+        return [
+            {"label": "Índice General" if c.codigo == "0" else f"{c.codigo} {c.descripcion}", "value": c.codigo}
+            for c in self.cubo.clases
+        ]
+
+    def ultimo(self):
+        nacional = self.series["Nacional"]
+        anual = nacional.columnas["anual"][-1]
+        return {
+            "fecha": str(nacional.fechas[-1].astype("datetime64[D]")),
+            "etiqueta": nacional.etiquetas[-1],
+            "ipc": float(nacional.columnas["IPC"][-1]),
+            "anual": None if np.isnan(anual) else float(anual),
+        }
+
+    def dimensiones(self):
+        cubo = self.cubo
+        return {
+            "geografias": ["Nacional"] if cubo is None else ["Nacional", *REGIONES, *(c for l in REGIONES.values() for c in l)],
+            "regiones": REGIONES if cubo is not None else {},
+            "clases": [{"codigo": "0", "nivel": "General", "descripcion": "General"}] if cubo is None
+                      else [c._asdict() for c in cubo.clases],
+            "indicadores": {k: etiqueta for k, (etiqueta, _) in INDICADORES.items()},
+        }
+
+    # Serie completa para el modo cliente: se envía una vez en el dcc.Store "datos-serie"
+    def datos_cliente(self):
+        nacional = self.series["Nacional"]
+        return {
+            "fechas": np.datetime_as_string(nacional.fechas, unit="D").tolist(),
+            "anios": (nacional.indice.ordinales // 12).tolist(),
+            "ipc": nacional.columnas["IPC"].tolist(),
+            "anual": [None if np.isnan(v) else v for v in nacional.columnas["anual"].tolist()],
+            "etiquetas": nacional.etiquetas,
+            "ultimo_anio": max(self.anios) if self.anios else datetime.now().year,
+            "rangos": RANGOS_ANIOS,
+            "layout": json.loads(layout_serie("anual")),
+        }
+
+
+def geografia_seleccionada(region, ciudad):
+    return ciudad or region or "Nacional"
+
+def opciones_ciudades(region):
+    ciudades = REGIONES.get(region) or [c for lista in REGIONES.values() for c in lista]
+    return [{"label": c, "value": c} for c in ciudades]
+
+# Figuras y respuestas de la API ya construidas: primer nivel LRU en memoria de cada proceso y segundo
+# nivel en una base SQLite que comparten los workers del host y que sobrevive a los reinicios (ver
+# cache_compartida.py); IPC_CACHE_COMPARTIDA vacío la desactiva
+RUTA_CACHE_COMPARTIDA = os.environ.get("IPC_CACHE_COMPARTIDA", os.path.join(DIR_CACHE, "figuras.sqlite"))
+
+# Módulos que dan forma a las figuras y a las respuestas de la API guardadas en la caché compartida
+MODULOS_FIGURAS = ("app.py", "api.py", "calculadora.py", "figuras.py", "indicadores.py", "indice_meses.py",
+                   "submuestreo.py")
+
+# Huella de ese código y de la versión de plotly: las entradas de la caché compartida construidas por otro
+# despliegue no se reutilizan (cambiar otros módulos, p. ej. la ingesta o las métricas, no las descarta)
+def huella_codigo():
+    h = hashlib.sha1(plotly.__version__.encode("utf-8"))
+    directorio = os.path.dirname(os.path.abspath(__file__))
+    for nombre in MODULOS_FIGURAS:
+        with open(os.path.join(directorio, nombre), "rb") as f:
+            h.update(nombre.encode("utf-8") + f.read())
+    return h.hexdigest()[:12]
+
+cache_compartida = CacheCompartida(
+    RUTA_CACHE_COMPARTIDA, capacidad_bytes=int(os.environ.get("IPC_CACHE_COMPARTIDA_MB", 64)) * 2 ** 20,
+    espacio=huella_codigo(),
+) if RUTA_CACHE_COMPARTIDA else None
+cache_figuras = CacheFiguras(capacidad=int(os.environ.get("IPC_CACHE_FIGURAS", 256)), compartida=cache_compartida)
+# Respuestas de la API en su propia caché, para que las consultas no desalojen figuras (0 la desactiva)
+CAPACIDAD_CONSULTAS = int(os.environ.get("IPC_CACHE_CONSULTAS", 256))
+cache_consultas = CacheFiguras(capacidad=CAPACIDAD_CONSULTAS, compartida=cache_compartida) if CAPACIDAD_CONSULTAS > 0 else None
+
+# Las figuras largas que no están en caché se construyen en un pool de procesos (ver ejecutor.py). El
+# peso es el número de puntos por traza antes de submuestrear: hasta PUNTOS_MAX una figura se serializa
+# sin LTTB en ~0.2 ms y el viaje al pool (~0.3-0.5 ms) no compensa; por encima, el LTTB la lleva a
+# 1.5 ms o más (2 000 puntos; 6 ms con 20 000) y va al pool, donde deja de retrasar los clics de otros
+# usuarios (bench_pool en benchmarks/micro.py). Con la historia actual (246 meses) ninguna figura llega al
+# umbral: el pool queda para historias más largas. Las incidencias (14 trazas de como mucho
+# unos cientos de meses) se construyen siempre en el hilo: enviar sus columnas cuesta más que
+# construirlas. Por defecto un proceso por cada dos núcleos, ninguno con un solo núcleo
+ejecutor_figuras = EjecutorFiguras(
+    procesos=int(os.environ.get("IPC_PROCESOS_FIGURAS", (os.cpu_count() or 1) // 2)),
+    umbral=int(os.environ.get("IPC_PUNTOS_POOL", PUNTOS_MAX + 1)),
+)
+
+# Archivos cuya huella se vigila: el meta del almacén (se reescribe en cada actualización), el puntero
+# de la ingesta y los artefactos del cubo al que apunta (p. ej. regenerados con --forzar)
+def huella_datos():
+    rutas = [os.path.join(RUTA_NACIONAL, "meta.json"), PUNTERO]
+    cubo = directorio_actual()
+    if cubo is not None:
+        rutas += [os.path.join(cubo, n) for n in ARTEFACTOS_CUBO]
+    return huella_archivos(rutas)
+
+# Instantánea vigente: se carga la primera vez que se pide y se reemplaza entera cuando cambian los
+# artefactos de datos (ver recarga.py); las figuras y consultas de la anterior se descartan al publicarla
+def vaciar_caches(d):
+    cache_figuras.invalidar(d.version)
+    if cache_consultas is not None:
+        cache_consultas.invalidar(d.version)
+
+# Cada recarga parte de la instantánea vigente: reutiliza el cubo si no cambió y recalcula los indicadores
+# nacionales solo desde el primer mes nuevo o revisado
+recargador = Recargador(lambda: DatosApp(anterior=recargador.vigente()), huella_datos,
+                        float(os.environ.get("IPC_INTERVALO_RECARGA", 5)), al_publicar=vaciar_caches)
+
+def datos():
+    return recargador.actual()
+
+def metricas_cache():
+    stats = cache_figuras.estadisticas()
+    valores = {
+        "ipc_cache_figuras_aciertos_total": ("counter", "Aciertos de la caché de figuras", stats["aciertos"]),
+        "ipc_cache_figuras_fallos_total": ("counter", "Fallos de la caché de figuras", stats["fallos"]),
+        "ipc_cache_figuras_entradas": ("gauge", "Figuras guardadas en la caché", stats["entradas"]),
+        "ipc_cache_figuras_tasa_aciertos": ("gauge", "Proporción de aciertos de la caché de figuras", stats["tasa_aciertos"]),
+        "ipc_cache_figuras_agrupadas_total": ("counter", "Peticiones que esperaron una figura ya en construcción", stats["agrupadas"]),
+        "ipc_figuras_en_pool_total": ("counter", "Figuras construidas en el pool de procesos", ejecutor_figuras.en_pool),
+        "ipc_figuras_en_hilo_total": ("counter", "Figuras construidas en el hilo de la petición", ejecutor_figuras.en_hilo),
+        "ipc_figuras_fallos_pool_total": ("counter", "Figuras reconstruidas en el hilo tras caerse el pool", ejecutor_figuras.fallos_pool),
+        "ipc_datos_recargas_total": ("counter", "Instantáneas de datos publicadas tras la primera", recargador.recargas),
+        "ipc_datos_errores_recarga_total": ("counter", "Recargas de datos fallidas", recargador.errores),
+    }
+    if cache_compartida is not None:
+        compartida = cache_compartida.estadisticas()
+        metricas_compartida = {
+            "aciertos_total": ("counter", "Aciertos de la caché compartida", compartida["aciertos"]),
+            "esperas_total": ("counter", "Valores recibidos tras esperar la construcción de otro proceso", compartida["esperas"]),
+            "fallos_total": ("counter", "Valores construidos por este proceso", compartida["fallos"]),
+            "desalojadas_total": ("counter", "Entradas desalojadas por tamaño", compartida["desalojadas"]),
+            "errores_total": ("counter", "Errores de SQLite (se construyó sin caché)", compartida["errores"]),
+            "entradas": ("gauge", "Entradas en la caché compartida", compartida["entradas"]),
+            "bytes": ("gauge", "Bytes de los valores en la caché compartida", compartida["bytes"]),
+        }
+        valores.update({f"ipc_cache_compartida_{nombre}": metrica for nombre, metrica in metricas_compartida.items()})
+    return valores
+
+metricas.registrar_fuente(metricas_cache)
+
+# Actualización de la serie nacional: persiste los meses nuevos o revisados y publica una instantánea
+# nueva a partir de la vigente, que conserva el cubo y recalcula los indicadores solo desde el primer mes
+# tocado (los revisados afectan a los 23 siguientes como mucho); devuelve la instantánea publicada
+def actualizar_datos(meses, valores, directorio=RUTA_NACIONAL):
+    agregar_meses(directorio, meses, valores)
+    nuevos_datos = DatosApp(directorio, anterior=recargador.vigente())
+    recargador.publicar(nuevos_datos)
+    return nuevos_datos
+
+def figura_incidencias(d, rango, anios, medida):
+    return json.loads(texto_figura_incidencias(d, rango, anios, medida))
+
+# Figura de incidencias serializada (tal como se guarda en la caché y se exporta en modo estático)
+def texto_figura_incidencias(d, rango, anios, medida):
+    serie_medida = d.series_incidencias[medida]
+    divisiones = {division: d.cubo.descripcion(division) for division in d.incidencias.divisiones.tolist()}
+    if rango is not None:
+        clave = (d.version, "incidencias", medida, "rango") + rango
+        seleccionar = lambda: serie_medida.vista_rango(*rango)
+    else:
+        clave = (d.version, "incidencias", medida, "anios") + tuple(sorted(set(anios)))
+        seleccionar = lambda: serie_medida.vista(anios)
+
+    def construir():
+        fechas, columnas = seleccionar()
+        return ejecutor_figuras.ejecutar(figura_incidencias_json, fechas, columnas, divisiones, medida, peso=None)
+
+    return cache_figuras.obtener_o_construir(clave, construir)
+
+# Layout: función de la instantánea de datos. Con ``d=None`` devuelve el esqueleto sin datos (mismos
+# ids) con que Dash valida los callbacks sin cargar nada al crear la app
+def construir_layout(d):
+    anios = [] if d is None else d.anios
+    ultimo = {"etiqueta": "N/A", "ipc": 0, "anual": None} if d is None else d.ultimo()
+    ultima_fecha, ultimo_valor, ultimo_anual = ultimo["etiqueta"], ultimo["ipc"], ultimo["anual"] or 0
+    con_cubo = d is not None and d.cubo is not None
+    con_incidencias = d is not None and d.series_incidencias is not None
+    opciones_meses = [] if d is None else d.opciones_base()
+
+    return html.Div(style={
+        "fontFamily": "Arial, sans-serif",
+        "minHeight": "100vh",
+        "minWidth": "100vw",
+        "background": "linear-gradient(to bottom right, #93c5fd, #1d4ed8, #0f172a)",
+        "margin": "0",
+        "padding": "0",
+        "overflow": "hidden"
     }, children=[
-        html.H3("Menú"),
-        html.Ul([
-            html.Li("Inicio"),
-            html.Li("Datos"),
-            html.Li("Gráficos")
-        ])
-    ]),
 
-    # Contenido principal
-    html.Div(style={"padding": "40px 20px 0px 20px" }, children=[
+        # Navbar
         html.Div(style={
-           "display": "flex",
-            "flexDirection": "row",
-            "flexWrap": "wrap",
-            "gap": "30px",
-            "overflowX": "auto",
-            "paddingBottom": "10px"
-            }, children=[
-            
-            # 🔹 Tarjeta 1 - Índice General
+            "position": "fixed",
+            "top": "0",
+            "left": "0",
+            "width": "100%",
+            "background": "linear-gradient(to bottom right, #fff700, #facc15, #b45309)",
+            "padding": "10px 10px",
+            "color": "white",
+            "fontSize": "20px",
+            "fontWeight": "bold",
+            "zIndex": "1000",
+            "boxShadow": "0 2px 4px rgba(0,0,0,0.1)"
+        }, children=[html.Span("Inflación en Ecuador", style={"margin": "40px"})]),
+
+        # Botón hamburguesa
+        html.Div(className="hamburger", id="menu-button", n_clicks=0, children=[
+            html.Span(), html.Span(), html.Span()
+        ]),
+
+        # Sidebar
+        html.Div(id="sidebar", style={
+            "position": "fixed",
+            "top": "0",
+            "left": "0",
+            "height": "100vh",
+            "width": "250px",
+            "backgroundColor": "#1e3a8a",
+            "padding": "20px",
+            "display": "none",
+            "zIndex": "1500",
+            "color": "white"
+        }, children=[
+            html.H3("Menú"),
+            html.Ul([
+                html.Li("Inicio"),
+                html.Li("Datos"),
+                html.Li("Gráficos")
+            ])
+        ]),
+
+        # Contenido principal
+        html.Div(style={"padding": "40px 20px 0px 20px" }, children=[
             html.Div(style={
-                "display": "flex",
-                "flexDirection": "column",
-                "height": "120px",
-                "minHeight": "100px",
-                "minWidth": "90px"
-            }, children=[
-                html.P("Última Información", style={
-                    "fontWeight": "bold", "color": "#fff", "marginBottom": "6px",
-                    "fontSize": "18px", "textAlign": "center", 
-                    "height": "30px",
-                    "display": "flex", "alignItems": "center", "justifyContent": "center"
-                }),
+               "display": "flex",
+                "flexDirection": "row",
+                "flexWrap": "wrap",
+                "gap": "30px",
+                "overflowX": "auto",
+                "paddingBottom": "10px"
+                }, children=[
+            
+                # 🔹 Tarjeta 1 - Índice General
                 html.Div(style={
-                    "background": "rgba(255, 255, 255, 0.1)", "padding": "10px",
-                    "borderRadius": "12px", "boxShadow": "0 10px 15px rgba(0, 0, 0, 0.1)",
-                    "backdropFilter": "blur(4px)", "WebkitBackdropFilter": "blur(4px)",
-                    "width": "100%",
-                    "color": "#fff", "textAlign": "center",
-                    "display": "flex", "flexDirection": "column", "justifyContent": "center",
-                    "flex": "1"
+                    "display": "flex",
+                    "flexDirection": "column",
+                    "height": "120px",
+                    "minHeight": "100px",
+                    "minWidth": "90px"
                 }, children=[
-                    html.H4("Índice General", style={"margin": "4px 0 2px 0", "fontSize": "16px"}),
-                    html.P(ultima_fecha, style={"fontSize": "14px", "margin": "2px 0"}),
-                    html.H2(f"{ultimo_valor:.2f}", style={"color": "#FFEE8C", "fontSize": "18px", "margin": "2px 0"})
-                ])
-            ]),
+                    html.P("Última Información", style={
+                        "fontWeight": "bold", "color": "#fff", "marginBottom": "6px",
+                        "fontSize": "18px", "textAlign": "center", 
+                        "height": "30px",
+                        "display": "flex", "alignItems": "center", "justifyContent": "center"
+                    }),
+                    html.Div(style={
+                        "background": "rgba(255, 255, 255, 0.1)", "padding": "10px",
+                        "borderRadius": "12px", "boxShadow": "0 10px 15px rgba(0, 0, 0, 0.1)",
+                        "backdropFilter": "blur(4px)", "WebkitBackdropFilter": "blur(4px)",
+                        "width": "100%",
+                        "color": "#fff", "textAlign": "center",
+                        "display": "flex", "flexDirection": "column", "justifyContent": "center",
+                        "flex": "1"
+                    }, children=[
+                        html.H4("Índice General", style={"margin": "4px 0 2px 0", "fontSize": "16px"}),
+                        html.P(ultima_fecha, style={"fontSize": "14px", "margin": "2px 0"}),
+                        html.H2(f"{ultimo_valor:.2f}", style={"color": "#FFEE8C", "fontSize": "18px", "margin": "2px 0"})
+                    ])
+                ]),
             
-            # 🔹 Tarjeta 2 - Inflación Anual
-            html.Div(style={
-                "display": "flex",
-                "flexDirection": "column",
-                "height": "120px",
-                "minHeight": "100px",
-                "minWidth": "90px"
-            }, children=[
-                html.P("Última Información", style={
-                    "fontWeight": "bold", "color": "#fff", "marginBottom": "6px",
-                    "fontSize": "18px", "textAlign": "center", 
-                    "height": "30px",
-                    "display": "flex", "alignItems": "center", "justifyContent": "center"
-                }),
+                # 🔹 Tarjeta 2 - Inflación Anual
                 html.Div(style={
-                    "background": "rgba(255, 255, 255, 0.1)", "padding": "10px",
-                    "borderRadius": "12px", "boxShadow": "0 10px 15px rgba(0, 0, 0, 0.1)",
-                    "backdropFilter": "blur(4px)", "WebkitBackdropFilter": "blur(4px)",
-                    "width": "100%",
-                    "color": "#fff", "textAlign": "center",
-                    "display": "flex", "flexDirection": "column", "justifyContent": "center",
-                    "flex": "1"
+                    "display": "flex",
+                    "flexDirection": "column",
+                    "height": "120px",
+                    "minHeight": "100px",
+                    "minWidth": "90px"
                 }, children=[
-                    html.H4("Inflación Anual", style={"margin": "4px 0", "fontSize": "16px"}),
-                    html.P(ultima_fecha, style={"fontSize": "14px", "margin": "2px 0"}),
-                    html.H2(f"{ultimo_anual:.2f}%", style={"color": "#FFEE8C", "fontSize": "18px", "margin": "2px 0"})
-                ])
-            ]),
+                    html.P("Última Información", style={
+                        "fontWeight": "bold", "color": "#fff", "marginBottom": "6px",
+                        "fontSize": "18px", "textAlign": "center", 
+                        "height": "30px",
+                        "display": "flex", "alignItems": "center", "justifyContent": "center"
+                    }),
+                    html.Div(style={
+                        "background": "rgba(255, 255, 255, 0.1)", "padding": "10px",
+                        "borderRadius": "12px", "boxShadow": "0 10px 15px rgba(0, 0, 0, 0.1)",
+                        "backdropFilter": "blur(4px)", "WebkitBackdropFilter": "blur(4px)",
+                        "width": "100%",
+                        "color": "#fff", "textAlign": "center",
+                        "display": "flex", "flexDirection": "column", "justifyContent": "center",
+                        "flex": "1"
+                    }, children=[
+                        html.H4("Inflación Anual", style={"margin": "4px 0", "fontSize": "16px"}),
+                        html.P(ultima_fecha, style={"fontSize": "14px", "margin": "2px 0"}),
+                        html.H2(f"{ultimo_anual:.2f}%", style={"color": "#FFEE8C", "fontSize": "18px", "margin": "2px 0"})
+                    ])
+                ]),
             
-            # 🔹 Tarjeta 3 - IPC Seleccionado
-            html.Div(style={
-                "display": "flex",
-                "flexDirection": "column",
-                "height": "120px",
-                "minHeight": "100px",
-                "minWidth": "90px"
-            }, children=[
-                html.P("Información Seleccionada", style={
-                    "fontWeight": "bold", "color": "#fff", "fontSize": "18px",
-                    "textAlign": "center", 
-                    "height": "30px",
-                    "display": "flex", "alignItems": "center", "justifyContent": "center",
-                    "marginBottom": "6px"
-                }),
-                html.Div(id="card-ipc-seleccionado", style={
-                    "background": "rgba(255, 255, 255, 0.1)", "padding": "10px",
-                    "borderRadius": "12px", "boxShadow": "0 10px 15px rgba(0, 0, 0, 0.1)",
-                    "backdropFilter": "blur(4px)", "WebkitBackdropFilter": "blur(4px)",
-                    "width": "100%",
-                    "color": "#fff", "textAlign": "center",
-                    "display": "flex", "flexDirection": "column", "justifyContent": "center",
-                    "flex": "1"
+                # 🔹 Tarjeta 3 - IPC Seleccionado
+                html.Div(style={
+                    "display": "flex",
+                    "flexDirection": "column",
+                    "height": "120px",
+                    "minHeight": "100px",
+                    "minWidth": "90px"
                 }, children=[
-                    html.H4("IPC Seleccionado", style={"margin": "4px 0", "fontSize": "16px"}),
-                    html.P(id="fecha-ipc", style={"fontSize": "12px", "margin": "2px 0"}),
-                    html.H2(id="valor-ipc", style={"fontSize": "18px", "margin": "2px 0"})
-                ])
-            ]),
+                    html.P("Información Seleccionada", style={
+                        "fontWeight": "bold", "color": "#fff", "fontSize": "18px",
+                        "textAlign": "center", 
+                        "height": "30px",
+                        "display": "flex", "alignItems": "center", "justifyContent": "center",
+                        "marginBottom": "6px"
+                    }),
+                    html.Div(id="card-ipc-seleccionado", style={
+                        "background": "rgba(255, 255, 255, 0.1)", "padding": "10px",
+                        "borderRadius": "12px", "boxShadow": "0 10px 15px rgba(0, 0, 0, 0.1)",
+                        "backdropFilter": "blur(4px)", "WebkitBackdropFilter": "blur(4px)",
+                        "width": "100%",
+                        "color": "#fff", "textAlign": "center",
+                        "display": "flex", "flexDirection": "column", "justifyContent": "center",
+                        "flex": "1"
+                    }, children=[
+                        html.H4("IPC Seleccionado", style={"margin": "4px 0", "fontSize": "16px"}),
+                        html.P(id="fecha-ipc", style={"fontSize": "12px", "margin": "2px 0"}),
+                        html.H2(id="valor-ipc", style={"fontSize": "18px", "margin": "2px 0"})
+                    ])
+                ]),
             
-            # 🔹 Tarjeta 4 - Inflación Anual Seleccionada
-            html.Div(style={
-                "display": "flex",
-                "flexDirection": "column",
-                "height": "120px",
-                "minHeight": "100px",
-                "minWidth": "90px"
-            }, children=[
-                html.P("Información Seleccionada", style={
-                    "visibility": "hidden", "fontSize": "18px",
-                    "height": "30px",
-                    "marginBottom": "6px"
-                }),
-                html.Div(id="card-acumulada", style={
-                    "background": "rgba(255, 255, 255, 0.1)", "padding": "10px",
-                    "borderRadius": "12px", "boxShadow": "0 10px 15px rgba(0, 0, 0, 0.1)",
-                    "backdropFilter": "blur(4px)", "WebkitBackdropFilter": "blur(4px)",
-                    "width": "100%",
-                    "color": "#fff", "textAlign": "center",
-                    "display": "flex", "flexDirection": "column", "justifyContent": "center",
-                    "flex": "1"
+                # 🔹 Tarjeta 4 - Inflación Anual Seleccionada
+                html.Div(style={
+                    "display": "flex",
+                    "flexDirection": "column",
+                    "height": "120px",
+                    "minHeight": "100px",
+                    "minWidth": "90px"
                 }, children=[
-                    html.H4("Inflación Anual Seleccionada", style={"margin": "4px 0", "fontSize": "16px"}),
-                    html.P(id="fecha-anual", style={"fontSize": "12px", "margin": "2px 0"}),
-                    html.H2(id="anual", style={"fontSize": "18px", "margin": "2px 0"})
+                    html.P("Información Seleccionada", style={
+                        "visibility": "hidden", "fontSize": "18px",
+                        "height": "30px",
+                        "marginBottom": "6px"
+                    }),
+                    html.Div(id="card-acumulada", style={
+                        "background": "rgba(255, 255, 255, 0.1)", "padding": "10px",
+                        "borderRadius": "12px", "boxShadow": "0 10px 15px rgba(0, 0, 0, 0.1)",
+                        "backdropFilter": "blur(4px)", "WebkitBackdropFilter": "blur(4px)",
+                        "width": "100%",
+                        "color": "#fff", "textAlign": "center",
+                        "display": "flex", "flexDirection": "column", "justifyContent": "center",
+                        "flex": "1"
+                    }, children=[
+                        html.H4("Inflación Anual Seleccionada", id="titulo-indicador", style={"margin": "4px 0", "fontSize": "16px"}),
+                        html.P(id="fecha-anual", style={"fontSize": "12px", "margin": "2px 0"}),
+                        html.H2(id="anual", style={"fontSize": "18px", "margin": "2px 0"})
+                    ])
                 ])
-            ])
-        ]),
-        # 🔹 NUEVAS TARJETAS DE SELECCIÓN DE AÑOS POR RANGO
-        html.Div(style={"display": "flex", "gap": "15px", "marginTop": "10px"}, children=[
-            # Tarjeta 2006-2016
-            html.Div(id="card-2006-2016", n_clicks=0, style={
-                "background": "rgba(255, 255, 255, 0.1)",
-                "padding": "3px",
-                "borderRadius": "12px",
-                "boxShadow": "0 10px 15px rgba(0, 0, 0, 0.1)",
-                "backdropFilter": "blur(4px)",
-                "WebkitBackdropFilter": "blur(4px)",
-                "textAlign": "center",
-                "width": "160px",
-                "height": "70px",
-                "color": "#fff",
-                "cursor": "pointer"
-            }, children=[
-                html.H4("2006-2016", style={"margin": "4px 0 2px 0"}),
-                html.P("Rango de Años", style={"fontSize": "14px", "margin": "2px 0"}),
-                html.H2("Década 1", style={"color": "#FFEE8C", "margin": "2px 0", "fontSize": "18px"})
             ]),
-            # Tarjeta 2017-2021
-            html.Div(id="card-2017-2021", n_clicks=0, style={
-                "background": "rgba(255, 255, 255, 0.1)",
-                "padding": "3px",
-                "borderRadius": "12px",
-                "boxShadow": "0 10px 15px rgba(0, 0, 0, 0.1)",
-                "backdropFilter": "blur(4px)",
-                "WebkitBackdropFilter": "blur(4px)",
-                "textAlign": "center",
-                "width": "160px",
-                "height": "90px",
-                "color": "#fff",
-                "cursor": "pointer"
-            }, children=[
-                html.H4("2017-2021", style={"margin": "4px 0 2px 0"}),
-                html.P("Rango de Años", style={"fontSize": "14px", "margin": "2px 0"}),
-                html.H2("Quinquenio", style={"color": "#FFEE8C", "margin": "2px 0", "fontSize": "18px"})
-            ]),
-            # Tarjeta 2022-2025
-            html.Div(id="card-2022-2025", n_clicks=0, style={
-                "background": "rgba(255, 255, 255, 0.1)",
-                "padding": "3px",
-                "borderRadius": "12px",
-                "boxShadow": "0 10px 15px rgba(0, 0, 0, 0.1)",
-                "backdropFilter": "blur(4px)",
-                "WebkitBackdropFilter": "blur(4px)",
-                "textAlign": "center",
-                "width": "160px",
-                "height": "90px",
-                "color": "#fff",
-                "cursor": "pointer"
-            }, children=[
-                html.H4("2022-2025", style={"margin": "4px 0 2px 0"}),
-                html.P("Rango de Años", style={"fontSize": "14px", "margin": "2px 0"}),
-                html.H2("Actualidad", style={"color": "#FFEE8C", "margin": "2px 0", "fontSize": "18px"})
+            # 🔹 NUEVAS TARJETAS DE SELECCIÓN DE AÑOS POR RANGO
+            html.Div(style={"display": "flex", "gap": "15px", "marginTop": "10px"}, children=[
+                # Tarjeta 2006-2016
+                html.Div(id="card-2006-2016", n_clicks=0, style={
+                    "background": "rgba(255, 255, 255, 0.1)",
+                    "padding": "3px",
+                    "borderRadius": "12px",
+                    "boxShadow": "0 10px 15px rgba(0, 0, 0, 0.1)",
+                    "backdropFilter": "blur(4px)",
+                    "WebkitBackdropFilter": "blur(4px)",
+                    "textAlign": "center",
+                    "width": "160px",
+                    "height": "70px",
+                    "color": "#fff",
+                    "cursor": "pointer"
+                }, children=[
+                    html.H4("2006-2016", style={"margin": "4px 0 2px 0"}),
+                    html.P("Rango de Años", style={"fontSize": "14px", "margin": "2px 0"}),
+                    html.H2("Década 1", style={"color": "#FFEE8C", "margin": "2px 0", "fontSize": "18px"})
+                ]),
+                # Tarjeta 2017-2021
+                html.Div(id="card-2017-2021", n_clicks=0, style={
+                    "background": "rgba(255, 255, 255, 0.1)",
+                    "padding": "3px",
+                    "borderRadius": "12px",
+                    "boxShadow": "0 10px 15px rgba(0, 0, 0, 0.1)",
+                    "backdropFilter": "blur(4px)",
+                    "WebkitBackdropFilter": "blur(4px)",
+                    "textAlign": "center",
+                    "width": "160px",
+                    "height": "90px",
+                    "color": "#fff",
+                    "cursor": "pointer"
+                }, children=[
+                    html.H4("2017-2021", style={"margin": "4px 0 2px 0"}),
+                    html.P("Rango de Años", style={"fontSize": "14px", "margin": "2px 0"}),
+                    html.H2("Quinquenio", style={"color": "#FFEE8C", "margin": "2px 0", "fontSize": "18px"})
+                ]),
+                # Tarjeta 2022-2025
+                html.Div(id="card-2022-2025", n_clicks=0, style={
+                    "background": "rgba(255, 255, 255, 0.1)",
+                    "padding": "3px",
+                    "borderRadius": "12px",
+                    "boxShadow": "0 10px 15px rgba(0, 0, 0, 0.1)",
+                    "backdropFilter": "blur(4px)",
+                    "WebkitBackdropFilter": "blur(4px)",
+                    "textAlign": "center",
+                    "width": "160px",
+                    "height": "90px",
+                    "color": "#fff",
+                    "cursor": "pointer"
+                }, children=[
+                    html.H4("2022-2025", style={"margin": "4px 0 2px 0"}),
+                    html.P("Rango de Años", style={"fontSize": "14px", "margin": "2px 0"}),
+                    html.H2("Actualidad", style={"color": "#FFEE8C", "margin": "2px 0", "fontSize": "18px"})
+                ]),
             ]),
-        ]),
 
-        # 🔹 TARJETAS DE IPC Y VARIACIÓN ACUMULADA (EXISTENTES)
+            # 🔹 TARJETAS DE IPC Y VARIACIÓN ACUMULADA (EXISTENTES)
     
-       # Dropdown + gráfico
-        html.Div(style={"display": "flex", "gap": "10px", "marginTop": "20px"}, children=[
-            html.Div(style={"width": "200px"}, children=[
-                html.H4("Escoge Año", style={"margin": "4px 0 2px 0", "color": "white"}),
-                dcc.Dropdown(
-                    id="selector-anios",
-                    options=[{"label": str(y), "value": y} for y in available_years],
-                    value=[max(available_years)] if available_years else None,
-                    multi=True,
-                    placeholder="Selecciona uno o varios años..."
-                )
+           # Dropdown + gráfico
+            html.Div(style={"display": "flex", "gap": "10px", "marginTop": "20px"}, children=[
+                html.Div(style={"width": "200px"}, children=[
+                    html.H4("Escoge Año", style={"margin": "4px 0 2px 0", "color": "white"}),
+                    dcc.Dropdown(
+                        id="selector-anios",
+                        options=[{"label": str(y), "value": y} for y in anios],
+                        value=[max(anios)] if anios else None,
+                        multi=True,
+                        placeholder="Selecciona uno o varios años..."
+                    ),
+                    # Selectores de indicador y de serie (región, ciudad y clase ocultos si no existe el cubo de la
+                    # ingesta); en modo cliente el navegador solo tiene la variación anual nacional y quedan deshabilitados,
+                    # y en modo estático solo se exportan los indicadores de la serie nacional
+                    html.H4("Indicador", style={"margin": "10px 0 2px 0", "color": "white"}),
+                    dcc.Dropdown(
+                        id="selector-indicador",
+                        options=[{"label": etiqueta, "value": k} for k, (etiqueta, _) in INDICADORES.items()],
+                        value="anual",
+                        clearable=False,
+                        disabled=MODO_CLIENTE
+                    ),
+                    html.H4("Base 100", style={"margin": "10px 0 2px 0", "color": "white"}),
+                    dcc.Dropdown(
+                        id="selector-base",
+                        options=[] if d is None else d.opciones_base(),
+                        value=None,
+                        placeholder="Base original",
+                        disabled=MODO_CLIENTE or MODO_ESTATICO
+                    ),
+                    html.Div(style={} if con_cubo else {"display": "none"}, children=[
+                        html.H4("Región", style={"margin": "10px 0 2px 0", "color": "white"}),
+                        dcc.Dropdown(
+                            id="selector-region",
+                            options=[{"label": r, "value": r} for r in ["Nacional", *REGIONES]],
+                            value="Nacional",
+                            clearable=False,
+                            disabled=MODO_CLIENTE or MODO_ESTATICO
+                        ),
+                        html.H4("Ciudad", style={"margin": "10px 0 2px 0", "color": "white"}),
+                        dcc.Dropdown(
+                            id="selector-ciudad",
+                            options=opciones_ciudades("Nacional"),
+                            value=None,
+                            placeholder="Todas",
+                            disabled=MODO_CLIENTE or MODO_ESTATICO
+                        ),
+                        html.H4("Producto (CCIF)", style={"margin": "10px 0 2px 0", "color": "white"}),
+                        dcc.Dropdown(
+                            id="selector-clase",
+                            options=[] if d is None else d.opciones_clases(),
+                            value="0",
+                            clearable=False,
+                            disabled=MODO_CLIENTE or MODO_ESTATICO
+                        )
+                    ])
+                ]),
+                html.Div([
+                    dcc.Graph(id="grafico-lineas"),
+                    # Zoom con el ancho en píxeles del área del gráfico y tarjeta de rango activa (ver
+                    # actualizar_grafico); los escribe el navegador
+                    dcc.Store(id="zoom-grafico"),
+                    dcc.Store(id="periodo-activo"),
+                    dcc.Store(id="datos-serie", data=d.datos_cliente() if MODO_CLIENTE and d is not None else None),
+                    dcc.Store(id="estatico", data=config_estatico(d) if MODO_ESTATICO and d is not None else None)
+                ], style={"width": "55%" if con_incidencias else "90%", "borderRadius": "12px", "overflow": "hidden","height": "350px", "minHeight": "250px"}),
+                # Incidencias por división; en modo cliente se muestra fija para el último año
+                html.Div([
+                    dcc.Graph(
+                        id="grafico-incidencias",
+                        figure=figura_incidencias(d, None, anios[-1:], "anual") if MODO_CLIENTE and con_incidencias else None
+                    )
+                ], style={"width": "35%", "borderRadius": "12px", "overflow": "hidden","height": "350px", "minHeight": "250px",
+                          "display": "block" if con_incidencias else "none"})
             ]),
-            html.Div([
-                dcc.Graph(id="grafico-lineas")
-            ], style={"width": "90%", "borderRadius": "12px", "overflow": "hidden","height": "350px", "minHeight": "250px"})
+
+            # 🔹 CALCULADORA DE INFLACIÓN entre dos meses de la serie seleccionada, y por lotes desde un CSV
+            html.Div(style={
+                "display": "flex", "flexWrap": "wrap", "gap": "15px", "alignItems": "flex-end",
+                "marginTop": "20px", "marginBottom": "20px", "padding": "10px",
+                "background": "rgba(255, 255, 255, 0.1)", "borderRadius": "12px",
+                "boxShadow": "0 10px 15px rgba(0, 0, 0, 0.1)",
+                "backdropFilter": "blur(4px)", "WebkitBackdropFilter": "blur(4px)",
+                "color": "#fff"
+            }, children=[
+                html.Div(style={"width": "150px"}, children=[
+                    html.H4("Desde", style={"margin": "4px 0 2px 0"}),
+                    dcc.Dropdown(id="calc-desde", options=opciones_meses, clearable=False,
+                                 value=opciones_meses[max(len(opciones_meses) - 13, 0)]["value"] if opciones_meses else None)
+                ]),
+                html.Div(style={"width": "150px"}, children=[
+                    html.H4("Hasta", style={"margin": "4px 0 2px 0"}),
+                    dcc.Dropdown(id="calc-hasta", options=opciones_meses, clearable=False,
+                                 value=opciones_meses[-1]["value"] if opciones_meses else None)
+                ]),
+                html.Div(style={"width": "130px"}, children=[
+                    html.H4("Monto", style={"margin": "4px 0 2px 0"}),
+                    dcc.Input(id="calc-monto", type="number", value=100, min=0, debounce=True,
+                              style={"width": "120px", "height": "30px"})
+                ]),
+                html.Div(id="calc-resultado", style={"minWidth": "260px", "textAlign": "center"}),
+                # Los lotes se resuelven en el servidor: no hay subida en modo estático
+                html.Div(style={"width": "260px", "display": "none" if MODO_ESTATICO else "block"}, children=[
+                    dcc.Upload(id="calc-archivo", children=html.Div("Contratos en CSV (desde, hasta, monto)"), style={
+                        "border": "1px dashed #fff", "borderRadius": "8px", "padding": "8px",
+                        "textAlign": "center", "cursor": "pointer", "fontSize": "14px"
+                    }),
+                    html.P(id="calc-estado-lote", style={"fontSize": "12px", "margin": "2px 0"}),
+                    dcc.Download(id="calc-descarga")
+                ])
+            ])
         ])
     ])
-])
 
-# Callback unificado corregido para el gráfico
-@app.callback(
-    Output("grafico-lineas", "figure"),
-    [Input("selector-anios", "value"),
-     Input("card-2006-2016", "n_clicks"),
-     Input("card-2017-2021", "n_clicks"),
-     Input("card-2022-2025", "n_clicks")]
-)
-def actualizar_grafico(anios_seleccionados_dropdown, n_clicks_06_16, n_clicks_17_21, n_clicks_22_25):
+# Estados exportados en modo estático: nombre del archivo -> (rango, años), como en periodo_seleccionado
+def clave_anios(anios):
+    return "anios-" + "-".join(str(a) for a in sorted(set(anios)))
+
+def periodos_estaticos(anios):
+    periodos = {f"rango-{desde}-{hasta}": ((desde, hasta), None) for desde, hasta in RANGOS_ANIOS.values()}
+    combinaciones = [[a] for a in anios] + [anios[-n:] for n in ULTIMOS_ANIOS if n < len(anios)] + [anios]
+    periodos.update({clave_anios(c): (None, c) for c in combinaciones if c})
+    return periodos
+
+# Los archivos de una exportación no cambian: su directorio combina la versión de datos y la huella del
+# código que da forma a las figuras
+def version_estatica(d):
+    return f"{d.version}-{huella_codigo()}"
+
+# Configuración del navegador en modo estático (dcc.Store "estatico"): dónde están los archivos de la
+# versión exportada y qué estados existen
+def config_estatico(d):
+    return {
+        "url": f"{URL_ESTATICO}v/{version_estatica(d)}/",
+        "periodos": list(periodos_estaticos(d.anios)),
+        "ultimo_anio": max(d.anios) if d.anios else datetime.now().year,
+        "rangos": RANGOS_ANIOS,
+        "titulos": {k: titulo for k, (_, titulo) in INDICADORES.items()},
+        "medidas": {k: MEDIDA_INCIDENCIA.get(k, "anual") for k in INDICADORES},
+        "incidencias": d.series_incidencias is not None,
+    }
+
+# Periodo a graficar: el rango de la tarjeta que disparó el callback o los años del selector
+def periodo_seleccionado(anios_seleccionados_dropdown, available_years):
     ctx = dash.callback_context
     anios_a_mostrar = anios_seleccionados_dropdown if anios_seleccionados_dropdown else []
 
     # Detectar qué input disparó el callback
     if ctx.triggered:
         button_id = ctx.triggered[0]["prop_id"].split(".")[0]
-        
-        if button_id == "card-2006-2016":
-            anios_a_mostrar = list(range(2006, 2017))
-        elif button_id == "card-2017-2021":
-            anios_a_mostrar = list(range(2017, 2022))
-        elif button_id == "card-2022-2025":
-            anios_a_mostrar = list(range(2022, 2026))
+
+        if button_id in RANGOS_ANIOS:
+            return RANGOS_ANIOS[button_id], anios_a_mostrar
 
     # Si no hay años seleccionados, mostrar el último año por defecto
     if not anios_a_mostrar:
@@ -323,94 +831,350 @@ def actualizar_grafico(anios_seleccionados_dropdown, n_clicks_06_16, n_clicks_17
             anios_a_mostrar = [max(available_years)]
         else:
             anios_a_mostrar = [datetime.now().year]
+    return None, anios_a_mostrar
 
-    # Filtrar datos y crear gráfico
-    df_filtrado = df[df["Año"].isin(anios_a_mostrar)].copy()
-    df_filtrado = df_filtrado.sort_values(by="Mes")
-
-    fig = go.Figure()
-    if not df_filtrado.empty:
-        fig.add_trace(go.Scatter(
-            x=df_filtrado["Mes"],
-            y=df_filtrado["IPC"],
-            mode="lines+markers",
-            name="IPC General",
-            yaxis="y1",
-            line=dict(color="#FFDE21")
-        ))
-        fig.add_trace(go.Scatter(
-            x=df_filtrado["Mes"],
-            y=df_filtrado["anual"],
-            mode="lines+markers",
-            name="Variación Anual (%)",
-            yaxis="y2",
-            line=dict(color="#00FFFF", dash="dash")
-        ))
-    
-    fig.update_layout(
-        title=dict(text="IPC y Variación Anual", font=dict(color="white"), pad=dict(b=0)),
-        font=dict(color="white"),
-        height=350,
-        xaxis=dict(title="Fecha", color="white", tickfont=dict(color="white")),
-        yaxis=dict(title=dict(text="Índice General (IPC)", font=dict(color="white")), tickfont=dict(color="white")),
-        yaxis2=dict(
-            title=dict(text="Variación Anual (%)", font=dict(color="white")),
-            tickfont=dict(color="white"),
-            overlaying="y",
-            side="right"
-        ),
-        legend=dict(font=dict(color="white"), x=0, y=1.1, orientation="h"),
-        template="plotly_white",
-        plot_bgcolor="rgba(255, 255, 255, 0.1)",
-        paper_bgcolor="rgba(255, 255, 255, 0.1)"
-    )
-    
-    return fig
+# Ventana de un zoom en relayoutData: (desde, hasta), "auto" al volver a la vista completa o None
+def ventana_zoom(relayout):
+    relayout = relayout or {}
+    if "xaxis.range[0]" in relayout and "xaxis.range[1]" in relayout:
+        extremos = relayout["xaxis.range[0]"], relayout["xaxis.range[1]"]
+    elif "xaxis.range" in relayout:
+        extremos = relayout["xaxis.range"]
+    elif relayout.get("xaxis.autorange"):
+        return "auto"
+    else:
+        return None
+    return tuple(np.datetime64(str(e)[:10], "D") for e in extremos)
+
+# Puntos por traza de una ventana de zoom: uno por columna de píxeles del área del gráfico, redondeado a
+# centenas para que los anchos parecidos compartan figura en la caché; sin ancho, PUNTOS_MAX
+ANCHO_MAX = 4000
+
+def puntos_zoom(ancho):
+    if not isinstance(ancho, (int, float)) or ancho <= 0:
+        return PUNTOS_MAX
+    return int(min(math.ceil(ancho / 100) * 100, ANCHO_MAX))
+
+# Figura (JSON ya decodificado) de una serie en un rango de años, un conjunto de años o una ventana
+# de zoom; la clave normalizada (versión de datos + serie + indicador + periodo) identifica la figura.
+# Con ``en_pool=False`` se construye en el hilo aunque haya pool
+def figura_serie(d, geografia, clase, indicador, base, rango, anios_a_mostrar, ventana=None, en_pool=True,
+                 puntos=PUNTOS_MAX):
+    return json.loads(texto_figura_serie(d, geografia, clase, indicador, base, rango, anios_a_mostrar, ventana,
+                                         en_pool, puntos))
+
+# La misma figura serializada (tal como se guarda en la caché y se exporta en modo estático)
+def texto_figura_serie(d, geografia, clase, indicador, base, rango, anios_a_mostrar, ventana=None, en_pool=True,
+                       puntos=PUNTOS_MAX):
+    serie_grafico = d.obtener_serie(geografia, clase, base)
+    prefijo = (d.version, geografia, clase, indicador, base)
+    if ventana is not None:
+        clave = prefijo + ("zoom", puntos) + tuple(str(e) for e in ventana)
+        seleccionar = lambda: serie_grafico.vista_fechas(*ventana)
+    elif rango is not None:
+        clave = prefijo + ("rango",) + rango
+        seleccionar = lambda: serie_grafico.vista_rango(*rango)
+    else:
+        clave = prefijo + ("anios",) + tuple(sorted(set(anios_a_mostrar)))
+        seleccionar = lambda: serie_grafico.vista(anios_a_mostrar)
+
+    def construir():
+        with metricas.fase("actualizar_grafico", "filtrado"):
+            fechas, columnas = seleccionar()
+        with metricas.fase("actualizar_grafico", "figura"):
+            # Solo las columnas que se dibujan viajan al pool; con la variación anual de la serie
+            # nacional van también las medidas subyacentes
+            dibujadas = ["IPC", indicador] + [m for m in nucleo.MEDIDAS if indicador == "anual" and m in columnas]
+            columnas = {nombre: columnas[nombre] for nombre in dibujadas}
+            # El abanico del pronóstico (precalculado) solo se dibuja si la vista llega al último mes
+            abanico = None
+            if len(fechas) and fechas[-1] == serie_grafico.fechas[-1]:
+                abanico = d.pronostico_serie(geografia, clase, base)
+            return ejecutor_figuras.ejecutar(figura_json, fechas, columnas, d.nombre_serie(geografia, clase),
+                                             indicador, ventana, abanico, puntos,
+                                             peso=len(fechas) if en_pool else None)
+
+    return cache_figuras.obtener_o_construir(clave, construir)
+
+# Serie de los selectores, validada: una geografía o clase que no está en el cubo vigente (p. ej. la de
+# una página cargada antes de una recarga, o una petición armada a mano) da None, y un mes base fuera
+# de la serie vuelve a la base por defecto; devuelve también la base usada
+def serie_seleccionada(d, geografia, clase, base):
+    try:
+        return d.obtener_serie(geografia, clase, base), base
+    except KeyError:
+        return None, None
+    except (TypeError, ValueError):
+        return d.obtener_serie(geografia, clase), None
+
+# Callback unificado corregido para el gráfico
+@metricas.instrumentar("actualizar_grafico")
+def actualizar_grafico(anios_seleccionados_dropdown, n_clicks_06_16, n_clicks_17_21, n_clicks_22_25,
+                       zoom=None, indicador=None, base=None, region=None, ciudad=None, clase=None,
+                       periodo_activo=None):
+    d = datos()
+    geografia, clase = geografia_seleccionada(region, ciudad), clase or "0"
+    indicador = indicador if indicador in INDICADORES else "anual"
+    serie, base = serie_seleccionada(d, geografia, clase, base)
+    if serie is None:
+        return dash.no_update
+    rango, anios_a_mostrar = periodo_seleccionado(anios_seleccionados_dropdown, d.anios)
+
+    # Un zoom solo requiere otra figura si la serie pudo haberse submuestreado: la ventana visible se
+    # vuelve a pedir a resolución completa o submuestreada al ancho en píxeles del gráfico. Al volver a
+    # la vista completa se dibuja el periodo vigente (la tarjeta de rango activa o los años elegidos)
+    ventana, puntos = None, PUNTOS_MAX
+    if dash.callback_context.triggered_id == "zoom-grafico":
+        zoom = zoom or {}
+        ventana = ventana_zoom(zoom.get("relayout"))
+        if ventana is None or len(serie.fechas) <= PUNTOS_MAX:
+            return dash.no_update
+        if ventana == "auto":
+            ventana = None
+            rango = RANGOS_ANIOS.get(periodo_activo, rango)
+        else:
+            puntos = puntos_zoom(zoom.get("ancho"))
+
+    return figura_serie(d, geografia, clase, indicador, base, rango, anios_a_mostrar, ventana, puntos=puntos)
+
+# Incidencias del mismo periodo que el gráfico principal, en la medida del indicador elegido
+@metricas.instrumentar("actualizar_incidencias")
+def actualizar_incidencias(anios_seleccionados_dropdown, n_clicks_06_16, n_clicks_17_21, n_clicks_22_25, indicador=None):
+    d = datos()
+    if d.series_incidencias is None:
+        return dash.no_update
+    rango, anios_a_mostrar = periodo_seleccionado(anios_seleccionados_dropdown, d.anios)
+    return figura_incidencias(d, rango, anios_a_mostrar, MEDIDA_INCIDENCIA.get(indicador, "anual"))
 
 # Callback para actualizar tarjetas al hacer clic en el gráfico
-@app.callback(
-    [Output("fecha-ipc", "children"),
-     Output("valor-ipc", "children"),
-     Output("fecha-anual", "children"),
-     Output("anual", "children")],
-    Input("grafico-lineas", "clickData")
-)
-def actualizar_tarjetas(clickData):
-    if clickData and not df.empty:
-        fecha_str_click = clickData["points"][0]["x"]
-        fecha_dt = pd.to_datetime(fecha_str_click)
-        
-        idx_cercano = (df["Mes"] - fecha_dt).abs().argsort()[0]
-        fila_seleccionada = df.iloc[idx_cercano]
-
-        fecha_display = fila_seleccionada["Mes"].strftime("%b-%Y")
-        ipc_actual = fila_seleccionada["IPC"]
-        anual_actual = fila_seleccionada["anual"]
+@metricas.instrumentar("actualizar_tarjetas")
+def actualizar_tarjetas(clickData, indicador=None, base=None, region=None, ciudad=None, clase=None):
+    serie_tarjetas, _ = serie_seleccionada(datos(), geografia_seleccionada(region, ciudad), clase or "0", base)
+    if clickData and serie_tarjetas is not None and len(serie_tarjetas.fechas):
+        fecha_display, fila = serie_tarjetas.fila(clickData["points"][0]["x"])
+        valor_indicador = fila[indicador if indicador in INDICADORES else "anual"]
 
         return (
             fecha_display,
-            f"{ipc_actual:.2f}",
+            f"{fila['IPC']:.2f}",
             fecha_display,
-            f"{anual_actual:.2f}%" if pd.notna(anual_actual) else "No disponible"
+            f"{valor_indicador:.2f}%" if not np.isnan(valor_indicador) else "No disponible"
         )
     return "", "Seleccione punto", "", "Seleccione punto"
 
+# Calculadora: inflación entre dos meses de la serie seleccionada y equivalente del monto
+def etiqueta_mes(ordinal):
+    return date(ordinal // 12, ordinal % 12 + 1, 1).strftime("%b-%Y")
+
+@metricas.instrumentar("calcular_inflacion")
+def calcular_inflacion(desde, hasta, monto, region=None, ciudad=None, clase=None):
+    if desde is None or hasta is None:
+        return "Elige los meses"
+    d = datos()
+    geografia, clase = geografia_seleccionada(region, ciudad), clase or "0"
+    try:
+        resultado = d.tabla_periodos(geografia, clase).calcular(desde, hasta, monto)
+    except KeyError:
+        return "Serie no disponible"
+    if np.isnan(resultado["factor"]):
+        return f"Sin dato de {d.nombre_serie(geografia, clase)} en {etiqueta_mes(desde)} o {etiqueta_mes(hasta)}"
+    equivalencia = [] if monto is None else [html.P(
+        f"{monto:,.2f} de {etiqueta_mes(desde)} equivalen a {float(resultado['monto_ajustado']):,.2f} de {etiqueta_mes(hasta)}",
+        style={"fontSize": "14px", "margin": "2px 0"})]
+    return [
+        html.H4(f"Inflación {etiqueta_mes(desde)} – {etiqueta_mes(hasta)}", style={"margin": "4px 0", "fontSize": "16px"}),
+        html.H2(f"{float(resultado['inflacion']):.2f}%", style={"color": "#FFEE8C", "fontSize": "18px", "margin": "2px 0"}),
+        *equivalencia,
+    ]
+
+# Lote de consultas subido como CSV: se resuelve de una vez (calculadora.py) y se descarga con los resultados
+@metricas.instrumentar("calcular_lote")
+def calcular_lote(contenido, nombre, region=None, ciudad=None, clase=None):
+    if contenido is None:
+        return dash.no_update, ""
+    d = datos()
+    try:
+        texto = base64.b64decode(contenido.split(",", 1)[1]).decode("utf-8-sig")
+        salida = resolver_csv(texto, d.tabla_periodos, geografia_seleccionada(region, ciudad), clase or "0")
+    except UnicodeDecodeError:
+        return dash.no_update, "El CSV debe estar en UTF-8"
+    except ValueError as error:
+        return dash.no_update, str(error)
+    filas = salida.count("\n") - 1
+    base_nombre = os.path.splitext(nombre or "consultas")[0]
+    return dcc.send_string(salida, f"{base_nombre}_inflacion.csv"), f"{filas} filas calculadas"
+
+# El título de la cuarta tarjeta sigue al indicador elegido
+def actualizar_titulo_indicador(indicador):
+    return INDICADORES[indicador or "anual"][1]
+
+# Las ciudades disponibles dependen de la región elegida
+def actualizar_ciudades(region):
+    return opciones_ciudades(region), None
+
 # Sidebar toggle
-@app.callback(
-    Output("sidebar", "style"),
-    Input("menu-button", "n_clicks"),
-    State("sidebar", "style")
-)
+@metricas.instrumentar("toggle_sidebar")
 def toggle_sidebar(n_clicks, style):
     if n_clicks is None:
         return style or {"display": "none"}
-    
+
     if n_clicks % 2 == 1:
         style["display"] = "block"
     else:
         style["display"] = "none"
     return style
 
+# Registro de callbacks: en modo cliente las mismas entradas y salidas se resuelven en el navegador, y en
+# modo estático también, con las figuras exportadas (sin ningún callback en el servidor). Las entradas no dependen de los datos (los selectores de serie existen siempre en el layout)
+SALIDA_GRAFICO = Output("grafico-lineas", "figure")
+ENTRADAS_GRAFICO = [Input("selector-anios", "value"),
+                    Input("card-2006-2016", "n_clicks"),
+                    Input("card-2017-2021", "n_clicks"),
+                    Input("card-2022-2025", "n_clicks")]
+SALIDAS_TARJETAS = [Output("fecha-ipc", "children"),
+                    Output("valor-ipc", "children"),
+                    Output("fecha-anual", "children"),
+                    Output("anual", "children")]
+SELECTORES_SERIE = ["selector-indicador", "selector-base", "selector-region", "selector-ciudad", "selector-clase"]
+SELECTORES_GEOGRAFIA = ["selector-region", "selector-ciudad", "selector-clase"]
+
+def registrar_callbacks(app):
+    if MODO_ESTATICO:
+        configuracion = State("estatico", "data")
+        app.clientside_callback(ClientsideFunction("estatico", "actualizar_grafico"), SALIDA_GRAFICO,
+                                ENTRADAS_GRAFICO + [Input("selector-indicador", "value")], configuracion)
+        app.clientside_callback(ClientsideFunction("estatico", "actualizar_incidencias"),
+                                Output("grafico-incidencias", "figure"),
+                                ENTRADAS_GRAFICO + [Input("selector-indicador", "value")], configuracion)
+        app.clientside_callback(ClientsideFunction("estatico", "actualizar_tarjetas"), SALIDAS_TARJETAS,
+                                Input("grafico-lineas", "clickData"), State("selector-indicador", "value"), configuracion)
+        app.clientside_callback(ClientsideFunction("estatico", "actualizar_titulo_indicador"),
+                                Output("titulo-indicador", "children"), Input("selector-indicador", "value"), configuracion)
+        app.clientside_callback(ClientsideFunction("estatico", "calcular_inflacion"), Output("calc-resultado", "children"),
+                                Input("calc-desde", "value"), Input("calc-hasta", "value"), Input("calc-monto", "value"),
+                                configuracion)
+        app.clientside_callback(ClientsideFunction("ipc", "toggle_sidebar"),
+                                Output("sidebar", "style"), Input("menu-button", "n_clicks"), State("sidebar", "style"))
+        return
+    # La calculadora se resuelve en el servidor también en modo cliente
+    app.callback(Output("calc-resultado", "children"),
+                 [Input("calc-desde", "value"), Input("calc-hasta", "value"), Input("calc-monto", "value")]
+                 + [Input(s, "value") for s in SELECTORES_GEOGRAFIA])(calcular_inflacion)
+    app.callback([Output("calc-descarga", "data"), Output("calc-estado-lote", "children")],
+                 Input("calc-archivo", "contents"), State("calc-archivo", "filename"),
+                 *[State(s, "value") for s in SELECTORES_GEOGRAFIA], prevent_initial_call=True)(calcular_lote)
+    if MODO_CLIENTE:
+        app.clientside_callback(ClientsideFunction("ipc", "actualizar_grafico"),
+                                SALIDA_GRAFICO, ENTRADAS_GRAFICO, State("datos-serie", "data"))
+        app.clientside_callback(ClientsideFunction("ipc", "actualizar_tarjetas"),
+                                SALIDAS_TARJETAS, Input("grafico-lineas", "clickData"), State("datos-serie", "data"))
+        app.clientside_callback(ClientsideFunction("ipc", "toggle_sidebar"),
+                                Output("sidebar", "style"), Input("menu-button", "n_clicks"), State("sidebar", "style"))
+        return
+    # El navegador añade al zoom el ancho del área del gráfico y recuerda la tarjeta de rango activa
+    app.clientside_callback(ClientsideFunction("ipc", "zoom_grafico"), Output("zoom-grafico", "data"),
+                            Input("grafico-lineas", "relayoutData"))
+    app.clientside_callback(ClientsideFunction("ipc", "periodo_activo"), Output("periodo-activo", "data"),
+                            ENTRADAS_GRAFICO)
+    app.callback(SALIDA_GRAFICO, ENTRADAS_GRAFICO + [Input("zoom-grafico", "data")]
+                 + [Input(s, "value") for s in SELECTORES_SERIE], State("periodo-activo", "data"))(actualizar_grafico)
+    app.callback(SALIDAS_TARJETAS, Input("grafico-lineas", "clickData"),
+                 *[State(s, "value") for s in SELECTORES_SERIE])(actualizar_tarjetas)
+    app.callback(Output("titulo-indicador", "children"), Input("selector-indicador", "value"))(actualizar_titulo_indicador)
+    app.callback(Output("grafico-incidencias", "figure"),
+                 ENTRADAS_GRAFICO + [Input("selector-indicador", "value")])(actualizar_incidencias)
+    app.callback([Output("selector-ciudad", "options"), Output("selector-ciudad", "value")],
+                 Input("selector-region", "value"))(actualizar_ciudades)
+    app.callback(Output("sidebar", "style"), Input("menu-button", "n_clicks"), State("sidebar", "style"))(toggle_sidebar)
+
+# El layout servido se construye una vez por versión de datos
+_layout_servido = (None, None)
+
+def servir_layout():
+    global _layout_servido
+    d = datos()
+    version, layout = _layout_servido
+    if version != d.version:
+        layout = construir_layout(d)
+        _layout_servido = (d.version, layout)
+    return layout
+
+# En modo estático el layout es el que escribió exportar.py, ya serializado; se vuelve a leer cuando cambia
+# el archivo (exportación de una versión nueva)
+_layout_estatico = (None, None)
+
+def layout_estatico():
+    global _layout_estatico
+    ruta = os.path.join(DIR_ESTATICO, "layout.json")
+    try:
+        marca = os.stat(ruta).st_mtime_ns
+    except FileNotFoundError:
+        raise RuntimeError(f"No hay exportación en {DIR_ESTATICO}: ejecutar exportar.py") from None
+    version, texto = _layout_estatico
+    if version != marca:
+        with open(ruta, "rb") as f:
+            texto = f.read()
+        _layout_estatico = (marca, texto)
+    return texto
+
+def crear_app():
+    app = dash.Dash(__name__)
+    app.title = "Dashboard IPC"
+    ruta_estatico = app.config.routes_pathname_prefix + "estatico/"
+    # Compresión de layout, callbacks y bundles, y caché inmutable de los recursos con huella (compresion.py);
+    # en modo estático, también de los archivos exportados de cada versión
+    minimo_compresion = int(os.environ.get("IPC_COMPRESION_MIN", 1024))
+    app.server.extensions["precomprimir"] = registrar_compresion(
+        app.server, minimo_compresion, app.config.assets_folder,
+        app.config.routes_pathname_prefix + app.config.assets_url_path.strip("/") + "/",
+        inmutables=(ruta_estatico + "v/",) if MODO_ESTATICO else ())
+    # Después de la compresión: el tamaño de las respuestas se mide antes de comprimirlas
+    metricas.registrar_endpoint(app.server)
+    if MODO_ESTATICO:
+        # Solo lectura: ni API ni datos, solo los archivos de la exportación. El layout exportado se
+        # responde antes de la vista de Dash (que construiría el de la app)
+        app.server.add_url_rule(ruta_estatico + "<path:ruta>", "estatico",
+                                lambda ruta: flask.send_from_directory(DIR_ESTATICO, ruta))
+        ruta_layout = app.config.routes_pathname_prefix + "_dash-layout"
+        app.server.before_request(lambda: flask.Response(layout_estatico(), mimetype="application/json")
+                                  if flask.request.path == ruta_layout else None)
+    else:
+        # API de solo lectura (api.py) sobre la instantánea vigente en cada petición
+        registrar_api(app.server, datos, list(INDICADORES), cache_consultas, minimo_compresion)
+    # Con validation_layout ya asignado, Dash no evalúa la función de layout al asignarla
+    app.validation_layout = construir_layout(None)
+    app.layout = app.validation_layout if MODO_ESTATICO else servir_layout
+    registrar_callbacks(app)
+    return app
+
+# Carga previa para el maestro de gunicorn (preload_app): la instantánea, el layout y la figura
+# inicial quedan construidos (y los validadores de plotly importados) antes del fork. La figura se
+# construye en el hilo para no crear el pool de procesos en el maestro
+def bundles_dash():
+    """Pares ``(ruta, archivo)`` de los bundles que sirve Dash, incluidos los diferidos (plotly.js)."""
+    # Dash registra sus bundles al generar la página; la ruta es la de la URL sin huella
+    app.server.test_client().get(app.config.routes_pathname_prefix)
+    base = app.config.routes_pathname_prefix + "_dash-component-suites/"
+    return [(f"{base}{paquete}/{ruta}", os.path.join(os.path.dirname(sys.modules[paquete].__file__), ruta))
+            for paquete, rutas in app.registered_paths.items() for ruta in sorted(rutas)]
+
+def precargar():
+    # Los bundles se comprimen al máximo una vez, antes del fork, en lugar de en la primera petición
+    # de cada worker
+    if os.environ.get("IPC_PRECOMPRIMIR", "1") != "0":
+        app.server.extensions["precomprimir"](bundles_dash())
+    if MODO_ESTATICO:
+        layout_estatico()
+        return
+    d = datos()
+    servir_layout()
+    if d.anios:
+        figura_serie(d, "Nacional", "0", "anual", None, None, d.anios[-1:], en_pool=False)
+
+app = crear_app()
+
 if __name__ == '__main__':
+    # Servidor de desarrollo; en producción usar gunicorn con wsgi.py
     port = int(os.environ.get("PORT", 8050))
-    app.run(host='0.0.0.0', port=port, debug=True)
\ No newline at end of file
+    debug = os.environ.get("DASH_DEBUG", "0") == "1"
+    app.run(host='0.0.0.0', port=port, debug=debug)
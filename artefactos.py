@@ -0,0 +1,26 @@
+"""Artefactos derivados que la ingesta guarda junto al cubo (``.npz``).
+
+Cada artefacto es una ``namedtuple`` de arrays (incidencias, medidas de
+inflación subyacente, pronósticos) que se guarda en un archivo del directorio
+del cubo. La escritura pasa por un temporal y ``os.replace``, así que un
+lector ve el archivo anterior o el nuevo completo, nunca uno a medias.
+"""
+
+import os
+
+import numpy as np
+
+
+def guardar(directorio, archivo, artefacto):
+    temporal = os.path.join(directorio, archivo.replace(".npz", ".tmp.npz"))
+    np.savez(temporal, **artefacto._asdict())
+    os.replace(temporal, os.path.join(directorio, archivo))
+
+
+def cargar(directorio, archivo, tipo):
+    # Artefacto de tipo ``tipo`` guardado en ``archivo``, o None si la ingesta no lo generó
+    try:
+        with np.load(os.path.join(directorio, archivo)) as z:
+            return tipo(**{k: z[k] for k in tipo._fields})
+    except OSError:
+        return None
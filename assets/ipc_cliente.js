@@ -0,0 +1,96 @@
+// Modo cliente (IPC_MODO_CLIENTE=1): la serie llega una sola vez en el dcc.Store
+// "datos-serie" y el filtrado por años, las tarjetas y el menú se resuelven en el navegador.
+// zoom_grafico y periodo_activo acompañan al callback del gráfico del servidor (modo normal).
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    ipc: {
+        actualizar_grafico: function (anios, n1, n2, n3, datos) {
+            if (!datos) {
+                return window.dash_clientside.no_update;
+            }
+            var ctx = window.dash_clientside.callback_context;
+            var disparador = ctx && ctx.triggered.length ? ctx.triggered[0].prop_id.split(".")[0] : null;
+            var desde = null, hasta = null, seleccion = {};
+
+            if (disparador && datos.rangos[disparador]) {
+                desde = datos.rangos[disparador][0];
+                hasta = datos.rangos[disparador][1];
+            } else {
+                var lista = anios && anios.length ? anios : [datos.ultimo_anio];
+                lista.forEach(function (a) { seleccion[a] = true; });
+            }
+
+            var x = [], ipc = [], anual = [];
+            for (var i = 0; i < datos.fechas.length; i++) {
+                var anio = datos.anios[i];
+                var incluido = desde !== null ? (anio >= desde && anio <= hasta) : seleccion[anio];
+                if (incluido) {
+                    x.push(datos.fechas[i]);
+                    ipc.push(datos.ipc[i]);
+                    anual.push(datos.anual[i]);
+                }
+            }
+
+            var trazas = [];
+            if (x.length) {
+                trazas = [
+                    {type: "scatter", x: x, y: ipc, mode: "lines+markers", name: "IPC General",
+                     yaxis: "y", line: {color: "#FFDE21"}},
+                    {type: "scatter", x: x, y: anual, mode: "lines+markers", name: "Variación Anual (%)",
+                     yaxis: "y2", line: {color: "#00FFFF", dash: "dash"}}
+                ];
+            }
+            return {data: trazas, layout: datos.layout};
+        },
+
+        actualizar_tarjetas: function (clickData, datos) {
+            if (!clickData || !datos || !datos.fechas.length) {
+                return ["", "Seleccione punto", "", "Seleccione punto"];
+            }
+            // Búsqueda binaria del mes más cercano a la fecha del clic
+            var objetivo = Date.parse(String(clickData.points[0].x).slice(0, 10));
+            var bajo = 0, alto = datos.fechas.length;
+            while (bajo < alto) {
+                var medio = (bajo + alto) >> 1;
+                if (Date.parse(datos.fechas[medio]) < objetivo) { bajo = medio + 1; } else { alto = medio; }
+            }
+            var i = Math.min(bajo, datos.fechas.length - 1);
+            if (i > 0 && objetivo - Date.parse(datos.fechas[i - 1]) <= Date.parse(datos.fechas[i]) - objetivo) {
+                i = i - 1;
+            }
+            var etiqueta = datos.etiquetas[i];
+            var anual = datos.anual[i];
+            return [
+                etiqueta,
+                datos.ipc[i].toFixed(2),
+                etiqueta,
+                anual === null ? "No disponible" : anual.toFixed(2) + "%"
+            ];
+        },
+
+        // Zoom del gráfico con el ancho en píxeles de su área de trazado: el servidor submuestrea la
+        // ventana a ese número de puntos
+        zoom_grafico: function (relayout) {
+            var contenedor = document.getElementById("grafico-lineas");
+            var grafico = contenedor && contenedor.querySelector(".js-plotly-plot");
+            var ancho = grafico && grafico._fullLayout ? grafico._fullLayout.xaxis._length
+                : (contenedor ? contenedor.clientWidth : null);
+            return {relayout: relayout, ancho: ancho ? Math.round(ancho) : null};
+        },
+
+        // Tarjeta de rango que eligió el periodo vigente (null si lo eligió el selector de años)
+        periodo_activo: function () {
+            var ctx = window.dash_clientside.callback_context;
+            var disparador = ctx && ctx.triggered.length ? ctx.triggered[0].prop_id.split(".")[0] : null;
+            return disparador && disparador.indexOf("card-") === 0 ? disparador : null;
+        },
+
+        toggle_sidebar: function (n_clicks, style) {
+            var nuevo = Object.assign({}, style || {display: "none"});
+            if (n_clicks === null || n_clicks === undefined) {
+                return nuevo;
+            }
+            nuevo.display = n_clicks % 2 === 1 ? "block" : "none";
+            return nuevo;
+        }
+    }
+});
@@ -0,0 +1,182 @@
+// Modo estático (IPC_ESTATICO, ver exportar.py): cada estado del gráfico es un archivo JSON exportado y
+// los callbacks solo eligen qué archivo pedir. La configuración (URL de la versión exportada, estados
+// disponibles) llega en el dcc.Store "estatico".
+(function () {
+    var pedidos = {};
+
+    // Cada archivo se pide una sola vez por página; un fallo se olvida para poder reintentarlo
+    function obtener(url) {
+        if (!pedidos[url]) {
+            pedidos[url] = fetch(url).then(function (respuesta) {
+                if (!respuesta.ok) {
+                    throw new Error(url + ": " + respuesta.status);
+                }
+                return respuesta.json();
+            });
+            pedidos[url].catch(function () { delete pedidos[url]; });
+        }
+        return pedidos[url];
+    }
+
+    // Periodo a graficar, como periodo_seleccionado en app.py: el rango de la tarjeta que disparó el
+    // callback o los años del selector (el último año si no hay ninguno)
+    function periodo(anios, config) {
+        var ctx = window.dash_clientside.callback_context;
+        var disparador = ctx && ctx.triggered.length ? ctx.triggered[0].prop_id.split(".")[0] : null;
+        if (disparador && config.rangos[disparador]) {
+            return {clave: "rango-" + config.rangos[disparador].join("-")};
+        }
+        var lista = (anios && anios.length ? anios : [config.ultimo_anio]).slice();
+        lista = lista.filter(function (a, i) { return lista.indexOf(a) === i; }).sort(function (a, b) { return a - b; });
+        return {clave: "anios-" + lista.join("-"), anios: lista};
+    }
+
+    // Arreglo binario en base64 de la figura (ver figuras.arreglo_tipado) como arreglo de números
+    function decodificar(valores) {
+        if (!valores || valores.bdata === undefined) {
+            return valores || [];
+        }
+        var binario = atob(valores.bdata);
+        var bytes = new Uint8Array(binario.length);
+        for (var i = 0; i < binario.length; i++) {
+            bytes[i] = binario.charCodeAt(i);
+        }
+        return Array.from(new Float64Array(bytes.buffer));
+    }
+
+    // Figura de varios años a partir de las de cada año, en orden cronológico: las trazas se unen por
+    // nombre y las que faltan en un año (p. ej. medidas que empiezan más tarde) quedan como huecos.
+    // Ninguna vista por años llega al umbral de submuestreo, así que la unión es la figura completa. El
+    // abanico del pronóstico (grupo "pronostico", solo en la figura del último año) pasa tal cual
+    function componer(figuras) {
+        var nombres = [], trazas = {}, x = [], abanico = [];
+        figuras.forEach(function (figura) {
+            abanico = abanico.concat(figura.data.filter(function (t) { return t.legendgroup === "pronostico"; }));
+            figura = Object.assign({}, figura, {
+                data: figura.data.filter(function (t) { return t.legendgroup !== "pronostico"; })
+            });
+            if (!figura.data.length) {
+                return;
+            }
+            var fechas = decodificar(figura.data[0].x);
+            figura.data.forEach(function (traza) {
+                if (!trazas[traza.name]) {
+                    nombres.push(traza.name);
+                    trazas[traza.name] = {plantilla: traza, y: x.map(function () { return NaN; })};
+                }
+            });
+            nombres.forEach(function (nombre) {
+                var traza = figura.data.filter(function (t) { return t.name === nombre; })[0];
+                var y = traza ? decodificar(traza.y) : fechas.map(function () { return NaN; });
+                trazas[nombre].y = trazas[nombre].y.concat(y);
+            });
+            x = x.concat(fechas);
+        });
+        return {
+            data: nombres.map(function (nombre) {
+                return Object.assign({}, trazas[nombre].plantilla, {x: x, y: trazas[nombre].y});
+            }).filter(function (traza) {
+                return traza.y.some(function (v) { return !isNaN(v); });
+            }).concat(abanico),
+            layout: figuras[0].layout
+        };
+    }
+
+    function figura(base, anios, config) {
+        var elegido = periodo(anios, config);
+        if (!elegido.anios || config.periodos.indexOf(elegido.clave) >= 0) {
+            return obtener(base + elegido.clave + ".json");
+        }
+        return Promise.all(elegido.anios.map(function (a) {
+            return obtener(base + "anios-" + a + ".json");
+        })).then(componer);
+    }
+
+    function etiqueta_mes(ordinal, serie) {
+        var i = ordinal - serie.primero;
+        if (i >= 0 && i < serie.etiquetas.length) {
+            return serie.etiquetas[i];
+        }
+        var meses = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"];
+        return meses[ordinal % 12] + "-" + Math.floor(ordinal / 12);
+    }
+
+    function numero(valor) {
+        return valor.toLocaleString("en-US", {minimumFractionDigits: 2, maximumFractionDigits: 2});
+    }
+
+    function componente(tipo, texto, estilo) {
+        return {type: tipo, namespace: "dash_html_components", props: {children: texto, style: estilo}};
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        estatico: {
+            actualizar_grafico: function (anios, n1, n2, n3, indicador, config) {
+                if (!config) {
+                    return window.dash_clientside.no_update;
+                }
+                return figura(config.url + "grafico/" + (indicador || "anual") + "/", anios, config);
+            },
+
+            actualizar_incidencias: function (anios, n1, n2, n3, indicador, config) {
+                if (!config || !config.incidencias) {
+                    return window.dash_clientside.no_update;
+                }
+                return figura(config.url + "incidencias/" + config.medidas[indicador || "anual"] + "/", anios, config);
+            },
+
+            // Mes más cercano al clic: el ordinal de la fecha, acotado a la serie
+            actualizar_tarjetas: function (clickData, indicador, config) {
+                if (!clickData || !config) {
+                    return ["", "Seleccione punto", "", "Seleccione punto"];
+                }
+                return obtener(config.url + "serie.json").then(function (serie) {
+                    var fecha = new Date(Date.parse(String(clickData.points[0].x).slice(0, 10)) + 15 * 86400000);
+                    var ordinal = fecha.getUTCFullYear() * 12 + fecha.getUTCMonth();
+                    var i = Math.min(Math.max(ordinal - serie.primero, 0), serie.IPC.length - 1);
+                    var valor = serie[indicador || "anual"][i];
+                    return [
+                        serie.etiquetas[i],
+                        serie.IPC[i].toFixed(2),
+                        serie.etiquetas[i],
+                        valor === null ? "No disponible" : valor.toFixed(2) + "%"
+                    ];
+                });
+            },
+
+            actualizar_titulo_indicador: function (indicador, config) {
+                return config ? config.titulos[indicador || "anual"] : window.dash_clientside.no_update;
+            },
+
+            // Calculadora de la serie nacional, como calcular_inflacion en app.py
+            calcular_inflacion: function (desde, hasta, monto, config) {
+                if (desde === null || desde === undefined || hasta === null || hasta === undefined) {
+                    return "Elige los meses";
+                }
+                if (!config) {
+                    return window.dash_clientside.no_update;
+                }
+                return obtener(config.url + "serie.json").then(function (serie) {
+                    var indice_desde = serie.IPC[desde - serie.primero];
+                    var indice_hasta = serie.IPC[hasta - serie.primero];
+                    var periodo = etiqueta_mes(desde, serie) + " – " + etiqueta_mes(hasta, serie);
+                    if (indice_desde === null || indice_desde === undefined || indice_hasta === null || indice_hasta === undefined) {
+                        return "Sin dato de IPC General en " + etiqueta_mes(desde, serie) + " o " + etiqueta_mes(hasta, serie);
+                    }
+                    var factor = indice_hasta / indice_desde;
+                    var hijos = [
+                        componente("H4", "Inflación " + periodo, {margin: "4px 0", fontSize: "16px"}),
+                        componente("H2", ((factor - 1) * 100).toFixed(2) + "%",
+                                   {color: "#FFEE8C", fontSize: "18px", margin: "2px 0"})
+                    ];
+                    if (monto !== null && monto !== undefined) {
+                        hijos.push(componente("P", numero(monto) + " de " + etiqueta_mes(desde, serie) + " equivalen a " +
+                                              numero(monto * factor) + " de " + etiqueta_mes(hasta, serie),
+                                              {fontSize: "14px", margin: "2px 0"}));
+                    }
+                    return hijos;
+                });
+            }
+        }
+    });
+})();
@@ -0,0 +1,99 @@
+"""Generador de carga HTTP contra ``/_dash-update-component``.
+
+    python -m benchmarks.carga_http --puerto 8050 --concurrencia 1,8,32 --duracion 10 [--escenario mixto]
+
+Cada cliente es un hilo con su propia conexión keep-alive que envía
+peticiones de callback en bucle durante ``--duracion`` segundos. El servidor
+se levanta aparte (``python app.py`` o gunicorn); los resultados por nivel de
+concurrencia se emiten en JSON.
+"""
+
+import argparse
+import http.client
+import itertools
+import json
+import threading
+import time
+
+from benchmarks.comun import emitir, percentiles_ms
+from benchmarks.micro import RANGOS, SELECCIONES_ANIOS, peticion_grafico, peticion_tarjetas
+
+ESCENARIOS = {
+    "rangos": lambda: [peticion_grafico([2024], f"{r}.n_clicks") for r in RANGOS],
+    "anios": lambda: [peticion_grafico(v, "selector-anios.value") for v in SELECCIONES_ANIOS.values()],
+    "tarjetas": lambda: [peticion_tarjetas(f"{a}-{m:02d}-01") for a in range(2006, 2026) for m in (1, 6, 12)],
+}
+ESCENARIOS["mixto"] = lambda: ESCENARIOS["rangos"]() + ESCENARIOS["anios"]() + ESCENARIOS["tarjetas"]()[:8]
+
+
+def ejecutar_nivel(host, puerto, concurrencia, duracion, cuerpos):
+    cuerpos = [json.dumps(c).encode() for c in cuerpos]
+    latencias, errores, bytes_recibidos = [], [0], [0]
+    candado = threading.Lock()
+    fin = time.perf_counter() + duracion
+
+    def cliente(desfase):
+        conexion = http.client.HTTPConnection(host, puerto, timeout=30)
+        locales, bytes_locales = [], 0
+        for cuerpo in itertools.islice(itertools.cycle(cuerpos), desfase, None):
+            if time.perf_counter() >= fin:
+                break
+            inicio = time.perf_counter()
+            try:
+                conexion.request("POST", "/_dash-update-component", cuerpo, {"Content-Type": "application/json"})
+                respuesta = conexion.getresponse()
+                bytes_locales += len(respuesta.read())
+                if respuesta.status != 200:
+                    with candado:
+                        errores[0] += 1
+            except (OSError, http.client.HTTPException):
+                with candado:
+                    errores[0] += 1
+                conexion.close()
+                conexion = http.client.HTTPConnection(host, puerto, timeout=30)
+                continue
+            locales.append(time.perf_counter() - inicio)
+        with candado:
+            latencias.extend(locales)
+            bytes_recibidos[0] += bytes_locales
+
+    hilos = [threading.Thread(target=cliente, args=(i,)) for i in range(concurrencia)]
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    transcurrido = time.perf_counter() - inicio
+
+    return {
+        "concurrencia": concurrencia,
+        "peticiones": len(latencias),
+        "errores": errores[0],
+        "req_s": round(len(latencias) / transcurrido, 1),
+        "bytes_por_respuesta": round(bytes_recibidos[0] / max(len(latencias), 1)),
+        **percentiles_ms(latencias),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8050)
+    parser.add_argument("--concurrencia", default="1,8,32", help="Niveles separados por comas")
+    parser.add_argument("--duracion", type=float, default=10.0, help="Segundos por nivel")
+    parser.add_argument("--escenario", choices=sorted(ESCENARIOS), default="mixto")
+    parser.add_argument("--salida", help="Archivo JSON donde guardar los resultados")
+    args = parser.parse_args()
+
+    cuerpos = ESCENARIOS[args.escenario]()
+    niveles = [int(c) for c in args.concurrencia.split(",")]
+    resultados = {
+        "objetivo": f"http://{args.host}:{args.puerto}",
+        "escenario": args.escenario,
+        "niveles": [ejecutar_nivel(args.host, args.puerto, c, args.duracion, cuerpos) for c in niveles],
+    }
+    emitir("carga_http", resultados, args.salida)
+
+
+if __name__ == "__main__":
+    main()
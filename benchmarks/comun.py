@@ -0,0 +1,55 @@
+"""Utilidades compartidas por los benchmarks: medición y salida JSON."""
+
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+
+def medir(funcion, repeticiones=200, calentamiento=5):
+    for _ in range(calentamiento):
+        funcion()
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    tiempos.sort()
+    return {
+        "repeticiones": repeticiones,
+        "min_us": round(tiempos[0] * 1e6, 1),
+        "mediana_us": round(statistics.median(tiempos) * 1e6, 1),
+        "p95_us": round(tiempos[int(len(tiempos) * 0.95) - 1] * 1e6, 1),
+        "max_us": round(tiempos[-1] * 1e6, 1),
+    }
+
+
+def percentiles_ms(latencias):
+    latencias = sorted(latencias)
+    if not latencias:
+        return {}
+    n = len(latencias)
+    return {
+        "p50_ms": round(latencias[n // 2] * 1000, 2),
+        "p90_ms": round(latencias[int(n * 0.90) - 1] * 1000, 2),
+        "p99_ms": round(latencias[max(int(n * 0.99) - 1, 0)] * 1000, 2),
+        "max_ms": round(latencias[-1] * 1000, 2),
+    }
+
+
+def emitir(nombre, resultados, salida=None):
+    informe = {
+        "benchmark": nombre,
+        "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "plataforma": platform.platform(),
+        "resultados": resultados,
+    }
+    texto = json.dumps(informe, indent=2, ensure_ascii=False)
+    if salida:
+        with open(salida, "w", encoding="utf-8") as f:
+            f.write(texto + "\n")
+    print(texto)
+    return informe
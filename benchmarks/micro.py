@@ -0,0 +1,425 @@
+"""Micro-benchmarks de carga de datos y callbacks del dashboard.
+
+    python -m benchmarks.micro [--salida resultados.json] [--repeticiones N] [--arranques N] [--sin-escala]
+
+Los callbacks se ejercitan a través de ``/_dash-update-component`` con el
+cliente de pruebas de Flask, así que la medición incluye la deserialización
+de la petición y la serialización de la respuesta de Dash. El arranque se mide
+en intérpretes nuevos (importar ``app``, primera carga de datos, primer layout
+y primera figura), como el de un worker recién creado. La parte de escala
+usa series sintéticas para ver cómo crecen los costes con el número de series
+y la longitud de la historia, también para las medidas de inflación
+subyacente, la calculadora de inflación por lotes y el ajuste de los
+pronósticos (todas las series a la vez y, como referencia, una por una) y el
+coste de construir figuras en el pool de procesos frente al hilo. La transferencia cuenta los bytes que recibe
+un navegador en la primera visita y en las siguientes, con y sin compresión.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.comun import emitir, medir, percentiles_ms
+from benchmarks.series_sinteticas import datos_legados, escribir_almacenes, generar_series
+
+RANGOS = ["card-2006-2016", "card-2017-2021", "card-2022-2025"]
+SELECCIONES_ANIOS = {
+    "un_anio": [2024],
+    "tres_contiguos": [2021, 2022, 2023],
+    "salteados": [2008, 2012, 2016, 2020, 2024],
+    "todos": list(range(2006, 2026)),
+}
+
+
+SERIE_NACIONAL = ("anual", None, "Nacional", None, "0")
+
+
+def _selectores_serie(serie):
+    ids = ("selector-indicador", "selector-base", "selector-region", "selector-ciudad", "selector-clase")
+    return [{"id": i, "property": "value", "value": v} for i, v in zip(ids, serie)]
+
+
+def peticion_grafico(anios, disparador, serie=SERIE_NACIONAL):
+    entradas = [{"id": "selector-anios", "property": "value", "value": anios}]
+    entradas += [{"id": r, "property": "n_clicks", "value": 1} for r in RANGOS]
+    entradas += [{"id": "zoom-grafico", "property": "data", "value": None}]
+    entradas += _selectores_serie(serie)
+    return {
+        "output": "grafico-lineas.figure",
+        "outputs": {"id": "grafico-lineas", "property": "figure"},
+        "inputs": entradas,
+        "changedPropIds": [disparador],
+        "state": [{"id": "periodo-activo", "property": "data", "value": None}],
+    }
+
+
+def peticion_tarjetas(fecha, serie=SERIE_NACIONAL):
+    salidas = [{"id": i, "property": "children"} for i in ("fecha-ipc", "valor-ipc", "fecha-anual", "anual")]
+    return {
+        "output": "..fecha-ipc.children...valor-ipc.children...fecha-anual.children...anual.children..",
+        "outputs": salidas,
+        "inputs": [{"id": "grafico-lineas", "property": "clickData", "value": {"points": [{"x": fecha}]}}],
+        "changedPropIds": ["grafico-lineas.clickData"],
+        "state": _selectores_serie(serie),
+    }
+
+
+def carga_legada(datos):
+    # Camino original: DataFrame desde tuplas de texto, reemplazo de comas y parseo de fechas
+    df = pd.DataFrame(datos, columns=["Mes", "IPC"])
+    df["IPC"] = df["IPC"].astype(str).str.replace(",", ".").astype(float)
+    df["Mes"] = pd.to_datetime(df["Mes"], format="%Y-%m-%d %H:%M:%S", errors="coerce")
+    return df
+
+
+def bench_carga(repeticiones):
+    from almacen_ipc import cargar_serie, escribir_serie, ordinales_a_fechas
+
+    resultados = {}
+    for n_meses in (234, 1200, 12000):
+        legados = datos_legados(n_meses)
+        ordinales, valores = generar_series(1, n_meses, anio_inicio=2006)
+        with tempfile.TemporaryDirectory() as directorio:
+            escribir_serie(directorio, ordinales, valores[0])
+
+            def carga_almacen():
+                serie = cargar_serie(directorio)
+                return pd.DataFrame({"Mes": ordinales_a_fechas(serie.meses), "IPC": serie.valores}, copy=False)
+
+            resultados[f"{n_meses}_meses"] = {
+                "legado_tuplas": medir(lambda: carga_legada(legados), repeticiones),
+                "almacen_columnar": medir(carga_almacen, repeticiones),
+            }
+    return resultados
+
+
+# Fases del arranque en frío de un worker, medidas dentro de un intérprete nuevo
+CODIGO_ARRANQUE = """
+import json, time
+inicio = time.perf_counter()
+import app
+fases = {"importar_app": time.perf_counter() - inicio}
+inicio = time.perf_counter()
+app.datos()
+fases["cargar_datos"] = time.perf_counter() - inicio
+cliente = app.app.server.test_client()
+inicio = time.perf_counter()
+cliente.get("/_dash-layout")
+fases["primer_layout"] = time.perf_counter() - inicio
+inicio = time.perf_counter()
+cliente.post("/_dash-update-component", json=PETICION)
+fases["primera_figura"] = time.perf_counter() - inicio
+print(json.dumps(fases))
+"""
+
+
+def importaciones_app(limite=8):
+    # Módulos importados directamente por app con su tiempo acumulado (python -X importtime)
+    salida = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app"],
+                            capture_output=True, text=True, check=True).stderr
+    modulos = {}
+    for linea in salida.splitlines():
+        if not linea.startswith("import time:") or "|" not in linea:
+            continue
+        _, acumulado, nombre = linea.split("|")
+        nombre = nombre[1:]  # sangría de dos espacios por nivel tras el separador
+        if nombre.startswith("   ") or not nombre.startswith("  "):
+            continue
+        if acumulado.strip().isdigit():
+            modulos[nombre.strip()] = round(int(acumulado) / 1000, 1)
+    return dict(sorted(modulos.items(), key=lambda m: -m[1])[:limite])
+
+
+def bench_arranque(arranques):
+    codigo = CODIGO_ARRANQUE.replace("PETICION", repr(peticion_grafico([2024], "selector-anios.value")))
+    mediciones = [json.loads(subprocess.run([sys.executable, "-c", codigo], capture_output=True,
+                                            text=True, check=True).stdout)
+                  for _ in range(arranques)]
+    resultados = {
+        f"{fase}_ms": round(statistics.median(m[fase] for m in mediciones) * 1000, 1) for fase in mediciones[0]
+    }
+    resultados["arranques"] = arranques
+    resultados["importaciones_ms"] = importaciones_app()
+    return resultados
+
+
+def bench_callbacks(repeticiones):
+    import app as modulo_app
+
+    cliente = modulo_app.app.server.test_client()
+
+    def llamar(cuerpo):
+        respuesta = cliente.post("/_dash-update-component", json=cuerpo)
+        assert respuesta.status_code == 200, respuesta.status_code
+        return respuesta
+
+    def en_frio(cuerpo):
+        # Vacía la caché del proceso para medir la construcción completa (o la lectura de la compartida)
+        def ejecutar():
+            modulo_app.cache_figuras.invalidar()
+            llamar(cuerpo)
+        return ejecutar
+
+    compartida = modulo_app.cache_figuras.compartida
+
+    resultados = {"grafico": {}, "tarjetas": {}}
+    casos = {f"rango_{r}": peticion_grafico([2024], f"{r}.n_clicks") for r in RANGOS}
+    casos.update({f"anios_{k}": peticion_grafico(v, "selector-anios.value") for k, v in SELECCIONES_ANIOS.items()})
+    if modulo_app.datos().cubo is not None:
+        casos["serie_cubo"] = peticion_grafico([2024], "selector-clase.value", ("anual", None, "Sierra", "Quito", "011"))
+    for nombre, cuerpo in casos.items():
+        modulo_app.cache_figuras.compartida = None
+        resultados["grafico"][nombre] = {
+            "bytes_respuesta": len(llamar(cuerpo).data),
+            "frio": medir(en_frio(cuerpo), repeticiones),
+            "caliente": medir(lambda: llamar(cuerpo), repeticiones),
+        }
+        modulo_app.cache_figuras.compartida = compartida
+        if compartida is not None:
+            resultados["grafico"][nombre]["cache_compartida"] = medir(en_frio(cuerpo), repeticiones)
+
+    rng = np.random.default_rng(0)
+    fechas = [f"{a}-{m:02d}-01" for a, m in zip(rng.integers(2006, 2026, 64), rng.integers(1, 13, 64))]
+    posicion = iter(range(10 ** 9))
+    resultados["tarjetas"]["clic_aleatorio"] = medir(
+        lambda: llamar(peticion_tarjetas(fechas[next(posicion) % len(fechas)])), repeticiones
+    )
+    return resultados
+
+
+def recursos_pagina(cliente):
+    # URLs que descarga el navegador al abrir el dashboard: las del HTML y los bundles que dcc carga
+    # después para el gráfico y los desplegables (misma huella que el bundle principal de dcc)
+    import os
+    import re
+
+    import plotly
+    from dash.fingerprint import build_fingerprint
+
+    html = cliente.get("/").get_data(as_text=True)
+    urls = ["/", *re.findall(r'(?:src|href)="([^"]+)"', html)]
+    principal = next(u for u in urls if "/dcc/dash_core_components." in u)
+    huella = principal.rsplit("/", 1)[1].split(".")[1]
+    urls += [principal.rsplit("/", 1)[0] + f"/async-{nombre}.{huella}.js" for nombre in ("graph", "dropdown")]
+    ruta_plotly = os.path.join(os.path.dirname(plotly.__file__), "package_data", "plotly.min.js")
+    urls.append("/_dash-component-suites/plotly/" + build_fingerprint(
+        "package_data/plotly.min.js", plotly.__version__, int(os.stat(ruta_plotly).st_mtime)))
+    return urls + ["/_dash-layout", "/_dash-dependencies"]
+
+
+def bench_transferencia():
+    # Bytes en la red de una primera visita (HTML, bundles, layout y las figuras iniciales) y de una
+    # visita posterior, sin compresión (como antes de compresion.py) y con cada codificación
+    import app as modulo_app
+    import compresion
+
+    cliente = modulo_app.app.server.test_client()
+    urls = recursos_pagina(cliente)
+    anio = modulo_app.datos().anios[-1:]
+    peticiones = [peticion_grafico(anio, "selector-anios.value"),
+                  peticion_grafico(list(range(2006, 2026)), "selector-anios.value")]
+    codificaciones = ["identity", "gzip"] + (["br"] if compresion.brotli is not None else [])
+
+    resultados = {}
+    for cod in codificaciones:
+        cabeceras = {"Accept-Encoding": cod}
+        primera = posterior = 0
+        por_tipo = {"html_layout": 0, "bundles": 0, "figuras": 0}
+        for url in urls:
+            respuesta = cliente.get(url, headers=cabeceras)
+            assert respuesta.status_code == 200, (url, respuesta.status_code)
+            tamano = len(respuesta.get_data())
+            primera += tamano
+            # Lo marcado como immutable no se vuelve a pedir mientras la URL no cambie
+            if "immutable" not in respuesta.headers.get("Cache-Control", ""):
+                posterior += tamano
+            por_tipo["bundles" if "/_dash-component-suites/" in url or "/assets/" in url else "html_layout"] += tamano
+        for cuerpo in peticiones:
+            tamano = len(cliente.post("/_dash-update-component", json=cuerpo, headers=cabeceras).get_data())
+            primera += tamano
+            posterior += tamano
+            por_tipo["figuras"] += tamano
+        resultados[cod] = {"primera_visita_bytes": primera, "visita_posterior_bytes": posterior, **por_tipo}
+    return resultados
+
+
+def bench_escala(repeticiones):
+    # Coste por serie de las estructuras precalculadas al crecer series y meses
+    from almacen_ipc import cargar_serie
+    from figuras import figura_json
+    from indice_meses import SerieIndexada
+
+    resultados = {}
+    for n_series, n_meses in ((1, 240), (100, 240), (1000, 240), (100, 1200), (1000, 1200)):
+        ordinales, valores = generar_series(n_series, n_meses)
+        with tempfile.TemporaryDirectory() as directorio:
+            inicio = time.perf_counter()
+            rutas = escribir_almacenes(directorio, n_series, n_meses)
+            escritura = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            series = [cargar_serie(r) for r in rutas]
+            carga = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        indexadas = [SerieIndexada(s.meses, IPC=s.valores) for s in series]
+        indexado = time.perf_counter() - inicio
+
+        ultima = indexadas[-1]
+        anios = sorted(ultima.anios.tramos)
+        # Figura de toda la historia (submuestreada con LTTB por encima de IPC_PUNTOS_MAX)
+        fechas, columnas = ultima.vista(anios)
+        columnas = {"IPC": columnas["IPC"], "anual": columnas["IPC"]}
+        resultados[f"{n_series}x{n_meses}"] = {
+            "escritura_s": round(escritura, 4),
+            "carga_s": round(carga, 4),
+            "indexado_s": round(indexado, 4),
+            "vista_todos_los_anios": medir(lambda: ultima.vista(anios), repeticiones),
+            "fila_por_fecha": medir(lambda: ultima.fila("2010-06-15"), repeticiones),
+            "figura_toda_la_historia": medir(lambda: figura_json(fechas, columnas, "IPC General", "anual"), repeticiones),
+            "bytes_figura": len(figura_json(fechas, columnas, "IPC General", "anual")),
+            "bytes_valores": int(valores.nbytes),
+        }
+    return resultados
+
+
+def bench_nucleo(repeticiones):
+    # Medidas subyacentes de toda la historia al crecer los componentes y los meses
+    import nucleo
+
+    rng = np.random.default_rng(0)
+    resultados = {}
+    for n_componentes, n_meses in ((12, 246), (100, 246), (1000, 246), (1000, 1200)):
+        indices = 100 * np.cumprod(1 + rng.normal(0.003, 0.01, (n_componentes, n_meses)), axis=1)
+        pesos = rng.random(n_componentes)
+        componentes = np.array([f"{i:02d}" for i in range(1, n_componentes + 1)])
+        resultados[f"{n_componentes}x{n_meses}"] = medir(lambda: nucleo.calcular(componentes, pesos, indices),
+                                                         max(repeticiones // 10, 5))
+    return resultados
+
+
+def bench_calculadora(repeticiones):
+    # Consultas de inflación entre dos meses: una sola, lotes resueltos con lecturas vectorizadas, el CSV
+    # completo (lectura, cálculo y escritura) y, como referencia, el lote de 1000 buscando cada mes en pandas
+    from calculadora import TablaPeriodos, resolver_csv
+
+    rng = np.random.default_rng(0)
+    ordinales = np.arange(1980 * 12, 1980 * 12 + 1200)
+    indices = 100 * np.cumprod(1 + rng.normal(0.003, 0.01, len(ordinales)))
+    tabla = TablaPeriodos(ordinales, indices)
+    serie = pd.Series(indices, index=pd.PeriodIndex.from_ordinals(ordinales - 1970 * 12, freq="M"))
+    resultados = {"consulta": medir(lambda: tabla.calcular(ordinales[10], ordinales[-1], 100.0), repeticiones)}
+    for n in (1000, 100000):
+        desde, hasta = rng.choice(ordinales, n), rng.choice(ordinales, n)
+        montos = rng.uniform(1, 1e5, n)
+        texto = "desde,hasta,monto\n" + "".join(
+            f"{d // 12}-{d % 12 + 1:02d}-15,{h // 12}-{h % 12 + 1:02d},{m:.2f}\n"
+            for d, h, m in zip(desde.tolist(), hasta.tolist(), montos.tolist()))
+        veces = max(repeticiones // (10 if n < 10000 else 100), 3)
+        resultados[f"lote_{n}"] = medir(lambda: tabla.calcular(desde, hasta, montos), veces)
+        resultados[f"csv_{n}"] = medir(lambda: resolver_csv(texto, lambda g, c: tabla), veces)
+        if n < 10000:
+            periodos = [(pd.Period(f"{d // 12}-{d % 12 + 1:02d}", "M"), pd.Period(f"{h // 12}-{h % 12 + 1:02d}", "M"))
+                        for d, h in zip(desde.tolist(), hasta.tolist())]
+            resultados[f"bucle_pandas_{n}"] = medir(
+                lambda: [serie.loc[h] / serie.loc[d] for d, h in periodos], veces)
+    return resultados
+
+
+def bench_pronostico(repeticiones):
+    # Ajuste y pronóstico de todas las series a la vez al crecer las series y los meses (la estimación usa
+    # los últimos VENTANA meses); con 100 series, también ajustándolas una por una
+    import pronostico
+
+    rng = np.random.default_rng(0)
+    resultados = {}
+    for n_series, n_meses in ((1, 246), (100, 246), (1392, 246), (5000, 246), (1000, 1200)):
+        ordinales = np.arange(2005 * 12, 2005 * 12 + n_meses)
+        indices = 100 * np.cumprod(1 + rng.normal(0.003, 0.01, (n_series, n_meses)), axis=1)
+        veces = max(repeticiones // (10 if n_series < 1000 else 100), 3)
+        resultados[f"{n_series}x{n_meses}"] = medir(lambda: pronostico.ajustar(ordinales, indices), veces)
+        if n_series == 100:
+            resultados["100x246_una_por_una"] = medir(
+                lambda: [pronostico.ajustar(ordinales, fila) for fila in indices], veces)
+    return resultados
+
+
+def bench_pool(repeticiones):
+    # Construir una figura en el hilo o en el pool de procesos (ejecutor.py) según los puntos por traza: el
+    # viaje al pool cuesta más que construir las figuras de la historia real (246 meses), y de ahí el umbral
+    # IPC_PUNTOS_POOL. Con contención, latencia de un clic (``fila``) que llega cada 2 ms mientras dos hilos
+    # construyen figuras de 5000 puntos en el hilo o en el pool: incluye la espera del GIL al despertar
+    import threading
+
+    from ejecutor import EjecutorFiguras
+    from figuras import figura_json
+    from indice_meses import SerieIndexada
+
+    ejecutor = EjecutorFiguras(procesos=2, umbral=0)
+    resultados = {}
+    for n_meses in (246, 1000, 2000, 5000):
+        ordinales, valores = generar_series(1, n_meses, anio_inicio=1800)
+        serie = SerieIndexada(ordinales, IPC=valores[0], anual=valores[0])
+        fechas, columnas = serie.fechas, serie.columnas
+        resultados[f"{n_meses}_meses"] = {
+            "hilo": medir(lambda: figura_json(fechas, columnas, "IPC General", "anual"), repeticiones),
+            "pool": medir(lambda: ejecutor.ejecutar(figura_json, fechas, columnas, "IPC General", "anual", peso=n_meses),
+                          repeticiones),
+        }
+
+    for modo, peso in (("hilo", None), ("pool", 0)):
+        fin = threading.Event()
+
+        def construir():
+            while not fin.is_set():
+                ejecutor.ejecutar(figura_json, fechas, columnas, "IPC General", "anual", peso=peso)
+
+        hilos = [threading.Thread(target=construir) for _ in range(2)]
+        for hilo in hilos:
+            hilo.start()
+        latencias = []
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            time.sleep(0.002)
+            serie.fila("1900-06-01")
+            latencias.append(time.perf_counter() - inicio - 0.002)
+        resultados[f"clic_con_figuras_en_{modo}"] = percentiles_ms(latencias)
+        fin.set()
+        for hilo in hilos:
+            hilo.join()
+    ejecutor.cerrar()
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--salida", help="Archivo JSON donde guardar los resultados")
+    parser.add_argument("--repeticiones", type=int, default=200)
+    parser.add_argument("--arranques", type=int, default=10, help="Intérpretes nuevos para medir el arranque")
+    parser.add_argument("--sin-escala", action="store_true", help="Omitir la parte con series sintéticas")
+    args = parser.parse_args()
+
+    resultados = {
+        "carga": bench_carga(args.repeticiones),
+        "arranque": bench_arranque(args.arranques),
+        "callbacks": bench_callbacks(args.repeticiones),
+        "transferencia": bench_transferencia(),
+    }
+    if not args.sin_escala:
+        resultados["escala"] = bench_escala(args.repeticiones)
+        resultados["nucleo"] = bench_nucleo(args.repeticiones)
+        resultados["calculadora"] = bench_calculadora(args.repeticiones)
+        resultados["pronostico"] = bench_pronostico(args.repeticiones)
+        resultados["pool"] = bench_pool(args.repeticiones)
+    emitir("micro", resultados, args.salida)
+
+
+if __name__ == "__main__":
+    main()
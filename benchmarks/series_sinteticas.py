@@ -0,0 +1,41 @@
+"""Generadores de series IPC sintéticas para probar el diseño a escala.
+
+Las series siguen un paseo aleatorio en logaritmos con deriva y un
+componente estacional, de modo que las variaciones mensuales y anuales
+tengan magnitudes parecidas a las reales.
+"""
+
+import numpy as np
+
+from almacen_ipc import escribir_serie, ordinal
+
+
+def generar_series(n_series, n_meses, anio_inicio=2000, semilla=0):
+    # Devuelve (ordinales[n_meses], valores[n_series, n_meses])
+    rng = np.random.default_rng(semilla)
+    ordinales = np.arange(ordinal(anio_inicio, 1), ordinal(anio_inicio, 1) + n_meses, dtype=np.int32)
+    deriva = rng.normal(0.003, 0.001, size=(n_series, 1))
+    estacional = rng.normal(0, 0.002, size=(n_series, 12))[:, ordinales % 12]
+    choques = rng.normal(0, 0.004, size=(n_series, n_meses))
+    log_indice = np.cumsum(deriva + estacional + choques, axis=1)
+    return ordinales, 100 * np.exp(log_indice - log_indice[:, :1])
+
+
+def datos_legados(n_meses, anio_inicio=2006, semilla=0):
+    # Lista de tuplas (texto de fecha, texto con coma decimal) como el antiguo datos_generados.py
+    ordinales, valores = generar_series(1, n_meses, anio_inicio, semilla)
+    return [
+        (f"{o // 12:04d}-{o % 12 + 1:02d}-01 00:00:00", repr(float(v)).replace(".", ","))
+        for o, v in zip(ordinales, valores[0])
+    ]
+
+
+def escribir_almacenes(directorio, n_series, n_meses, semilla=0):
+    # Un almacén columnar por serie, en subdirectorios serie_00000, serie_00001, ...
+    ordinales, valores = generar_series(n_series, n_meses, semilla=semilla)
+    rutas = []
+    for i, fila in enumerate(valores):
+        ruta = f"{directorio}/serie_{i:05d}"
+        escribir_serie(ruta, ordinales, fila)
+        rutas.append(ruta)
+    return rutas
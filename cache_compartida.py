@@ -0,0 +1,207 @@
+"""Caché de figuras y consultas compartida por los procesos de un mismo host.
+
+La caché de ``cache_figuras.py`` es privada de cada worker: con N workers la
+misma figura se construye N veces y se pierde en cada reinicio. Esta capa la
+respalda con una base SQLite en modo WAL (lectores concurrentes con un
+escritor, sin servidor) que todos los workers leen y escriben, y que
+sobrevive a los reinicios escalonados de gunicorn.
+
+* Claves: tuplas serializadas en JSON cuyo primer elemento es la versión de
+  datos, precedidas por ``espacio`` (p. ej. una huella del código que genera
+  los valores: tras desplegar otra versión del código no se sirven figuras
+  construidas por la anterior). ``purgar`` borra las entradas de otras
+  versiones y espacios al publicar datos nuevos; mientras tanto nunca se sirve
+  una figura de otra versión porque la versión forma parte de la clave.
+* Tamaño: al guardar, si los valores superan ``capacidad_bytes`` se borran los
+  usados hace más tiempo hasta bajar al 90 %.
+* Estampida: el primer proceso que no encuentra una clave la reserva durante
+  ``espera`` segundos y la construye; los demás esperan a que aparezca el
+  valor. Si la reserva vence (el proceso murió o tarda demasiado) otro la toma.
+
+Cada hilo de cada proceso abre su propia conexión. Los errores de SQLite
+(disco lleno, base bloqueada más allá del timeout) se registran y la figura
+se construye sin caché: la capa es una optimización, nunca un requisito.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+RENOVACION_USO = 60.0
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS entradas (
+    clave TEXT PRIMARY KEY,
+    version TEXT NOT NULL,
+    valor BLOB NOT NULL,
+    tamano INTEGER NOT NULL,
+    usado REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entradas_usado ON entradas (usado);
+CREATE TABLE IF NOT EXISTS reservas (
+    clave TEXT PRIMARY KEY,
+    hasta REAL NOT NULL
+);
+"""
+
+
+class CacheCompartida:
+    def __init__(self, ruta, capacidad_bytes=64 * 2 ** 20, espera=10.0, espacio=""):
+        self.ruta = ruta
+        self.espacio = espacio
+        self.capacidad_bytes = capacidad_bytes
+        self.espera = espera
+        self._local = threading.local()
+        self._heredadas = []
+        self._candado = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.esperas = 0
+        self.desalojadas = 0
+        self.errores = 0
+
+    def _contar(self, contador, cantidad=1):
+        with self._candado:
+            setattr(self, contador, getattr(self, contador) + cantidad)
+
+    def _conexion(self):
+        # Una conexión por hilo y proceso: las heredadas por fork no se reutilizan ni se cierran (SQLite
+        # no admite usar en el hijo una conexión abierta antes del fork), solo se conservan sin uso
+        conexion = getattr(self._local, "conexion", None)
+        if conexion is not None and self._local.pid != os.getpid():
+            self._heredadas.append(conexion)
+            conexion = None
+        if conexion is None:
+            os.makedirs(os.path.dirname(self.ruta) or ".", exist_ok=True)
+            conexion = sqlite3.connect(self.ruta, timeout=5.0, isolation_level=None, check_same_thread=False)
+            conexion.execute("PRAGMA journal_mode=WAL")
+            # Con WAL, NORMAL solo sincroniza en los checkpoints: un corte de luz puede perder
+            # las últimas figuras, que se vuelven a construir
+            conexion.execute("PRAGMA synchronous=NORMAL")
+            conexion.executescript(ESQUEMA)
+            self._local.conexion, self._local.pid = conexion, os.getpid()
+        return conexion
+
+    def _leer(self, conexion, clave):
+        fila = conexion.execute("SELECT valor, usado FROM entradas WHERE clave = ?", (clave,)).fetchone()
+        if fila is None:
+            return None
+        # La marca de uso se renueva como mucho una vez por minuto: cada renovación es una escritura
+        # que compite con las de los demás workers
+        ahora = time.time()
+        if ahora - fila[1] > RENOVACION_USO:
+            conexion.execute("UPDATE entradas SET usado = ? WHERE clave = ?", (ahora, clave))
+        return fila[0]
+
+    def _reservar(self, conexion, clave):
+        # Toma la reserva si no existe o ya venció; rowcount indica si este proceso la obtuvo
+        ahora = time.time()
+        cursor = conexion.execute(
+            "INSERT INTO reservas (clave, hasta) VALUES (?, ?) "
+            "ON CONFLICT (clave) DO UPDATE SET hasta = excluded.hasta WHERE reservas.hasta < ?",
+            (clave, ahora + self.espera, ahora),
+        )
+        return cursor.rowcount == 1
+
+    def _guardar(self, conexion, clave, version, valor):
+        tamano = len(valor.encode("utf-8")) if isinstance(valor, str) else len(valor)
+        conexion.execute("BEGIN IMMEDIATE")
+        try:
+            conexion.execute("INSERT OR REPLACE INTO entradas VALUES (?, ?, ?, ?, ?)",
+                             (clave, version, valor, tamano, time.time()))
+            conexion.execute("DELETE FROM reservas WHERE clave = ?", (clave,))
+            total = conexion.execute("SELECT COALESCE(SUM(tamano), 0) FROM entradas").fetchone()[0]
+            if total > self.capacidad_bytes:
+                # Se conservan las más recientes hasta el 90 % de la capacidad
+                cursor = conexion.execute(
+                    "DELETE FROM entradas WHERE clave IN (SELECT clave FROM ("
+                    "  SELECT clave, SUM(tamano) OVER (ORDER BY usado DESC) AS acumulado FROM entradas"
+                    ") WHERE acumulado > ?)",
+                    (int(self.capacidad_bytes * 0.9),),
+                )
+                self._contar("desalojadas", cursor.rowcount)
+            conexion.execute("COMMIT")
+        except BaseException:
+            conexion.execute("ROLLBACK")
+            raise
+
+    def _version(self, version):
+        return f"{self.espacio}:{version}"
+
+    def obtener_o_construir(self, clave, construir):
+        """Valor de ``clave`` en la caché o ``construir()`` (texto o bytes), que se guarda.
+
+        ``clave`` es una tupla serializable en JSON cuyo primer elemento es la
+        versión de datos.
+        """
+        texto = json.dumps([self.espacio, *clave], default=str, ensure_ascii=False)
+        try:
+            conexion = self._conexion()
+            valor = self._leer(conexion, texto)
+            if valor is not None:
+                self._contar("aciertos")
+                return valor
+            # Espera con retroceso mientras otro proceso la construye, hasta que vence su reserva
+            pausa = 0.002
+            while not self._reservar(conexion, texto):
+                time.sleep(pausa)
+                pausa = min(pausa * 2, 0.05)
+                valor = self._leer(conexion, texto)
+                if valor is not None:
+                    self._contar("esperas")
+                    return valor
+        except sqlite3.Error:
+            self._contar("errores")
+            log.exception("Caché compartida no disponible; se construye sin caché")
+            return construir()
+
+        self._contar("fallos")
+        try:
+            valor = construir()
+        except BaseException:
+            try:
+                conexion.execute("DELETE FROM reservas WHERE clave = ?", (texto,))
+            except sqlite3.Error:
+                pass  # la reserva vence sola
+            raise
+        try:
+            self._guardar(conexion, texto, self._version(clave[0]), valor)
+        except sqlite3.Error:
+            self._contar("errores")
+            log.exception("No se pudo guardar en la caché compartida")
+        return valor
+
+    def purgar(self, version):
+        # Borra las entradas de versiones distintas de ``version`` y las reservas vencidas
+        try:
+            conexion = self._conexion()
+            conexion.execute("DELETE FROM entradas WHERE version != ?", (self._version(version),))
+            conexion.execute("DELETE FROM reservas WHERE hasta < ?", (time.time(),))
+        except sqlite3.Error:
+            self._contar("errores")
+            log.exception("No se pudo purgar la caché compartida")
+
+    def estadisticas(self):
+        try:
+            entradas, tamano = self._conexion().execute(
+                "SELECT COUNT(*), COALESCE(SUM(tamano), 0) FROM entradas").fetchone()
+        except sqlite3.Error:
+            entradas = tamano = 0
+        with self._candado:
+            total = self.aciertos + self.esperas + self.fallos
+            return {
+                "entradas": entradas,
+                "bytes": tamano,
+                "capacidad_bytes": self.capacidad_bytes,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "esperas": self.esperas,
+                "desalojadas": self.desalojadas,
+                "errores": self.errores,
+                "tasa_aciertos": self.aciertos / total if total else 0.0,
+            }
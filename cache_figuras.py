@@ -0,0 +1,102 @@
+"""Caché LRU acotada de figuras serializadas.
+
+Las entradas posibles del gráfico son pocas (un conjunto de años o una de las
+tarjetas de rango), así que la figura se construye una vez por clave y se
+guarda como JSON. La clave incluye la revisión de datos; al cargar datos
+nuevos se llama a ``invalidar``.
+
+Las peticiones simultáneas de una clave que ya se está construyendo esperan
+ese resultado en lugar de construirla otra vez (``agrupadas`` las cuenta).
+
+Con ``compartida`` (una ``CacheCompartida``, ver ``cache_compartida.py``) los
+fallos de esta caché se buscan en la caché que comparten los workers del host
+antes de construir; esta queda como primer nivel en memoria del proceso. En
+ese caso el primer elemento de cada clave debe ser la versión de datos.
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+
+class CacheFiguras:
+    def __init__(self, capacidad=256, compartida=None):
+        self.capacidad = capacidad
+        self.compartida = compartida
+        self._entradas = OrderedDict()
+        self._en_curso = {}
+        self._candado = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.agrupadas = 0
+
+    def obtener(self, clave):
+        with self._candado:
+            if clave in self._entradas:
+                self._entradas.move_to_end(clave)
+                self.aciertos += 1
+                return self._entradas[clave]
+            self.fallos += 1
+            return None
+
+    def _guardar(self, clave, valor):
+        self._entradas[clave] = valor
+        self._entradas.move_to_end(clave)
+        while len(self._entradas) > self.capacidad:
+            self._entradas.popitem(last=False)
+
+    def guardar(self, clave, valor):
+        with self._candado:
+            self._guardar(clave, valor)
+
+    def obtener_o_construir(self, clave, construir):
+        # La construcción ocurre fuera del candado para no bloquear a otros lectores
+        with self._candado:
+            if clave in self._entradas:
+                self._entradas.move_to_end(clave)
+                self.aciertos += 1
+                return self._entradas[clave]
+            pendiente = self._en_curso.get(clave)
+            propia = pendiente is None
+            if propia:
+                self.fallos += 1
+                pendiente = self._en_curso[clave] = Future()
+            else:
+                self.agrupadas += 1
+        if not propia:
+            return pendiente.result()
+
+        try:
+            if self.compartida is not None:
+                valor = self.compartida.obtener_o_construir(clave, construir)
+            else:
+                valor = construir()
+        except BaseException as error:
+            with self._candado:
+                del self._en_curso[clave]
+            pendiente.set_exception(error)
+            raise
+        with self._candado:
+            self._guardar(clave, valor)
+            del self._en_curso[clave]
+        pendiente.set_result(valor)
+        return valor
+
+    def invalidar(self, version=None):
+        # Con ``version`` también se purgan de la caché compartida las entradas de otras versiones
+        with self._candado:
+            self._entradas.clear()
+        if self.compartida is not None and version is not None:
+            self.compartida.purgar(version)
+
+    def estadisticas(self):
+        with self._candado:
+            total = self.aciertos + self.fallos
+            return {
+                "entradas": len(self._entradas),
+                "capacidad": self.capacidad,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "agrupadas": self.agrupadas,
+                "tasa_aciertos": self.aciertos / total if total else 0.0,
+            }
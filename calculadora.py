@@ -0,0 +1,160 @@
+"""Calculadora de inflación entre dos meses (poder adquisitivo).
+
+Para una serie con índice I, la inflación entre los meses d y h es
+I_h / I_d − 1 y un monto de d equivale a monto · I_h / I_d en h (el rebase del
+índice no cambia el cociente). ``TablaPeriodos`` alinea el índice en un
+arreglo denso por ordinal de mes (posición = ordinal − primer ordinal, NaN en
+los meses sin dato): una consulta son dos lecturas por posición, sin
+búsquedas, y un lote de miles de consultas son dos ``np.take`` sobre el mismo
+arreglo.
+
+``resolver_csv`` procesa un CSV con una consulta por fila (columnas
+``desde``, ``hasta`` y opcionalmente ``monto``, ``geografia`` y ``clase``),
+p. ej. las fechas de indexación de una cartera de contratos. Las fechas se
+convierten a ordinales de una vez con ``datetime64`` y las filas se agrupan
+por serie, así que el único bucle por fila es el del módulo ``csv``. Las filas
+que no se pueden resolver (fecha no válida, mes sin dato, serie inexistente)
+se devuelven con la columna ``error`` en lugar de abortar el lote.
+"""
+
+import csv
+import io
+import os
+
+import numpy as np
+
+MAX_FILAS = int(os.environ.get("IPC_CALCULADORA_MAX_FILAS", 200000))
+COLUMNAS_RESULTADO = ["indice_desde", "indice_hasta", "inflacion", "factor", "monto_ajustado", "error"]
+
+
+class TablaPeriodos:
+    def __init__(self, ordinales, indices):
+        ordinales = np.asarray(ordinales, dtype=np.int64)
+        self.primero = int(ordinales[0]) if len(ordinales) else 0
+        self.valores = np.full(int(ordinales[-1]) - self.primero + 1 if len(ordinales) else 0, np.nan)
+        self.valores[ordinales - self.primero] = indices
+
+    def indices(self, ordinales):
+        # Índice de cada ordinal de mes (NaN fuera de la serie o en meses sin dato)
+        posiciones = np.asarray(ordinales, dtype=np.int64) - self.primero
+        dentro = (posiciones >= 0) & (posiciones < len(self.valores))
+        return np.where(dentro, np.take(self.valores, np.where(dentro, posiciones, 0), mode="clip"), np.nan)
+
+    def calcular(self, desde, hasta, montos=None):
+        """Inflación entre los meses ``desde`` y ``hasta`` (ordinales, escalares o arreglos).
+
+        Devuelve los índices de ambos meses, la inflación en %, el factor
+        I_hasta / I_desde y, con ``montos``, los montos expresados en precios
+        de ``hasta``. Las consultas sin dato quedan en NaN.
+        """
+        indice_desde, indice_hasta = self.indices(desde), self.indices(hasta)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            factor = indice_hasta / indice_desde
+        resultado = {"indice_desde": indice_desde, "indice_hasta": indice_hasta,
+                     "inflacion": (factor - 1) * 100, "factor": factor}
+        if montos is not None:
+            resultado["monto_ajustado"] = np.asarray(montos, dtype=np.float64) * factor
+        return resultado
+
+
+def ordinales_meses(fechas):
+    """Ordinal de mes (año * 12 + mes − 1) de cada fecha ``AAAA-MM`` o ``AAAA-MM-DD``.
+
+    Devuelve los ordinales y una máscara de fechas válidas (las vacías o mal
+    escritas quedan fuera).
+    """
+    fechas = np.asarray(fechas, dtype=object).astype(str)
+    try:
+        dias = fechas.astype("datetime64[D]")
+    except ValueError:
+        # Alguna fecha mal escrita: se convierten una a una y las inválidas quedan como NaT
+        dias = np.array([_dia(f) for f in fechas.tolist()], dtype="datetime64[D]")
+    validas = ~np.isnat(dias)
+    ordinales = dias.astype("datetime64[M]").astype(np.int64) + 1970 * 12
+    return np.where(validas, ordinales, 0), validas
+
+
+def _dia(texto):
+    try:
+        return np.datetime64(texto.strip(), "D")
+    except ValueError:
+        return np.datetime64("NaT", "D")
+
+
+def _numeros(textos):
+    try:
+        return np.array([t.strip() or "nan" for t in textos], dtype=np.float64)
+    except ValueError:
+        return np.array([_numero(t) for t in textos])
+
+
+def _numero(texto):
+    try:
+        return float(texto)
+    except ValueError:
+        return np.nan
+
+
+def _celdas(valores):
+    # El escritor de csv formatea los float en C; los NaN van como None (celda vacía)
+    celdas = valores.astype(object)
+    celdas[np.isnan(valores)] = None
+    return celdas.tolist()
+
+
+def resolver_csv(texto, obtener_tabla, geografia="Nacional", clase="0", max_filas=MAX_FILAS):
+    """Resuelve un CSV de consultas y devuelve el mismo CSV con las columnas de ``COLUMNAS_RESULTADO``.
+
+    ``obtener_tabla(geografia, clase)`` devuelve la ``TablaPeriodos`` de una
+    serie (``KeyError`` si no existe); ``geografia`` y ``clase`` se usan en
+    las filas que no traen esas columnas. ``ValueError`` si al CSV le faltan
+    columnas o supera ``max_filas``.
+    """
+    lector = csv.reader(io.StringIO(texto.lstrip("\ufeff")))
+    encabezado = [c.strip() for c in next(lector, [])]
+    faltantes = [c for c in ("desde", "hasta") if c not in encabezado]
+    if faltantes:
+        raise ValueError(f"Faltan columnas en el CSV: {', '.join(faltantes)}")
+    filas = [fila for fila in lector if any(fila)]
+    if len(filas) > max_filas:
+        raise ValueError(f"El CSV tiene {len(filas)} filas; el máximo es {max_filas}")
+    n = len(filas)
+    columnas = {nombre: [fila[i] if i < len(fila) else "" for fila in filas] for i, nombre in enumerate(encabezado)}
+
+    desde, desde_validas = ordinales_meses(columnas["desde"])
+    hasta, hasta_validas = ordinales_meses(columnas["hasta"])
+    montos = _numeros(columnas["monto"]) if "monto" in columnas else None
+    resultado = {nombre: np.full(n, np.nan) for nombre in COLUMNAS_RESULTADO[:-1]}
+    errores = np.full(n, "", dtype=object)
+    errores[~(desde_validas & hasta_validas)] = "fecha no válida"
+    if montos is not None:
+        errores[np.isnan(montos) & (np.array(columnas["monto"], dtype=object) != "")] = "monto no válido"
+
+    # Una consulta vectorizada por serie distinta del lote
+    if "geografia" in columnas or "clase" in columnas:
+        claves = [f"{g.strip() or geografia}|{c.strip() or clase}" for g, c in zip(
+            columnas.get("geografia", [""] * n), columnas.get("clase", [""] * n))]
+        unicas, grupos = np.unique(claves, return_inverse=True)
+        lotes = [(str(clave).split("|", 1), np.flatnonzero(grupos == i)) for i, clave in enumerate(unicas)]
+    else:
+        lotes = [((geografia, clase), slice(None))] if n else []
+    for serie, filas_grupo in lotes:
+        try:
+            tabla = obtener_tabla(*serie)
+        except KeyError:
+            errores[filas_grupo] = "serie no disponible"
+            continue
+        calculado = tabla.calcular(desde[filas_grupo], hasta[filas_grupo],
+                                   None if montos is None else montos[filas_grupo])
+        for nombre, valores in calculado.items():
+            resultado[nombre][filas_grupo] = valores
+    sin_dato = (errores == "") & np.isnan(resultado["factor"])
+    errores[sin_dato] = "mes sin dato"
+
+    salida = io.StringIO()
+    escritor = csv.writer(salida, lineterminator="\n")
+    nuevas = [c for c in COLUMNAS_RESULTADO if c != "monto_ajustado" or montos is not None]
+    escritor.writerow([*encabezado, *nuevas])
+    calculadas = [_celdas(resultado[c]) if c != "error" else errores.tolist() for c in nuevas]
+    escritor.writerows(zip(*columnas.values(), *calculadas))
+    return salida.getvalue()
@@ -0,0 +1,149 @@
+"""Compresión de respuestas y caché de larga duración para los recursos estáticos.
+
+El servidor de Dash entrega sin comprimir el layout (``/_dash-layout``), las
+respuestas de los callbacks (``/_dash-update-component``) y los bundles de
+JavaScript. ``registrar_compresion`` añade un ``after_request`` que comprime
+con brotli (si está instalado) o gzip, según ``Accept-Encoding``, las
+respuestas de texto que superan un tamaño mínimo y que no vienen ya
+comprimidas (las de ``api.py`` se comprimen allí).
+
+Las URLs de los recursos estáticos ya llevan una huella: Dash sirve sus
+bundles como ``archivo.v<versión>m<hash>.js`` y añade ``?m=<mtime>`` a los de
+``assets/``. Las que coinciden con la versión vigente se marcan como
+``immutable`` durante un año, así que un navegador que vuelve solo pide el
+HTML, el layout y los callbacks; al cambiar el archivo cambia la URL. Como el
+contenido de esas URLs no cambia, su versión comprimida se guarda en una caché
+LRU acotada (``COMPRIMIDOS_MAX`` entradas) con clave en la ruta sin huella (o
+la ruta y el ``?m=`` de los assets) y la codificación: el resto de la query no
+cuenta, así que un cliente no puede llenarla ni forzar compresiones nuevas
+cambiándola. Un fallo se comprime en la petición con un nivel intermedio
+(brotli 9, ~0,5 s para plotly.js); el nivel máximo (brotli 11, ~10 s) solo se
+usa en ``precomprimir``, que se llama al arrancar (ver ``precargar`` en app.py).
+"""
+
+import gzip
+import os
+from cache_figuras import CacheFiguras
+
+try:
+    import brotli
+except ImportError:  # dependencia opcional: sin ella solo se comprime con gzip
+    brotli = None
+
+TAMANO_MIN_COMPRESION = 1024
+UN_ANIO = 31536000
+TIPOS_COMPRIMIBLES = ("application/json", "application/javascript", "text/")
+EXTENSIONES_COMPRIMIBLES = (".js", ".css", ".json", ".svg")
+COMPRIMIDOS_MAX = 128
+
+
+def codificacion(aceptadas):
+    if brotli is not None and "br" in aceptadas:
+        return "br"
+    if "gzip" in aceptadas:
+        return "gzip"
+    return None
+
+
+def comprimir(cuerpo, codificacion, estatico=False, maximo=False):
+    # Las respuestas dinámicas usan niveles rápidos; los recursos estáticos, que se comprimen una vez,
+    # un nivel intermedio en la petición y el máximo solo al precomprimirlos antes de servir
+    if codificacion == "br":
+        return brotli.compress(cuerpo, quality=11 if maximo else 9 if estatico else 5)
+    return gzip.compress(cuerpo, compresslevel=9 if estatico or maximo else 6)
+
+
+def _comprimible(tipo):
+    return any(tipo.startswith(prefijo) for prefijo in TIPOS_COMPRIMIBLES)
+
+
+def registrar_compresion(server, minimo=TAMANO_MIN_COMPRESION, carpeta_assets=None, ruta_assets="/assets/",
+                         inmutables=()):
+    """Comprime las respuestas de ``server`` y marca los recursos con huella como inmutables.
+
+    ``minimo`` es el tamaño en bytes por debajo del cual no se comprime
+    (negativo desactiva la compresión). ``carpeta_assets`` es la carpeta que
+    Dash sirve en ``ruta_assets``; con ella se comprueba que el ``?m=`` de la
+    URL corresponde al archivo actual. Las rutas que empiezan por alguno de
+    los prefijos de ``inmutables`` (p. ej. los archivos de una exportación
+    estática, con la versión de datos en la ruta) se tratan igual que los
+    recursos con huella.
+
+    Devuelve ``precomprimir(archivos)``, que recibe pares ``(ruta, archivo)``
+    (la ruta sin huella con que se sirve cada archivo) y guarda en la caché
+    su versión comprimida al máximo en cada codificación.
+    """
+    from dash.fingerprint import check_fingerprint
+    from flask import request
+
+    comprimidos = CacheFiguras(COMPRIMIDOS_MAX)
+
+    def huella():
+        # Clave del contenido de una URL inmutable (None si no lo es): ni la huella de Dash ni el resto
+        # de la query cambian el archivo servido
+        ruta = request.path
+        if ruta.startswith(tuple(inmutables)):
+            return ruta
+        if "/_dash-component-suites/" in ruta:
+            original, con_huella = check_fingerprint(ruta)
+            return original if con_huella else None
+        if carpeta_assets is None or not ruta.startswith(ruta_assets) or "m" not in request.args:
+            return None
+        # Una página antigua puede pedir una versión anterior: solo se fija la URL de la versión vigente
+        archivo = os.path.join(carpeta_assets, ruta[len(ruta_assets):])
+        try:
+            vigente = request.args["m"] == str(os.path.getmtime(archivo))
+        except OSError:
+            return None
+        return (ruta, request.args["m"]) if vigente else None
+
+    def procesar(respuesta):
+        clave = huella() if respuesta.status_code == 200 and request.method == "GET" else None
+        estatico = clave is not None
+        if estatico:
+            respuesta.cache_control.public = True
+            respuesta.cache_control.max_age = UN_ANIO
+            respuesta.cache_control.immutable = True
+            respuesta.cache_control.no_cache = None
+
+        if (minimo < 0 or respuesta.status_code != 200 or "Content-Encoding" in respuesta.headers
+                or not _comprimible(respuesta.mimetype or "")):
+            return respuesta
+        respuesta.vary.add("Accept-Encoding")
+        cod = codificacion(request.accept_encodings)
+        if cod is None:
+            return respuesta
+
+        # Los archivos de assets se sirven en streaming: se leen para comprimirlos
+        respuesta.direct_passthrough = False
+        cuerpo = respuesta.get_data()
+        if len(cuerpo) < minimo:
+            return respuesta
+        if estatico:
+            comprimido = comprimidos.obtener_o_construir((clave, cod),
+                                                         lambda: comprimir(cuerpo, cod, estatico=True))
+        else:
+            comprimido = comprimir(cuerpo, cod)
+        respuesta.set_data(comprimido)
+        respuesta.headers["Content-Encoding"] = cod
+        # El ETag de la versión sin comprimir pasa a ser débil (mismo contenido, otros bytes); Flask
+        # compara If-None-Match con comparación débil, así que las revalidaciones siguen dando 304
+        etiqueta = respuesta.get_etag()[0]
+        if etiqueta is not None:
+            respuesta.set_etag(etiqueta, weak=True)
+        return respuesta
+
+    def precomprimir(archivos):
+        codificaciones = ("br", "gzip") if brotli is not None else ("gzip",)
+        for ruta, archivo in archivos:
+            if minimo < 0 or not archivo.endswith(EXTENSIONES_COMPRIMIBLES):
+                continue
+            with open(archivo, "rb") as f:
+                cuerpo = f.read()
+            if len(cuerpo) < minimo:
+                continue
+            for cod in codificaciones:
+                comprimidos.guardar((ruta, cod), comprimir(cuerpo, cod, maximo=True))
+
+    server.after_request(procesar)
+    return precomprimir
@@ -0,0 +1,130 @@
+"""Cubo denso (geografía × clase × mes) con las series empalmadas del INEC.
+
+Se construye en la ingesta a partir de la tabla larga y se guarda como un
+``.npy`` por medida (``indice`` y ``variacion_mensual``) junto a un
+``dimensiones.json`` con los diccionarios de cada eje. Los ``.npy`` se abren
+con ``mmap_mode="r"``: extraer una serie es indexar ``[g, c]`` sobre el
+cubo, una vista sin copia y sin filtrar DataFrames.
+"""
+
+import json
+import os
+import shutil
+from collections import namedtuple
+
+import numpy as np
+
+from almacen_ipc import DIR_CACHE, PUNTERO
+
+MEDIDAS = {
+    "indice": "ipc_ind_nac_reg_ciud_emp_clase",
+    "variacion_mensual": "ipc_var_men_nac_reg_ciud_emp_clase",
+}
+
+# Ciudades de cada región, en el orden de la hoja resumen del INEC
+REGIONES = {
+    "Costa": ["Guayaquil", "Esmeraldas", "Machala", "Manta", "Santo Domingo"],
+    "Sierra": ["Quito", "Loja", "Cuenca", "Ambato"],
+}
+
+Clase = namedtuple("Clase", ["codigo", "nivel", "descripcion"])
+
+
+def ruta_cubo(huella):
+    return os.path.join(DIR_CACHE, f"cubo_{huella}")
+
+
+def construir(tabla):
+    # Dispersa las filas largas de los libros empalmados en un arreglo denso por medida
+    filas_por_medida = {}
+    for medida, prefijo in MEDIDAS.items():
+        fuente = next(i for i, f in enumerate(tabla.fuentes) if f.startswith(prefijo))
+        codigo_medida = int(np.searchsorted(tabla.medidas, medida))
+        filas_por_medida[medida] = np.flatnonzero((tabla.fuente == fuente) & (tabla.medida == codigo_medida))
+
+    todas = np.concatenate(list(filas_por_medida.values()))
+    geografias = np.unique(tabla.geografia[todas])
+    clases = np.unique(tabla.clase[todas])
+    mes_inicio, mes_fin = int(tabla.mes[todas].min()), int(tabla.mes[todas].max())
+
+    # Reasignación de códigos de la tabla larga a posiciones del cubo
+    pos_geo = np.full(len(tabla.geografias), -1)
+    pos_geo[geografias] = np.arange(len(geografias))
+    pos_clase = np.full(len(tabla.clases), -1)
+    pos_clase[clases] = np.arange(len(clases))
+
+    forma = (len(geografias), len(clases), mes_fin - mes_inicio + 1)
+    datos = {}
+    for medida, filas in filas_por_medida.items():
+        cubo = np.full(forma, np.nan)
+        cubo[pos_geo[tabla.geografia[filas]], pos_clase[tabla.clase[filas]], tabla.mes[filas] - mes_inicio] = tabla.valor[filas]
+        datos[medida] = cubo
+
+    dimensiones = {
+        "geografias": [str(tabla.geografias[g]) for g in geografias],
+        "clases": [
+            {"codigo": str(c), "nivel": str(tabla.catalogo[c].nivel), "descripcion": str(tabla.catalogo[c].descripcion)}
+            for c in tabla.clases[clases]
+        ],
+        "mes_inicio": mes_inicio,
+        "meses": forma[2],
+    }
+    return datos, dimensiones
+
+
+def guardar(directorio, datos, dimensiones):
+    temporal = directorio + ".tmp"
+    shutil.rmtree(temporal, ignore_errors=True)
+    os.makedirs(temporal)
+    for medida, cubo in datos.items():
+        np.save(os.path.join(temporal, f"{medida}.npy"), cubo)
+    with open(os.path.join(temporal, "dimensiones.json"), "w", encoding="utf-8") as f:
+        json.dump(dimensiones, f, ensure_ascii=False, indent=2)
+    shutil.rmtree(directorio, ignore_errors=True)
+    os.replace(temporal, directorio)
+
+
+class Cubo:
+    def __init__(self, directorio):
+        with open(os.path.join(directorio, "dimensiones.json"), encoding="utf-8") as f:
+            dimensiones = json.load(f)
+        self.directorio = directorio
+        self.geografias = dimensiones["geografias"]
+        self.clases = [Clase(**c) for c in dimensiones["clases"]]
+        self.mes_inicio = dimensiones["mes_inicio"]
+        self.ordinales = np.arange(self.mes_inicio, self.mes_inicio + dimensiones["meses"], dtype=np.int32)
+        # Índices de diccionario: nombre -> posición en el eje
+        self.pos_geografia = {g: i for i, g in enumerate(self.geografias)}
+        self.pos_clase = {c.codigo: i for i, c in enumerate(self.clases)}
+        self.datos = {
+            medida: np.load(os.path.join(directorio, f"{medida}.npy"), mmap_mode="r")
+            for medida in MEDIDAS
+        }
+
+    def serie(self, geografia, clase="0", medida="indice"):
+        # Vista O(1) sobre el cubo; los meses sin dato quedan como NaN
+        return self.datos[medida][self.pos_geografia[geografia], self.pos_clase[clase]]
+
+    def posicion(self, geografia, clase="0"):
+        # Fila de la serie en el cubo aplanado a (geografía · clase) × mes
+        return self.pos_geografia[geografia] * len(self.clases) + self.pos_clase[clase]
+
+    def descripcion(self, clase):
+        return self.clases[self.pos_clase[clase]].descripcion
+
+
+def directorio_actual():
+    # Directorio del cubo al que apunta la última ingesta (exista ya o no), o None sin ingesta
+    try:
+        with open(PUNTERO, encoding="utf-8") as f:
+            return ruta_cubo(json.load(f)["huella"])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def cargar_cubo():
+    # Cubo de la última ingesta, o None si aún no se ha ejecutado ingesta_excel.py. Si el puntero nombra
+    # un cubo que no se puede leer el error se propaga: publicar una instantánea sin cubo la degradaría,
+    # y el recargador conserva la anterior
+    directorio = directorio_actual()
+    return None if directorio is None else Cubo(directorio)
@@ -1,236 +0,0 @@
-datos = [
-    ("2006-01-01 00:00:00", "69,3868350801482"),
-    ("2006-02-01 00:00:00", "69,87796040404622"),
-    ("2006-03-01 00:00:00", "70,33328915312389"),
-    ("2006-04-01 00:00:00", "70,38145002765305"),
-    ("2006-05-01 00:00:00", "70,28431515196333"),
-    ("2006-06-01 00:00:00", "70,12269237265973"),
-    ("2006-07-01 00:00:00", "70,14354640277594"),
-    ("2006-08-01 00:00:00", "70,29409867923059"),
-    ("2006-09-01 00:00:00", "70,69681292334204"),
-    ("2006-10-01 00:00:00", "70,94338188548402"),
-    ("2006-11-01 00:00:00", "71,06078202534812"),
-    ("2006-12-01 00:00:00", "71,03817315164527"),
-    ("2007-01-01 00:00:00", "71,24907494807852"),
-    ("2007-02-01 00:00:00", "71,29721622410179"),
-    ("2007-03-01 00:00:00", "71,36555115840211"),
-    ("2007-04-01 00:00:00", "71,35878407744613"),
-    ("2007-05-01 00:00:00", "71,38028430508524"),
-    ("2007-06-01 00:00:00", "71,65688797186128"),
-    ("2007-07-01 00:00:00", "71,95644072817491"),
-    ("2007-08-01 00:00:00", "72,0089315767888"),
-    ("2007-09-01 00:00:00", "72,52030196101634"),
-    ("2007-10-01 00:00:00", "72,61799856744642"),
-    ("2007-11-01 00:00:00", "72,97925592864839"),
-    ("2007-12-01 00:00:00", "73,39643195066293"),
-    ("2008-01-01 00:00:00", "74,23471216396801"),
-    ("2008-02-01 00:00:00", "74,93516522290962"),
-    ("2008-03-01 00:00:00", "76,04390950059037"),
-    ("2008-04-01 00:00:00", "77,19849661981294"),
-    ("2008-05-01 00:00:00", "78,00816833487971"),
-    ("2008-06-01 00:00:00", "78,59852182450629"),
-    ("2008-07-01 00:00:00", "79,05925962525794"),
-    ("2008-08-01 00:00:00", "79,22518341450959"),
-    ("2008-09-01 00:00:00", "79,7475732965297"),
-    ("2008-10-01 00:00:00", "79,77278225128873"),
-    ("2008-11-01 00:00:00", "79,64460301488671"),
-    ("2008-12-01 00:00:00", "79,8777342342988"),
-    ("2009-01-01 00:00:00", "80,44280361768926"),
-    ("2009-02-01 00:00:00", "80,81779173054029"),
-    ("2009-03-01 00:00:00", "81,69966175884424"),
-    ("2009-04-01 00:00:00", "82,23476998378642"),
-    ("2009-05-01 00:00:00", "82,22759683921058"),
-    ("2009-06-01 00:00:00", "82,16543913897101"),
-    ("2009-07-01 00:00:00", "82,10506495524868"),
-    ("2009-08-01 00:00:00", "81,86063148084186"),
-    ("2009-09-01 00:00:00", "82,3726474588285"),
-    ("2009-10-01 00:00:00", "82,56788763655626"),
-    ("2009-11-01 00:00:00", "82,84511989553275"),
-    ("2009-12-01 00:00:00", "83,32185735936669"),
-    ("2010-01-01 00:00:00", "84,01399033476417"),
-    ("2010-02-01 00:00:00", "84,30031539408397"),
-    ("2010-03-01 00:00:00", "84,4376619411323"),
-    ("2010-04-01 00:00:00", "84,8744739332226"),
-    ("2010-05-01 00:00:00", "84,88869728464634"),
-    ("2010-06-01 00:00:00", "84,88088307930883"),
-    ("2010-07-01 00:00:00", "84,89748875460351"),
-    ("2010-08-01 00:00:00", "84,98792908828892"),
-    ("2010-09-01 00:00:00", "85,20630656061743"),
-    ("2010-10-01 00:00:00", "85,42300417545691"),
-    ("2010-11-01 00:00:00", "85,65426049081509"),
-    ("2010-12-01 00:00:00", "86,09483799697492"),
-    ("2011-01-01 00:00:00", "86,67958353617878"),
-    ("2011-02-01 00:00:00", "87,16062133957266"),
-    ("2011-03-01 00:00:00", "87,45420123261297"),
-    ("2011-04-01 00:00:00", "88,17139593671541"),
-    ("2011-05-01 00:00:00", "88,47633708172295"),
-    ("2011-06-01 00:00:00", "88,51152590996249"),
-    ("2011-07-01 00:00:00", "88,66714854103348"),
-    ("2011-08-01 00:00:00", "89,09804899539738"),
-    ("2011-09-01 00:00:00", "89,80269119416721"),
-    ("2011-10-01 00:00:00", "90,11893959292314"),
-    ("2011-11-01 00:00:00", "90,39233171494251"),
-    ("2011-12-01 00:00:00", "90,75203690379746"),
-    ("2012-01-01 00:00:00", "91,26673908551976"),
-    ("2012-02-01 00:00:00", "91,97632612898623"),
-    ("2012-03-01 00:00:00", "92,80495727935518"),
-    ("2012-04-01 00:00:00", "92,95158539509993"),
-    ("2012-05-01 00:00:00", "92,77120706889929"),
-    ("2012-06-01 00:00:00", "92,93364467063107"),
-    ("2012-07-01 00:00:00", "93,1764126242344"),
-    ("2012-08-01 00:00:00", "93,44538238853784"),
-    ("2012-09-01 00:00:00", "94,49375907645614"),
-    ("2012-10-01 00:00:00", "94,57503093079289"),
-    ("2012-11-01 00:00:00", "94,70681777857801"),
-    ("2012-12-01 00:00:00", "94,53086968974523"),
-    ("2013-01-01 00:00:00", "95,00619258036419"),
-    ("2013-02-01 00:00:00", "95,18166357837433"),
-    ("2013-03-01 00:00:00", "95,59892520981674"),
-    ("2013-04-01 00:00:00", "95,77005343114487"),
-    ("2013-05-01 00:00:00", "95,56137210310837"),
-    ("2013-06-01 00:00:00", "95,42300892299541"),
-    ("2013-07-01 00:00:00", "95,4052026704532"),
-    ("2013-08-01 00:00:00", "95,570817462635"),
-    ("2013-09-01 00:00:00", "96,1135456896929"),
-    ("2013-10-01 00:00:00", "96,50595050259321"),
-    ("2013-11-01 00:00:00", "96,88636598308238"),
-    ("2013-12-01 00:00:00", "97,08352647785513"),
-    ("2014-01-01 00:00:00", "97,78418762952951"),
-    ("2014-02-01 00:00:00", "97,89165595677747"),
-    ("2014-03-01 00:00:00", "98,57325803558928"),
-    ("2014-04-01 00:00:00", "98,86451825501645"),
-    ("2014-05-01 00:00:00", "98,82386120664385"),
-    ("2014-06-01 00:00:00", "98,92669846502888"),
-    ("2014-07-01 00:00:00", "99,32573662360387"),
-    ("2014-08-01 00:00:00", "99,53375028945625"),
-    ("2014-09-01 00:00:00", "100,1436176964556"),
-    ("2014-10-01 00:00:00", "100,34670687187817"),
-    ("2014-11-01 00:00:00", "100,52856629739634"),
-    ("2014-12-01 00:00:00", "100,64392618773738"),
-    ("2015-01-01 00:00:00", "101,23809318427608"),
-    ("2015-02-01 00:00:00", "101,8580658136905"),
-    ("2015-03-01 00:00:00", "102,27994749673182"),
-    ("2015-04-01 00:00:00", "103,13627563479656"),
-    ("2015-05-01 00:00:00", "103,31885533217022"),
-    ("2015-06-01 00:00:00", "103,73993026800957"),
-    ("2015-07-01 00:00:00", "103,65745508968548"),
-    ("2015-08-01 00:00:00", "103,65609830696916"),
-    ("2015-09-01 00:00:00", "103,93019277185026"),
-    ("2015-10-01 00:00:00", "103,83615508197414"),
-    ("2015-11-01 00:00:00", "103,94768476646423"),
-    ("2015-12-01 00:00:00", "104,04581683199868"),
-    ("2016-01-01 00:00:00", "104,36644104792664"),
-    ("2016-02-01 00:00:00", "104,51051226280372"),
-    ("2016-03-01 00:00:00", "104,6537079872369"),
-    ("2016-04-01 00:00:00", "104,97455116218416"),
-    ("2016-05-01 00:00:00", "105,00793260339609"),
-    ("2016-06-01 00:00:00", "105,38476115065836"),
-    ("2016-07-01 00:00:00", "105,29497082737932"),
-    ("2016-08-01 00:00:00", "105,1233220323402"),
-    ("2016-09-01 00:00:00", "105,28349733079344"),
-    ("2016-10-01 00:00:00", "105,19690371967314"),
-    ("2016-11-01 00:00:00", "105,04411350913944"),
-    ("2016-12-01 00:00:00", "105,21091299001108"),
-    ("2017-01-01 00:00:00", "105,30329077682848"),
-    ("2017-02-01 00:00:00", "105,51204374395172"),
-    ("2017-03-01 00:00:00", "105,65732670186564"),
-    ("2017-04-01 00:00:00", "106,11676915031546"),
-    ("2017-05-01 00:00:00", "106,1652067892166"),
-    ("2017-06-01 00:00:00", "105,55273726978947"),
-    ("2017-07-01 00:00:00", "105,40436716683446"),
-    ("2017-08-01 00:00:00", "105,41688937022037"),
-    ("2017-09-01 00:00:00", "105,25558454379048"),
-    ("2017-10-01 00:00:00", "105,10348915410012"),
-    ("2017-11-01 00:00:00", "104,81586227834617"),
-    ("2017-12-01 00:00:00", "105,00396255276031"),
-    ("2018-01-01 00:00:00", "105,20405017642692"),
-    ("2018-02-01 00:00:00", "105,3651764879284"),
-    ("2018-03-01 00:00:00", "105,43229591260356"),
-    ("2018-04-01 00:00:00", "105,28585550532802"),
-    ("2018-05-01 00:00:00", "105,09360950223572"),
-    ("2018-06-01 00:00:00", "104,80541381639894"),
-    ("2018-07-01 00:00:00", "104,80109808551504"),
-    ("2018-08-01 00:00:00", "105,08352502361932"),
-    ("2018-09-01 00:00:00", "105,49532491059487"),
-    ("2018-10-01 00:00:00", "105,44572728116816"),
-    ("2018-11-01 00:00:00", "105,17914043107265"),
-    ("2018-12-01 00:00:00", "105,28345197590016"),
-    ("2019-01-01 00:00:00", "105,77350035070884"),
-    ("2019-02-01 00:00:00", "105,5309119483752"),
-    ("2019-03-01 00:00:00", "105,30776053115817"),
-    ("2019-04-01 00:00:00", "105,48843216168692"),
-    ("2019-05-01 00:00:00", "105,4839936209769"),
-    ("2019-06-01 00:00:00", "105,44624945676328"),
-    ("2019-07-01 00:00:00", "105,5425580396318"),
-    ("2019-08-01 00:00:00", "105,4326426292707"),
-    ("2019-09-01 00:00:00", "105,42003146493528"),
-    ("2019-10-01 00:00:00", "105,9689814591236"),
-    ("2019-11-01 00:00:00", "105,22328112266187"),
-    ("2019-12-01 00:00:00", "105,21466694791847"),
-    ("2020-01-01 00:00:00", "105,45351761293924"),
-    ("2020-02-01 00:00:00", "105,29067555160395"),
-    ("2020-03-01 00:00:00", "105,49856259812246"),
-    ("2020-04-01 00:00:00", "106,55631784873646"),
-    ("2020-05-01 00:00:00", "106,27928837109695"),
-    ("2020-06-01 00:00:00", "105,6205537244432"),
-    ("2020-07-01 00:00:00", "104,97346998607048"),
-    ("2020-08-01 00:00:00", "104,63351365792576"),
-    ("2020-09-01 00:00:00", "104,46970372360956"),
-    ("2020-10-01 00:00:00", "104,2719650540207"),
-    ("2020-11-01 00:00:00", "104,26285751850271"),
-    ("2020-12-01 00:00:00", "104,23302548021373"),
-    ("2021-01-01 00:00:00", "104,35409739341397"),
-    ("2021-02-01 00:00:00", "104,44211349147372"),
-    ("2021-03-01 00:00:00", "104,62530113687411"),
-    ("2021-04-01 00:00:00", "104,99064422359092"),
-    ("2021-05-01 00:00:00", "105,07814419232896"),
-    ("2021-06-01 00:00:00", "104,89361256189753"),
-    ("2021-07-01 00:00:00", "105,44557173099714"),
-    ("2021-08-01 00:00:00", "105,56735074543374"),
-    ("2021-09-01 00:00:00", "105,58390927228538"),
-    ("2021-10-01 00:00:00", "105,80373813334948"),
-    ("2021-11-01 00:00:00", "106,18413901575335"),
-    ("2021-12-01 00:00:00", "106,2558533647232"),
-    ("2022-01-01 00:00:00", "107,022306333896"),
-    ("2022-02-01 00:00:00", "107,27112864588928"),
-    ("2022-03-01 00:00:00", "107,39173998062046"),
-    ("2022-04-01 00:00:00", "108,0292687379866"),
-    ("2022-05-01 00:00:00", "108,6314357718385"),
-    ("2022-06-01 00:00:00", "109,3356113990182"),
-    ("2022-07-01 00:00:00", "109,51080679795307"),
-    ("2022-08-01 00:00:00", "109,54212537178022"),
-    ("2022-09-01 00:00:00", "109,93309397206023"),
-    ("2022-10-01 00:00:00", "110,06143636366996"),
-    ("2022-11-01 00:00:00", "110,05370922840966"),
-    ("2022-12-01 00:00:00", "110,22731694308068"),
-    ("2023-01-01 00:00:00", "110,36023674933388"),
-    ("2023-02-01 00:00:00", "110,38040761670501"),
-    ("2023-03-01 00:00:00", "110,45213858545928"),
-    ("2023-04-01 00:00:00", "110,66886501960828"),
-    ("2023-05-01 00:00:00", "110,7675911528242"),
-    ("2023-06-01 00:00:00", "111,18154147761496"),
-    ("2023-07-01 00:00:00", "111,78085815246833"),
-    ("2023-08-01 00:00:00", "112,34308109991397"),
-    ("2023-09-01 00:00:00", "112,38560667368267"),
-    ("2023-10-01 00:00:00", "112,1889116199476"),
-    ("2023-11-01 00:00:00", "111,74105392694088"),
-    ("2023-12-01 00:00:00", "111,71510141675462"),
-    ("2024-01-01 00:00:00", "111,85513148675096"),
-    ("2024-02-01 00:00:00", "111,95895210895316"),
-    ("2024-03-01 00:00:00", "112,28143974978718"),
-    ("2024-04-01 00:00:00", "113,71089463843762"),
-    ("2024-05-01 00:00:00", "113,57535802608874"),
-    ("2024-06-01 00:00:00", "112,49403982589185"),
-    ("2024-07-01 00:00:00", "113,5406763805436"),
-    ("2024-08-01 00:00:00", "113,78625520598035"),
-    ("2024-09-01 00:00:00", "113,98680824373253"),
-    ("2024-10-01 00:00:00", "113,71519560538572"),
-    ("2024-11-01 00:00:00", "113,42409479249775"),
-    ("2024-12-01 00:00:00", "112,30626377954248"),
-    ("2025-01-01 00:00:00", "112,14217977536832"),
-    ("2025-02-01 00:00:00", "112,2387827870256"),
-    ("2025-03-01 00:00:00", "112,62670744455625"),
-    ("2025-04-01 00:00:00", "112,92914553866666"),
-    ("2025-05-01 00:00:00", "114,096622634184"),
-    ("2025-06-01 00:00:00", "114,16370787419946"),
-]
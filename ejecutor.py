@@ -0,0 +1,85 @@
+"""Construcción de figuras pesadas en un pool de procesos acotado.
+
+Los callbacks corren en los hilos del worker. Una figura larga (muchas filas
+que submuestrear y serializar) retiene el GIL mientras se construye y retrasa
+a los callbacks baratos de otros usuarios, como ``actualizar_tarjetas``. Las
+construcciones cuyo peso supera un umbral se envían a un
+``ProcessPoolExecutor`` con pocos procesos; el hilo que la pidió espera el
+resultado sin retener el GIL. El pool atiende en orden de llegada y el número
+de construcciones pendientes está acotado: con la cola llena, el hilo espera
+turno antes de encolar.
+
+El pool se crea en el primer uso dentro de cada worker (nunca en el maestro
+de gunicorn antes del fork), con procesos ``forkserver`` que no heredan los
+hilos del worker. Como en ``ingesta_excel``, los procesos importan el módulo
+principal: los scripts que usen la app deben proteger su código con
+``if __name__ == "__main__"``. Si un proceso muere, la figura se construye en
+el hilo y el pool se recrea en la siguiente.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+
+class EjecutorFiguras:
+    def __init__(self, procesos=2, umbral=0, cola=8):
+        # Sin procesos (p. ej. con un solo núcleo) todo se construye en el hilo de la petición
+        self.procesos = procesos
+        self.umbral = umbral
+        self._plazas = threading.BoundedSemaphore(procesos + cola) if procesos > 0 else None
+        self._pool = None
+        self._pid = None
+        self._candado = threading.Lock()
+        self.en_pool = 0
+        self.en_hilo = 0
+        self.fallos_pool = 0
+
+    def _contar(self, contador):
+        with self._candado:
+            setattr(self, contador, getattr(self, contador) + 1)
+
+    def _obtener_pool(self):
+        with self._candado:
+            # Un pool heredado por fork pertenece al proceso padre: cada proceso crea el suyo
+            if self._pool is None or self._pid != os.getpid():
+                contexto = multiprocessing.get_context("forkserver")
+                contexto.set_forkserver_preload(["figuras"])
+                self._pool = ProcessPoolExecutor(self.procesos, mp_context=contexto)
+                self._pid = os.getpid()
+            return self._pool
+
+    def ejecutar(self, funcion, *args, peso=0):
+        """Resultado de ``funcion(*args)``, en el pool si ``peso`` alcanza el umbral.
+
+        ``funcion`` debe ser importable desde su módulo y ``args`` serializables
+        con pickle (arrays de NumPy, diccionarios, textos). Con ``peso=None`` se
+        ejecuta siempre en el hilo.
+        """
+        if self._plazas is None or peso is None or peso < self.umbral:
+            self._contar("en_hilo")
+            return funcion(*args)
+        with self._plazas:
+            pool = self._obtener_pool()
+            try:
+                resultado = pool.submit(funcion, *args).result()
+            except BrokenProcessPool:
+                self._descartar(pool)
+                self._contar("fallos_pool")
+                return funcion(*args)
+        self._contar("en_pool")
+        return resultado
+
+    def _descartar(self, pool):
+        with self._candado:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def cerrar(self):
+        with self._candado:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
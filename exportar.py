@@ -0,0 +1,138 @@
+"""Exportación estática del dashboard: las figuras de todos los estados como archivos.
+
+    python exportar.py [--destino estatico] [--procesos N] [--conservar N]
+
+Los estados del gráfico son pocos y enumerables (``app.periodos_estaticos``):
+cada año, las tres tarjetas de rango y los últimos 2, 3, 5 y 10 años y todos,
+por cada indicador; las incidencias, por cada medida. Cada figura se
+construye con el mismo código que los callbacks y se escribe en
+``<destino>/v/<versión>/{grafico,incidencias}/<indicador o medida>/<estado>.json``;
+los estados se reparten en un pool de procesos como en ``ingesta_excel``.
+``serie.json`` lleva la serie nacional con sus indicadores (tarjetas al hacer
+clic y calculadora) y ``layout.json`` el layout de la página, que se escribe
+al final: hasta entonces la app sigue sirviendo la exportación anterior.
+
+Con ``IPC_ESTATICO=<destino>`` la app arranca en modo de solo lectura: no
+carga datos ni registra la API, sirve ``layout.json`` y los archivos de la
+exportación en ``/estatico/``, y los callbacks se resuelven en el navegador
+(``assets/ipc_estatico.js``) pidiendo el archivo de cada estado. Una
+selección de años que no se exportó se compone en el navegador a partir de
+los archivos de cada año. Como la versión forma parte de la ruta, los
+archivos de ``v/`` nunca cambian y se pueden publicar en un CDN o en un
+servidor de archivos; ``IPC_ESTATICO_URL`` (al exportar) es la URL desde la
+que los pide el navegador.
+"""
+
+import argparse
+import json
+import math
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+DESTINO = os.environ.get("IPC_ESTATICO") or "estatico"
+
+
+def _escribir(ruta, texto):
+    # Escritura atómica: un servidor que lee el archivo nunca ve uno a medias
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        f.write(texto)
+    os.replace(temporal, ruta)
+    return len(texto.encode("utf-8"))
+
+
+def exportar_estados(directorio, version, tareas):
+    """Escribe las figuras de ``tareas`` (tipo, indicador o medida, clave, rango, años); devuelve los bytes."""
+    import app
+
+    d = app.datos()
+    if d.version != version:
+        raise RuntimeError(f"Los datos cambiaron durante la exportación ({version} -> {d.version})")
+    total = 0
+    for tipo, nombre, clave, rango, anios in tareas:
+        if tipo == "grafico":
+            texto = app.texto_figura_serie(d, "Nacional", "0", nombre, None, rango, anios, en_pool=False)
+        else:
+            texto = app.texto_figura_incidencias(d, rango, anios, nombre)
+        total += _escribir(os.path.join(directorio, tipo, nombre, f"{clave}.json"), texto)
+    return total
+
+
+def _serie(d, indicadores):
+    # Serie nacional para las tarjetas y la calculadora del navegador: el mes i es el ordinal primero + i
+    nacional = d.series["Nacional"]
+    columnas = {nombre: [None if math.isnan(v) else v for v in nacional.columnas[nombre].tolist()]
+                for nombre in ["IPC", *indicadores]}
+    return {"primero": int(nacional.indice.ordinales[0]), "etiquetas": nacional.etiquetas, **columnas}
+
+
+def _lotes(tareas, n):
+    # Lotes contiguos del mismo tamaño: cada figura cuesta menos de un milisegundo y enviar una por
+    # tarea al pool costaría más que construirla
+    tamano = max(1, math.ceil(len(tareas) / n))
+    return [tareas[i:i + tamano] for i in range(0, len(tareas), tamano)]
+
+
+def exportar(destino=DESTINO, procesos=None, conservar=3):
+    """Exporta la versión de datos vigente a ``destino`` y devuelve un resumen."""
+    os.environ["IPC_ESTATICO"] = destino
+    import app
+    from plotly.io.json import to_json_plotly
+
+    if app.DIR_ESTATICO != os.path.abspath(destino):
+        raise RuntimeError("exportar() debe llamarse antes de importar app (el layout depende del modo estático)")
+    inicio = time.perf_counter()
+    d = app.datos()
+    version = app.version_estatica(d)
+    directorio = os.path.join(destino, "v", version)
+    periodos = app.periodos_estaticos(d.anios)
+    tareas = [("grafico", indicador, clave, rango, anios)
+              for indicador in app.INDICADORES for clave, (rango, anios) in periodos.items()]
+    if d.series_incidencias is not None:
+        medidas = sorted(set(app.config_estatico(d)["medidas"].values()))
+        tareas += [("incidencias", medida, clave, rango, anios)
+                   for medida in medidas for clave, (rango, anios) in periodos.items()]
+
+    procesos = procesos if procesos is not None else (os.cpu_count() or 1)
+    if procesos > 1:
+        # Los procesos heredan (fork) o cargan la misma instantánea; cada uno escribe sus archivos
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            lotes = _lotes(tareas, procesos)
+            total = sum(pool.map(exportar_estados, [directorio] * len(lotes), [d.version] * len(lotes), lotes))
+    else:
+        total = exportar_estados(directorio, d.version, tareas)
+    total += _escribir(os.path.join(directorio, "serie.json"), json.dumps(_serie(d, app.INDICADORES), ensure_ascii=False))
+
+    # El layout publica la versión nueva: se escribe el último
+    total += _escribir(os.path.join(destino, "layout.json"), to_json_plotly(app.construir_layout(d)))
+    borradas = _podar(destino, version, conservar)
+    return {"version": version, "archivos": len(tareas) + 2, "bytes": total, "procesos": procesos,
+            "borradas": borradas, "segundos": round(time.perf_counter() - inicio, 3)}
+
+
+def _podar(destino, vigente, conservar):
+    # Se conservan las ``conservar`` versiones más recientes: las páginas abiertas con una versión
+    # anterior siguen encontrando sus archivos hasta que se recargan
+    raiz = os.path.join(destino, "v")
+    versiones = sorted(os.scandir(raiz), key=lambda e: e.stat().st_mtime, reverse=True)
+    antiguas = [e for e in versiones if e.is_dir() and e.name != vigente][max(conservar - 1, 0):]
+    for entrada in antiguas:
+        shutil.rmtree(entrada.path)
+    return [e.name for e in antiguas]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exportación estática del dashboard IPC")
+    parser.add_argument("--destino", default=DESTINO, help="Directorio de la exportación (IPC_ESTATICO al servirla)")
+    parser.add_argument("--procesos", type=int, default=None, help="Procesos del pool (por defecto, núcleos)")
+    parser.add_argument("--conservar", type=int, default=3, help="Versiones exportadas que se conservan")
+    args = parser.parse_args()
+    # Sin pool de figuras ni caché compartida: la exportación ya reparte los estados entre procesos
+    os.environ.setdefault("IPC_PROCESOS_FIGURAS", "0")
+    os.environ.setdefault("IPC_CACHE_COMPARTIDA", "")
+    json.dump(exportar(args.destino, args.procesos, args.conservar), sys.stdout, indent=2)
+    print()
@@ -0,0 +1,193 @@
+"""Construcción de las figuras del dashboard.
+
+Funciones puras sobre los cortes ya seleccionados (fechas y columnas): no
+dependen de la instantánea de datos ni de Dash, así que las figuras pesadas
+se pueden construir en los procesos del pool de ``ejecutor.py``, que solo
+importan este módulo.
+
+Las respuestas de los callbacks (``figura_json``, ``figura_incidencias_json``)
+no pasan por la validación de plotly: el layout se valida y serializa una vez
+por indicador y cada llamada solo serializa las trazas, con fechas y valores
+como arreglos binarios en base64. ``construir_figura`` devuelve la misma
+figura como ``go.Figure``.
+"""
+
+import base64
+import json
+import os
+from functools import lru_cache
+
+import numpy as np
+import plotly.graph_objects as go
+
+from nucleo import MEDIDAS as MEDIDAS_NUCLEO
+from submuestreo import lttb
+
+# Indicadores que se pueden mostrar en el eje secundario: (etiqueta del gráfico, título de la tarjeta)
+INDICADORES = {
+    "anual": ("Variación Anual (%)", "Inflación Anual Seleccionada"),
+    "mensual": ("Variación Mensual (%)", "Inflación Mensual Seleccionada"),
+    "acumulada": ("Variación Acumulada en el Año (%)", "Inflación Acumulada Seleccionada"),
+    "promedio_12m": ("Variación Promedio 12 Meses (%)", "Inflación Promedio Seleccionada"),
+}
+
+# Título del gráfico de incidencias según la medida
+TITULOS_INCIDENCIA = {
+    "mensual": "Incidencia en la Variación Mensual (pp)",
+    "acumulada": "Incidencia en la Variación Acumulada (pp)",
+    "anual": "Incidencia en la Variación Anual (pp)",
+}
+
+# Color de cada medida de inflación subyacente (ver nucleo.py), en línea punteada sobre el eje secundario
+COLORES_NUCLEO = {"sin_alimentos": "#FF7F50", "mediana": "#ADFF2F", "media_recortada": "#DA70D6"}
+
+# Abanico del pronóstico (ver pronostico.py): bandas del 95 % y del 80 % en el color del IPC, más
+# opacas cuanto más estrechas, y la mediana en línea punteada
+BANDAS_PRONOSTICO = {"95": "rgba(255, 222, 33, 0.15)", "80": "rgba(255, 222, 33, 0.3)"}
+
+# Vistas largas: se submuestrean con LTTB a ~ancho del gráfico en píxeles y, por encima del umbral,
+# se dibujan con WebGL (Scattergl) y sin marcadores
+PUNTOS_MAX = int(os.environ.get("IPC_PUNTOS_MAX", 1000))
+UMBRAL_WEBGL = int(os.environ.get("IPC_UMBRAL_WEBGL", 1000))
+
+def submuestrear(fechas, valores, puntos=PUNTOS_MAX):
+    if len(fechas) <= puntos:
+        return fechas, valores
+    posiciones = lttb(fechas.astype(np.int64), valores, puntos)
+    return fechas[posiciones], valores[posiciones]
+
+def arreglo_tipado(valores):
+    # Arreglo binario en base64 que plotly.js decodifica como Float64Array (los NaN quedan como huecos)
+    return {"dtype": "f8", "bdata": base64.b64encode(np.ascontiguousarray(valores, dtype="<f8")).decode("ascii")}
+
+def fechas_tipadas(fechas):
+    # En un eje de tipo fecha plotly.js acepta milisegundos desde epoch: 8 bytes por fecha en lugar
+    # del texto ISO; los eventos (clickData, relayoutData) siguen devolviendo fechas en texto
+    return arreglo_tipado(np.asarray(fechas, dtype="datetime64[ms]").astype(np.int64))
+
+# Trazas de la figura principal como diccionarios ya listos para serializar (sin validación de plotly)
+def trazas_serie(fechas, columnas, nombre="IPC General", indicador="anual", pronostico=None, puntos=PUNTOS_MAX):
+    if not len(fechas):
+        return []
+    tipo, modo = ("scattergl", "lines") if len(fechas) > UMBRAL_WEBGL else ("scatter", "lines+markers")
+    x_ipc, y_ipc = submuestrear(fechas, columnas["IPC"], puntos)
+    x_indicador, y_indicador = submuestrear(fechas, columnas[indicador], puntos)
+    trazas = [
+        {"type": tipo, "x": fechas_tipadas(x_ipc), "y": arreglo_tipado(y_ipc), "mode": modo, "name": nombre,
+         "yaxis": "y", "line": {"color": "#FFDE21"}},
+        {"type": tipo, "x": fechas_tipadas(x_indicador), "y": arreglo_tipado(y_indicador), "mode": modo,
+         "name": INDICADORES[indicador][0], "yaxis": "y2", "line": {"color": "#00FFFF", "dash": "dash"}},
+    ]
+    # Medidas de inflación subyacente, si vienen entre las columnas, en el eje del indicador
+    for medida, color in COLORES_NUCLEO.items():
+        if medida in columnas and not np.isnan(columnas[medida]).all():
+            x, y = submuestrear(fechas, columnas[medida], puntos)
+            trazas.append({"type": tipo, "x": fechas_tipadas(x), "y": arreglo_tipado(y), "mode": "lines",
+                           "name": MEDIDAS_NUCLEO[medida], "yaxis": "y2", "line": {"color": color, "dash": "dot"}})
+    if pronostico is not None:
+        trazas += trazas_pronostico(pronostico)
+    return trazas
+
+# Abanico en el eje del IPC: cada banda es su límite inferior y el superior relleno hasta él. Solo la
+# mediana va en la leyenda; todas las trazas comparten el grupo "pronostico" (se ocultan juntas y así
+# las reconoce el modo estático)
+def trazas_pronostico(pronostico):
+    x = fechas_tipadas(pronostico["fechas"])
+    comun = {"type": "scatter", "x": x, "mode": "lines", "yaxis": "y", "legendgroup": "pronostico"}
+    trazas = []
+    for nivel, relleno in BANDAS_PRONOSTICO.items():
+        trazas.append({**comun, "y": arreglo_tipado(pronostico[f"inferior_{nivel}"]), "name": f"Límite inferior {nivel} %",
+                       "line": {"width": 0}, "showlegend": False})
+        trazas.append({**comun, "y": arreglo_tipado(pronostico[f"superior_{nivel}"]), "name": f"Límite superior {nivel} %",
+                       "line": {"width": 0}, "showlegend": False, "fill": "tonexty", "fillcolor": relleno})
+    trazas.append({**comun, "y": arreglo_tipado(pronostico["media"]), "name": "Pronóstico (80 % y 95 %)",
+                   "line": {"color": "#FFDE21", "dash": "dot"}})
+    return trazas
+
+# Barras apiladas de la incidencia de cada división, con la variación general como línea
+def trazas_incidencias(fechas, columnas, divisiones):
+    if not len(fechas):
+        return []
+    x = fechas_tipadas(fechas)
+    trazas = [{"type": "bar", "x": x, "y": arreglo_tipado(columnas[division]), "name": nombre}
+              for division, nombre in divisiones.items()]
+    trazas.append({"type": "scatter", "x": x, "y": arreglo_tipado(columnas["total"]), "mode": "lines+markers",
+                   "name": "Inflación General", "line": {"color": "#FFDE21"}})
+    return trazas
+
+# Construcción de la figura a partir de los cortes precalculados (la serie ya está en orden cronológico)
+def construir_figura(fechas, columnas, nombre="IPC General", indicador="anual", pronostico=None):
+    etiqueta = INDICADORES[indicador][0]
+    fig = go.Figure(data=trazas_serie(fechas, columnas, nombre, indicador, pronostico))
+    fig.update_layout(
+        title=dict(text=f"IPC y {etiqueta.removesuffix(' (%)')}", font=dict(color="white"), pad=dict(b=0)),
+        font=dict(color="white"),
+        height=350,
+        xaxis=dict(title="Fecha", type="date", color="white", tickfont=dict(color="white")),
+        yaxis=dict(title=dict(text="Índice General (IPC)", font=dict(color="white")), tickfont=dict(color="white")),
+        yaxis2=dict(
+            title=dict(text=etiqueta, font=dict(color="white")),
+            tickfont=dict(color="white"),
+            overlaying="y",
+            side="right"
+        ),
+        legend=dict(font=dict(color="white"), x=0, y=1.1, orientation="h"),
+        template="plotly_white",
+        plot_bgcolor="rgba(255, 255, 255, 0.1)",
+        paper_bgcolor="rgba(255, 255, 255, 0.1)"
+    )
+    
+    return fig
+
+def construir_figura_incidencias(fechas, columnas, divisiones, medida="anual"):
+    fig = go.Figure(data=trazas_incidencias(fechas, columnas, divisiones))
+    fig.update_layout(
+        title=dict(text=TITULOS_INCIDENCIA[medida], font=dict(color="white"), pad=dict(b=0)),
+        font=dict(color="white"),
+        height=350,
+        barmode="relative",
+        hovermode="x unified",
+        showlegend=False,
+        xaxis=dict(title="Fecha", type="date", color="white", tickfont=dict(color="white")),
+        yaxis=dict(title=dict(text="Puntos porcentuales", font=dict(color="white")), tickfont=dict(color="white")),
+        template="plotly_white",
+        plot_bgcolor="rgba(255, 255, 255, 0.1)",
+        paper_bgcolor="rgba(255, 255, 255, 0.1)"
+    )
+
+    return fig
+
+# Layouts serializados una sola vez: solo cambian con el indicador o la medida. De la plantilla
+# plotly_white se conservan el layout y los estilos de los tipos de traza que se dibujan; los de los
+# demás tipos (~7 KB) no cambian el dibujo
+TIPOS_TRAZA = ("scatter", "scattergl", "bar")
+
+def _layout_compacto(fig):
+    layout = fig.to_plotly_json()["layout"]
+    plantilla = layout["template"]
+    plantilla["data"] = {tipo: estilos for tipo, estilos in plantilla["data"].items() if tipo in TIPOS_TRAZA}
+    return json.dumps(layout, separators=(",", ":"))
+
+@lru_cache(maxsize=None)
+def layout_serie(indicador):
+    return _layout_compacto(construir_figura([], {}, indicador=indicador))
+
+@lru_cache(maxsize=None)
+def layout_incidencias(medida):
+    return _layout_compacto(construir_figura_incidencias([], {}, {}, medida))
+
+def _figura(trazas, layout):
+    return '{"data":' + json.dumps(trazas, separators=(",", ":"), ensure_ascii=False) + ',"layout":' + layout + "}"
+
+# Figura serializada de una serie, con el eje x fijado a la ventana de zoom si la hay, el abanico del
+# pronóstico si se pasa y ``puntos`` por traza como máximo
+def figura_json(fechas, columnas, nombre, indicador, ventana=None, pronostico=None, puntos=PUNTOS_MAX):
+    layout = layout_serie(indicador)
+    if ventana is not None:
+        layout = json.loads(layout)
+        layout["xaxis"]["range"] = [str(e) for e in ventana]
+        layout = json.dumps(layout, separators=(",", ":"))
+    return _figura(trazas_serie(fechas, columnas, nombre, indicador, pronostico, puntos), layout)
+
+def figura_incidencias_json(fechas, columnas, divisiones, medida):
+    return _figura(trazas_incidencias(fechas, columnas, divisiones), layout_incidencias(medida))
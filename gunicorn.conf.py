@@ -0,0 +1,20 @@
+# Configuración de gunicorn para servir el dashboard (ver wsgi.py)
+import gc
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 8050)}"
+workers = int(os.environ.get("IPC_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get("IPC_THREADS", 4))
+worker_class = "gthread"
+timeout = int(os.environ.get("IPC_TIMEOUT", 30))
+keepalive = 5
+
+# Cargar datos y estructuras precalculadas en el maestro antes del fork
+preload_app = True
+
+
+def when_ready(server):
+    # Congelar los objetos ya creados evita que el GC de cada worker escriba en
+    # sus cabeceras y rompa el copy-on-write de las páginas compartidas
+    gc.freeze()
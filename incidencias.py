@@ -0,0 +1,92 @@
+"""Incidencia de cada división CCIF en la inflación general.
+
+Con un índice de Laspeyres de ponderaciones fijas, el índice general es la
+suma ponderada de los índices de división, ``G_t = Σ w_i · I_i,t``, así que la
+variación general entre un mes de referencia ``r`` y ``t`` se reparte
+exactamente entre divisiones:
+
+    incidencia_i,t = w_i · (I_i,t − I_i,r) / G_r · 100
+
+El mes de referencia es el anterior (mensual), el diciembre anterior
+(acumulada) o el mismo mes del año anterior (anual). Cada medida es una sola
+operación sobre la matriz (divisiones × meses). La descomposición solo es
+exacta desde el mes base de las ponderaciones, por eso las series empiezan
+ahí; ``verificar`` comprueba que las incidencias suman la variación general.
+
+Se calcula en la ingesta y se guarda junto al cubo (``incidencias.npz``).
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+import artefactos
+import indicadores
+
+DIVISIONES = tuple(f"{i:02d}" for i in range(1, 13))
+MEDIDAS = ("mensual", "acumulada", "anual")
+TOLERANCIA = 1e-6  # puntos porcentuales
+ARCHIVO = "incidencias.npz"
+
+Incidencias = namedtuple("Incidencias", ["ordinales", "divisiones", "pesos", "mensual", "acumulada", "anual"])
+
+
+def _referencias(ordinales, medida):
+    # Posición del mes de referencia de cada mes; negativa si cae antes del inicio
+    posiciones = np.arange(len(ordinales))
+    if medida == "mensual":
+        return posiciones - 1
+    if medida == "anual":
+        return posiciones - 12
+    return posiciones - np.asarray(ordinales) % 12 - 1
+
+
+def descomponer(ordinales, pesos, indices, general):
+    """Incidencias (divisiones × meses) en puntos porcentuales para cada medida."""
+    resultado = {}
+    for medida in MEDIDAS:
+        referencia = _referencias(ordinales, medida)
+        validos = referencia >= 0
+        incidencia = np.full(indices.shape, np.nan)
+        previos = referencia[validos]
+        incidencia[:, validos] = pesos[:, None] * (indices[:, validos] - indices[:, previos]) / general[previos] * 100
+        resultado[medida] = incidencia
+    return resultado
+
+
+def verificar(ordinales, incidencias, general):
+    # La suma por mes debe coincidir con la variación del índice general
+    titulares = indicadores.calcular(ordinales, general)
+    for medida in MEDIDAS:
+        residuo = np.abs(incidencias[medida].sum(axis=0) - titulares[medida][0])
+        if np.nanmax(residuo, initial=0.0) > TOLERANCIA:
+            raise ValueError(f"Las incidencias {medida}es no suman la variación general "
+                             f"(residuo máximo {np.nanmax(residuo):.2e} pp)")
+
+
+def construir(tabla, cubo):
+    # Solo se usa en la ingesta: importarlo aquí evita cargar pandas al arrancar la app
+    from ingesta_excel import seleccionar
+
+    fuente = next(f for f in tabla.fuentes if f.startswith("ipc_incid_nac_div"))
+    meses, pesos = zip(*(seleccionar(tabla, "ponderacion", clase=d, fuente=fuente) for d in DIVISIONES))
+    pesos = np.array([p[0] for p in pesos])
+
+    # Las ponderaciones rigen desde el mes anterior al primero publicado (diciembre del año base)
+    base = int(np.searchsorted(cubo.ordinales, min(m[0] for m in meses))) - 1
+    ordinales = cubo.ordinales[base:]
+    indices = np.stack([cubo.serie("Nacional", d)[base:] for d in DIVISIONES])
+    general = np.array(cubo.serie("Nacional")[base:])
+
+    resultado = descomponer(ordinales, pesos, indices, general)
+    verificar(ordinales, resultado, general)
+    return Incidencias(ordinales=ordinales, divisiones=np.array(DIVISIONES), pesos=pesos, **resultado)
+
+
+def guardar(directorio, incidencias):
+    artefactos.guardar(directorio, ARCHIVO, incidencias)
+
+
+def cargar(directorio):
+    # Incidencias guardadas junto al cubo, o None si la ingesta no las generó
+    return artefactos.cargar(directorio, ARCHIVO, Incidencias)
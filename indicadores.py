@@ -0,0 +1,126 @@
+"""Indicadores derivados del índice, calculados en bloque para muchas series.
+
+Las series se apilan en una matriz (series × meses) con meses consecutivos;
+cada indicador es una operación vectorizada sobre la matriz completa, así
+que calcular cientos de series cuesta lo mismo que una fila de Python. Los
+meses sin dato son NaN y se propagan a los indicadores que dependen de ellos.
+
+Indicadores (en %):
+
+* ``mensual``: variación respecto al mes anterior.
+* ``acumulada``: variación en lo que va del año, respecto al diciembre anterior.
+* ``anual``: variación respecto al mismo mes del año anterior.
+* ``promedio_12m``: variación del promedio del índice en los últimos 12 meses
+  frente al promedio de los 12 meses previos.
+
+``rebasar`` lleva el índice a base 100 en cualquier mes. ``recalcular``
+actualiza los indicadores cuando solo cambian los meses desde una columna
+(meses añadidos al final o revisados): cada indicador mira como mucho
+``CONTEXTO`` meses atrás, así que basta recalcular desde esa columna con ese
+contexto y conservar el resto.
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+NOMBRES = ("mensual", "acumulada", "anual", "promedio_12m")
+# Meses hacia atrás que usa el indicador más largo: promedio_12m compara la media de 12 meses con la de
+# los 12 anteriores
+CONTEXTO = 24
+
+
+def _variacion(actual, previo):
+    return (actual / previo - 1) * 100
+
+
+def _desfasada(matriz, desfase):
+    # Variación frente a la columna ``desfase`` meses atrás; las primeras quedan en NaN
+    resultado = np.full(matriz.shape, np.nan)
+    resultado[:, desfase:] = _variacion(matriz[:, desfase:], matriz[:, :-desfase])
+    return resultado
+
+
+def calcular(ordinales, indices):
+    """Todos los indicadores para una matriz (series × meses) de índices."""
+    indices = np.atleast_2d(np.asarray(indices, dtype=np.float64))
+    n_meses = indices.shape[1]
+
+    # Posición del diciembre anterior de cada mes (ordinal % 12 es el mes del año, 0 = enero)
+    diciembre = np.arange(n_meses) - np.asarray(ordinales) % 12 - 1
+    con_base = diciembre >= 0
+    acumulada = np.full(indices.shape, np.nan)
+    acumulada[:, con_base] = _variacion(indices[:, con_base], indices[:, diciembre[con_base]])
+
+    promedio_12m = np.full(indices.shape, np.nan)
+    if n_meses >= 24:
+        medias = sliding_window_view(indices, 12, axis=1).mean(axis=2)
+        promedio_12m[:, 23:] = _variacion(medias[:, 12:], medias[:, :-12])
+
+    return {
+        "mensual": _desfasada(indices, 1),
+        "acumulada": acumulada,
+        "anual": _desfasada(indices, 12) if n_meses > 12 else np.full(indices.shape, np.nan),
+        "promedio_12m": promedio_12m,
+    }
+
+
+def recalcular(valores, ordinales, indices, desde):
+    """Indicadores de ``indices`` recalculando solo las columnas desde ``desde``.
+
+    ``valores`` son los indicadores de una versión anterior cuyas columnas
+    hasta ``desde`` (sin incluir) coinciden con las de ``indices``; las
+    posteriores pueden haber cambiado o ser nuevas.
+    """
+    indices = np.atleast_2d(np.asarray(indices, dtype=np.float64))
+    inicio = max(desde - CONTEXTO, 0)
+    tramo = calcular(np.asarray(ordinales)[inicio:], indices[:, inicio:])
+    resultado = {}
+    for nombre in NOMBRES:
+        columna = np.empty(indices.shape)
+        columna[:, :desde] = valores[nombre][:, :desde]
+        columna[:, desde:] = tramo[nombre][:, desde - inicio:]
+        resultado[nombre] = columna
+    return resultado
+
+
+def rebasar(indices, posicion):
+    """Índices con base 100 en la columna ``posicion``."""
+    indices = np.atleast_2d(indices)
+    return indices / indices[:, posicion:posicion + 1] * 100
+
+
+class Indicadores:
+    """Indicadores de una versión de datos, calculados una vez al construirse.
+
+    ``version`` identifica los datos (revisión del almacén o huella de la
+    ingesta); quien tenga una versión nueva construye otra instancia, o la
+    pide a ``actualizado`` si solo cambian los meses desde una columna. Los
+    rebases no se guardan: se calculan solo para las filas que se piden.
+    """
+
+    def __init__(self, ordinales, indices, version, valores=None):
+        self.ordinales = np.asarray(ordinales)
+        self.indices = np.atleast_2d(np.asarray(indices, dtype=np.float64))
+        self.version = version
+        self.valores = calcular(self.ordinales, self.indices) if valores is None else valores
+
+    def actualizado(self, ordinales, indices, desde, version):
+        # Indicadores de los datos nuevos, que coinciden con estos hasta la columna ``desde``
+        return Indicadores(ordinales, indices, version, recalcular(self.valores, ordinales, indices, desde))
+
+    def indicador(self, nombre):
+        return self.valores[nombre]
+
+    def rebasado(self, ordinal_base, filas=slice(None)):
+        # Índices de las filas pedidas (todas por defecto) con base 100 en el mes ``ordinal_base``
+        posicion = int(ordinal_base) - int(self.ordinales[0])
+        if not 0 <= posicion < len(self.ordinales):
+            raise ValueError(f"Mes base fuera de la serie: {ordinal_base}")
+        return rebasar(self.indices[filas], posicion)
+
+    def fila(self, posicion, ordinal_base=None):
+        # Columnas de una serie: el índice (rebasado si se pide) y cada indicador
+        indices = self.indices[posicion] if ordinal_base is None else self.rebasado(ordinal_base, [posicion])[0]
+        columnas = {"IPC": indices}
+        columnas.update({nombre: self.valores[nombre][posicion] for nombre in NOMBRES})
+        return columnas
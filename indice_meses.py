@@ -0,0 +1,107 @@
+"""Índices precalculados sobre series mensuales ordenadas.
+
+Los clics sobre el gráfico llegan como texto de fecha; en lugar de restar la
+fecha a toda la columna y ordenar, se busca con ``np.searchsorted`` sobre los
+días de inicio de cada mes y se elige el vecino más cercano. Los valores de la
+fila se leen de arreglos contiguos por columna.
+
+Para filtrar por años se usa una tabla año -> (inicio, fin) construida una
+sola vez: como la serie es cronológica, cada año es un tramo contiguo y una
+selección de años se resuelve con cortes en lugar de máscaras booleanas.
+"""
+
+from datetime import date
+
+import numpy as np
+
+
+def _dias_desde_epoch(ordinales):
+    meses = np.asarray(ordinales, dtype=np.int64) - 1970 * 12
+    return meses.astype("datetime64[M]").astype("datetime64[D]").astype(np.int64)
+
+
+class IndiceMeses:
+    def __init__(self, ordinales):
+        self.ordinales = np.ascontiguousarray(ordinales, dtype=np.int64)
+        self._dias = _dias_desde_epoch(self.ordinales)
+
+    def __len__(self):
+        return len(self.ordinales)
+
+    def posicion(self, fecha):
+        # Posición del mes más cercano a `fecha` (texto ISO, date o datetime64)
+        n = len(self._dias)
+        if n == 0:
+            raise LookupError("Índice de meses vacío")
+        dia = np.datetime64(str(fecha)[:10], "D").astype(np.int64)
+        i = int(np.searchsorted(self._dias, dia))
+        if i == 0:
+            return 0
+        if i == n:
+            return n - 1
+        return i if self._dias[i] - dia < dia - self._dias[i - 1] else i - 1
+
+
+class TablaAnios:
+    def __init__(self, ordinales):
+        anios = np.asarray(ordinales, dtype=np.int64) // 12
+        valores, inicios = np.unique(anios, return_index=True)
+        finales = np.append(inicios[1:], len(anios))
+        self.tramos = {int(a): (int(i), int(f)) for a, i, f in zip(valores, inicios, finales)}
+
+    def rango(self, desde, hasta):
+        # Corte contiguo que cubre los años [desde, hasta] presentes en la serie
+        presentes = [self.tramos[a] for a in range(desde, hasta + 1) if a in self.tramos]
+        if not presentes:
+            return slice(0, 0)
+        return slice(presentes[0][0], presentes[-1][1])
+
+    def posiciones(self, anios):
+        # Une los tramos de los años pedidos; si quedan contiguos basta un corte (vista sin copia)
+        tramos = sorted(self.tramos[a] for a in set(anios) if a in self.tramos)
+        corridas = []
+        for inicio, fin in tramos:
+            if corridas and corridas[-1][1] == inicio:
+                corridas[-1][1] = fin
+            else:
+                corridas.append([inicio, fin])
+        if not corridas:
+            return slice(0, 0)
+        if len(corridas) == 1:
+            return slice(*corridas[0])
+        return np.concatenate([np.arange(inicio, fin) for inicio, fin in corridas])
+
+
+class SerieIndexada:
+    def __init__(self, ordinales, **columnas):
+        self.indice = IndiceMeses(ordinales)
+        self.anios = TablaAnios(ordinales)
+        self.fechas = (self.indice.ordinales - 1970 * 12).astype("datetime64[M]").astype("datetime64[ns]")
+        self.columnas = {nombre: np.ascontiguousarray(valores, dtype=np.float64) for nombre, valores in columnas.items()}
+        self.etiquetas = [date(int(o) // 12, int(o) % 12 + 1, 1).strftime("%b-%Y") for o in self.indice.ordinales]
+        self._vistas_rango = {}
+
+    def fila(self, fecha):
+        i = self.indice.posicion(fecha)
+        return self.etiquetas[i], {nombre: valores[i] for nombre, valores in self.columnas.items()}
+
+    def _cortar(self, posiciones):
+        return self.fechas[posiciones], {nombre: valores[posiciones] for nombre, valores in self.columnas.items()}
+
+    def vista(self, anios):
+        return self._cortar(self.anios.posiciones(anios))
+
+    def vista_fechas(self, desde, hasta):
+        # Meses con inicio dentro de [desde, hasta] (fechas datetime64), p. ej. la ventana de un zoom
+        # Se compara en días desde epoch: datetime64[ns] no llega más allá de 2262
+        dias = self.indice._dias
+        inicio = np.searchsorted(dias, np.datetime64(desde, "D").astype(np.int64), side="left")
+        fin = np.searchsorted(dias, np.datetime64(hasta, "D").astype(np.int64), side="right")
+        return self._cortar(slice(int(inicio), int(fin)))
+
+    def vista_rango(self, desde, hasta):
+        # Las vistas de rangos fijos se guardan; al ser cortes no copian datos
+        clave = (desde, hasta)
+        if clave not in self._vistas_rango:
+            self._vistas_rango[clave] = self._cortar(self.anios.rango(desde, hasta))
+        return self._vistas_rango[clave]
@@ -0,0 +1,450 @@
+"""Ingesta de los libros Excel del INEC a una tabla larga en caché.
+
+Uso:
+    python ingesta_excel.py [--procesos N] [--forzar]
+
+Cada hoja de cada libro se procesa en un pool de procesos y se normaliza a
+filas (mes, geografía, clase, medida, valor, fuente). El resultado se guarda
+en ``datos/cache/ipc_largo_<huella>.npz`` con columnas codificadas por
+diccionario; la huella es el SHA-256 de los libros de origen, así que el
+parseo solo se repite cuando llega una publicación nueva. Los workers web
+leen únicamente el artefacto (ver ``cargar_tabla``), nunca los Excel.
+
+El puntero ``datos/cache/ultimo.json``, que los workers siguen para recargar
+los datos, se escribe al final (``publicar``): cuando cambia, el cubo y
+todos los artefactos derivados ya están en disco.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import unicodedata
+from datetime import datetime
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from almacen_ipc import DIR_CACHE, PUNTERO, RUTA_NACIONAL, agregar_meses, cargar_serie, escribir_serie, ordinal
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+DIR_EXCEL = os.path.join(BASE, "Tabulados_y_series_historicas_Excel (1)")
+
+MESES_ABREV = {
+    "ene": 1, "feb": 2, "mar": 3, "abr": 4, "may": 5, "jun": 6,
+    "jul": 7, "ago": 8, "sep": 9, "sept": 9, "oct": 10, "nov": 11, "dic": 12,
+}
+
+# Nombres canónicos de las geografías (hojas y columnas usan variantes)
+GEOGRAFIAS = {
+    "NACIONAL": "Nacional",
+    "REGION SIERRA": "Sierra",
+    "REG. SIERRA": "Sierra",
+    "REGION COSTA": "Costa",
+    "REG. COSTA": "Costa",
+    "STO. DOMINGO": "Santo Domingo",
+    "SANTO DOMINGO": "Santo Domingo",
+}
+
+NIVELES_CCIF = ("General", "División", "Grupo", "Clase", "Subclase")
+
+FilaCatalogo = namedtuple("FilaCatalogo", ["clase", "nivel", "descripcion"])
+Tabla = namedtuple("Tabla", ["mes", "geografia", "clase", "medida", "valor", "fuente",
+                             "geografias", "clases", "medidas", "fuentes", "catalogo", "huella"])
+
+
+def _sin_tildes(texto):
+    return "".join(c for c in unicodedata.normalize("NFD", texto) if unicodedata.category(c) != "Mn")
+
+
+def normalizar_geografia(nombre):
+    nombre = re.sub(r"^\d+\.\s*", "", str(nombre)).strip()
+    clave = _sin_tildes(nombre).upper()
+    return GEOGRAFIAS.get(clave, nombre.title())
+
+
+def _ordinal_etiqueta(etiqueta):
+    # Etiquetas de columna del tipo "ene-05"
+    abrev, anio = str(etiqueta).strip().lower().split("-")
+    return ordinal(2000 + int(anio), MESES_ABREV[abrev.rstrip(".")])
+
+
+def _es_etiqueta_mes(valor):
+    return isinstance(valor, str) and re.fullmatch(r"[a-z]{3,4}\.?-\d{2}", valor.strip().lower()) is not None
+
+
+def _codigo(valor):
+    if pd.isna(valor):
+        return "0"
+    return str(valor).strip()
+
+
+def _fila_encabezado(hoja, primera_celda):
+    for i, valor in enumerate(hoja.iloc[:, 0]):
+        if isinstance(valor, str) and _sin_tildes(valor).strip().upper() == primera_celda:
+            return i
+    raise ValueError(f"No se encontró la fila de encabezado '{primera_celda}'")
+
+
+def _medida_de_titulo(titulo):
+    titulo = _sin_tildes(str(titulo)).upper()
+    if "INCID" in titulo:
+        prefijo = "incidencia"
+    elif "INDICE" in titulo and "VARIA" not in titulo:
+        return "indice"
+    else:
+        prefijo = "variacion"
+    if "MENSUAL" in titulo:
+        return f"{prefijo}_mensual"
+    if "ANUAL" in titulo:
+        return f"{prefijo}_anual"
+    if "ACUMUL" in titulo or "LO QUE VA DEL" in titulo:
+        return f"{prefijo}_acumulada"
+    raise ValueError(f"No se reconoce la medida de '{titulo}'")
+
+
+def _numerico(bloque):
+    return bloque.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64)
+
+
+def _largo(bloque, medida, mes, geografia, clase):
+    # Aplana un bloque 2-D a filas largas; mes, geografía y clase se difunden a la forma del bloque
+    presentes = ~np.isnan(bloque)
+    return pd.DataFrame({
+        "mes": np.broadcast_to(mes, bloque.shape)[presentes].astype(np.int32),
+        "geografia": np.broadcast_to(np.asarray(geografia, dtype=object), bloque.shape)[presentes],
+        "clase": np.broadcast_to(np.asarray(clase, dtype=object), bloque.shape)[presentes],
+        "medida": medida,
+        "valor": bloque[presentes],
+    })
+
+
+# Parsers por formato de hoja; todos devuelven (filas largas, catálogo)
+def _hoja_serie_historica(hoja, nombre_hoja, nombre_libro):
+    # Años en filas y meses en columnas, solo nivel nacional
+    anios = pd.to_numeric(hoja.iloc[:, 0], errors="coerce")
+    validas = np.flatnonzero((anios > 1900) & (anios < 2100))
+    bloque = _numerico(hoja.iloc[validas, 1:13])
+    meses = anios.to_numpy()[validas, None].astype(np.int32) * 12 + np.arange(12)
+    filas = _largo(bloque, _medida_de_titulo(nombre_hoja), meses, "Nacional", "0")
+    return filas, [FilaCatalogo("0", "General", "GENERAL")]
+
+
+def _hoja_descriptivos(hoja, nombre_hoja, nombre_libro):
+    # Una columna por agregado descriptivo (General, Alimentos, Bienes, ...)
+    inicio = _fila_encabezado(hoja, "MES")
+    agregados = [str(c).strip().rstrip("*") for c in hoja.iloc[inicio, 1:]]
+    clases = np.array(["0" if a == "General" else a for a in agregados], dtype=object)
+    fechas = hoja.iloc[inicio + 1:, 0]
+    validas = [i for i, f in enumerate(fechas, start=inicio + 1) if isinstance(f, datetime)]
+    meses = np.array([ordinal(f.year, f.month) for f in hoja.iloc[validas, 0]], dtype=np.int32)
+    bloque = _numerico(hoja.iloc[validas, 1:])
+    filas = _largo(bloque, _medida_de_titulo(nombre_hoja), meses[:, None], "Nacional", clases[None, :])
+    catalogo = [FilaCatalogo(c, "General" if c == "0" else "Agregado", a) for c, a in zip(clases, agregados)]
+    return filas, catalogo
+
+
+def _hoja_ccif(hoja, nombre_hoja, nombre_libro):
+    # Libros empalmados e incidencias: una fila por código CCIF, una columna por mes
+    inicio = _fila_encabezado(hoja, "NIVEL")
+    encabezado = hoja.iloc[inicio].tolist()
+    columnas_mes = [j for j, e in enumerate(encabezado) if _es_etiqueta_mes(e)]
+    meses = np.array([_ordinal_etiqueta(encabezado[j]) for j in columnas_mes], dtype=np.int32)
+    col_codigo = next(j for j, e in enumerate(encabezado) if str(e).startswith("Cód"))
+    col_peso = next((j for j, e in enumerate(encabezado) if str(e).startswith("Ponderaci")), None)
+
+    if "INCID" in _sin_tildes(nombre_hoja).upper():
+        medida = _medida_de_titulo(nombre_hoja)
+        geografia = "Nacional"
+    else:
+        medida = "variacion_mensual" if "var_men" in nombre_libro else "indice"
+        geografia = normalizar_geografia(nombre_hoja)
+
+    validas, catalogo = [], []
+    for i in range(inicio + 1, len(hoja)):
+        nivel = hoja.iat[i, 0]
+        # La fila de total de incidencias no tiene nivel pero pondera 1
+        es_total = pd.isna(nivel) and col_peso is not None and hoja.iat[i, col_peso] == 1
+        if not es_total and str(nivel).strip() not in NIVELES_CCIF:
+            continue
+        validas.append(i)
+        clase = _codigo(hoja.iat[i, col_codigo])
+        descripcion = "GENERAL" if es_total else str(hoja.iat[i, col_codigo + 1]).strip()
+        catalogo.append(FilaCatalogo(clase, "General" if es_total else str(nivel).strip(), descripcion))
+
+    clases = np.array([e.clase for e in catalogo], dtype=object)[:, None]
+    partes = [_largo(_numerico(hoja.iloc[validas, columnas_mes]), medida, meses[None, :], geografia, clases)]
+    if col_peso is not None and medida == "incidencia_mensual":
+        # La ponderación es constante; se repite por mes para poder alinearla con las series
+        pesos = pd.to_numeric(hoja.iloc[validas, col_peso], errors="coerce").to_numpy(dtype=np.float64)
+        bloque = np.repeat(pesos[:, None], len(meses), axis=1)
+        partes.append(_largo(bloque, "ponderacion", meses[None, :], geografia, clases))
+    return pd.concat(partes, ignore_index=True), catalogo
+
+
+def _hoja_resumen(hoja, nombre_hoja, nombre_libro):
+    # Corte de un solo mes: divisiones en filas, ciudades y regiones en columnas
+    cabecera = hoja.iloc[:6].to_numpy()
+    mes_txt = next(str(v) for v in cabecera.ravel() if str(v).startswith("MES:"))
+    anio = next(int(fila[j + 1]) for fila in cabecera for j, v in enumerate(fila[:-1]) if str(v).startswith("AÑO:"))
+    mes = ordinal(anio, int(mes_txt.split(":")[1]))
+
+    inicio = _fila_encabezado(hoja, "CODIGO CCIF")
+    encabezado = hoja.iloc[inicio, 2:]
+    columnas = [j + 2 for j, g in enumerate(encabezado) if pd.notna(g)]
+    geografias = np.array([normalizar_geografia(hoja.iat[inicio, j]) for j in columnas], dtype=object)
+
+    # Las secciones (mensual, anual, en lo que va del año, índice) se marcan con una fila de título
+    secciones, catalogo, medida = {}, {}, None
+    for i in range(inicio + 1, len(hoja)):
+        codigo, titulo = hoja.iat[i, 0], hoja.iat[i, 1]
+        if pd.isna(codigo) and isinstance(titulo, str):
+            medida = _medida_de_titulo(titulo)
+        elif medida is not None and str(codigo).strip().isdigit():
+            clase = _codigo(codigo)
+            secciones.setdefault(medida, []).append((i, clase))
+            catalogo.setdefault(clase, FilaCatalogo(clase, "General" if clase == "0" else "División", str(titulo).strip()))
+
+    partes = []
+    for medida, filas in secciones.items():
+        indices, clases = zip(*filas)
+        bloque = _numerico(hoja.iloc[list(indices), columnas])
+        partes.append(_largo(bloque, medida, mes, geografias[None, :], np.array(clases, dtype=object)[:, None]))
+    return pd.concat(partes, ignore_index=True), list(catalogo.values())
+
+
+def _parser_para(nombre_libro):
+    if nombre_libro.startswith("SERIE HISTORICA"):
+        return _hoja_serie_historica
+    if "indicadores_descriptivos" in nombre_libro:
+        return _hoja_descriptivos
+    if "hojaresumen" in nombre_libro:
+        return _hoja_resumen
+    return _hoja_ccif
+
+
+def procesar_hoja(ruta, nombre_hoja):
+    nombre_libro = os.path.basename(ruta)
+    hoja = pd.read_excel(ruta, sheet_name=nombre_hoja, header=None)
+    filas, catalogo = _parser_para(nombre_libro)(hoja, nombre_hoja, nombre_libro)
+    fuente = os.path.splitext(nombre_libro)[0]
+    return fuente, filas, catalogo
+
+
+def _hojas(ruta):
+    with pd.ExcelFile(ruta) as libro:
+        return [h for h in libro.sheet_names if h.strip().upper() != "CONTENIDO"]
+
+
+def libros_origen(directorio=DIR_EXCEL):
+    rutas = []
+    for raiz, _, archivos in os.walk(directorio):
+        rutas += [os.path.join(raiz, a) for a in archivos if a.lower().endswith((".xls", ".xlsx"))]
+    return sorted(rutas)
+
+
+def huella_origen(rutas):
+    # Libros idénticos (mismo contenido) cuentan una sola vez
+    digestos = {}
+    for ruta in rutas:
+        h = hashlib.sha256()
+        with open(ruta, "rb") as f:
+            for bloque in iter(lambda: f.read(1 << 20), b""):
+                h.update(bloque)
+        digestos.setdefault(h.hexdigest(), ruta)
+    total = hashlib.sha256("".join(sorted(digestos)).encode()).hexdigest()
+    return total[:16], sorted(digestos.values())
+
+
+def _codificar(valores):
+    vocabulario, codigos = np.unique(np.asarray(valores, dtype=str), return_inverse=True)
+    return vocabulario, codigos.astype(np.int16)
+
+
+def construir_tabla(rutas, procesos=None):
+    tareas = [(ruta, hoja) for ruta in rutas for hoja in _hojas(ruta)]
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        resultados = list(pool.map(procesar_hoja, *zip(*tareas)))
+
+    partes, catalogo = [], {}
+    for fuente, filas_hoja, catalogo_hoja in resultados:
+        partes.append(filas_hoja.assign(fuente=fuente))
+        for entrada in catalogo_hoja:
+            catalogo.setdefault(entrada.clase, entrada)
+    filas = pd.concat(partes, ignore_index=True)
+
+    vocab_geo, cod_geo = _codificar(filas["geografia"])
+    vocab_clase, cod_clase = _codificar(filas["clase"])
+    vocab_medida, cod_medida = _codificar(filas["medida"])
+    vocab_fuente, cod_fuente = _codificar(filas["fuente"])
+    entradas = [catalogo[c] for c in vocab_clase]
+    return {
+        "mes": filas["mes"].to_numpy(dtype=np.int32),
+        "geografia": cod_geo,
+        "clase": cod_clase,
+        "medida": cod_medida.astype(np.int8),
+        "valor": filas["valor"].to_numpy(dtype=np.float64),
+        "fuente": cod_fuente.astype(np.int8),
+        "geografias": vocab_geo,
+        "clases": vocab_clase,
+        "medidas": vocab_medida,
+        "fuentes": vocab_fuente,
+        "niveles": np.array([e.nivel for e in entradas]),
+        "descripciones": np.array([e.descripcion for e in entradas]),
+    }
+
+
+def ruta_artefacto(huella):
+    return os.path.join(DIR_CACHE, f"ipc_largo_{huella}.npz")
+
+
+def ingerir(directorio=DIR_EXCEL, procesos=None, forzar=False):
+    huella, rutas = huella_origen(libros_origen(directorio))
+    destino = ruta_artefacto(huella)
+    if forzar or not os.path.exists(destino):
+        os.makedirs(DIR_CACHE, exist_ok=True)
+        columnas = construir_tabla(rutas, procesos)
+        temporal = destino + ".tmp.npz"
+        np.savez(temporal, **columnas)
+        os.replace(temporal, destino)
+    return huella, destino
+
+
+def publicar(huella, destino):
+    # Apunta la app a la ingesta ``huella``; se llama cuando su cubo y sus artefactos están completos
+    with open(PUNTERO + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"huella": huella, "archivo": os.path.basename(destino)}, f)
+    os.replace(PUNTERO + ".tmp", PUNTERO)
+
+
+def cargar_tabla(ruta=None):
+    huella = None
+    if ruta is None:
+        with open(PUNTERO, encoding="utf-8") as f:
+            puntero = json.load(f)
+        huella, ruta = puntero["huella"], os.path.join(DIR_CACHE, puntero["archivo"])
+    with np.load(ruta) as z:
+        columnas = {k: z[k] for k in z.files}
+    catalogo = {
+        c: FilaCatalogo(c, n, d)
+        for c, n, d in zip(columnas["clases"], columnas["niveles"], columnas["descripciones"])
+    }
+    return Tabla(catalogo=catalogo, huella=huella, **{
+        k: columnas[k] for k in Tabla._fields if k not in ("catalogo", "huella")
+    })
+
+
+def a_dataframe(tabla):
+    return pd.DataFrame({
+        "mes": tabla.mes,
+        "geografia": pd.Categorical.from_codes(tabla.geografia, tabla.geografias),
+        "clase": pd.Categorical.from_codes(tabla.clase, tabla.clases),
+        "medida": pd.Categorical.from_codes(tabla.medida, tabla.medidas),
+        "valor": tabla.valor,
+        "fuente": pd.Categorical.from_codes(tabla.fuente, tabla.fuentes),
+    })
+
+
+def seleccionar(tabla, medida, geografia="Nacional", clase="0", fuente=None):
+    # Serie ordenada por mes para una combinación de dimensiones
+    mascara = (
+        (tabla.medida == np.searchsorted(tabla.medidas, medida))
+        & (tabla.geografia == np.searchsorted(tabla.geografias, geografia))
+        & (tabla.clase == np.searchsorted(tabla.clases, clase))
+    )
+    if fuente is not None:
+        mascara &= tabla.fuente == np.searchsorted(tabla.fuentes, fuente)
+    meses, posiciones = np.unique(tabla.mes[mascara], return_index=True)
+    return meses, tabla.valor[mascara][posiciones]
+
+
+def serie_nacional(tabla):
+    # La serie del almacén del dashboard: índice General de los indicadores descriptivos
+    fuente = next(f for f in tabla.fuentes if "indicadores_descriptivos" in f)
+    return seleccionar(tabla, "indice", fuente=fuente)
+
+
+def reemplazar_cubo(armado, cubo):
+    # Con --forzar el cubo anterior se aparta con un renombrado antes de mover el nuevo y se borra
+    # después: si el reemplazo falla se restaura. Una recarga entre los dos renombrados no encuentra
+    # el cubo, falla y conserva la instantánea anterior (ver cubo_ipc.cargar_cubo)
+    anterior = cubo + ".anterior"
+    shutil.rmtree(anterior, ignore_errors=True)
+    if os.path.isdir(cubo):
+        os.replace(cubo, anterior)
+    try:
+        os.replace(armado, cubo)
+    except OSError:
+        if os.path.isdir(anterior):
+            os.replace(anterior, cubo)
+        raise
+    shutil.rmtree(anterior, ignore_errors=True)
+
+
+def actualizar_almacen_nacional(tabla, directorio=RUTA_NACIONAL):
+    # Si la publicación solo añade o revisa meses, el almacén se actualiza de forma incremental
+    meses, valores = serie_nacional(tabla)
+    try:
+        actual = cargar_serie(directorio)
+    except OSError:
+        escribir_serie(directorio, meses, valores)
+        return True
+
+    n = len(actual.meses)
+    if n == 0 or len(meses) < n or not np.array_equal(meses[:n], actual.meses):
+        escribir_serie(directorio, meses, valores)
+        return True
+    cambios = np.flatnonzero(valores[:n] != actual.valores)
+    cambios = np.concatenate([cambios, np.arange(n, len(meses))])
+    if len(cambios) == 0:
+        return False
+    agregar_meses(directorio, meses[cambios], valores[cambios])
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingesta de los libros Excel del IPC")
+    parser.add_argument("--origen", default=DIR_EXCEL, help="Directorio con los libros del INEC")
+    parser.add_argument("--procesos", type=int, default=None, help="Procesos del pool (por defecto, núcleos)")
+    parser.add_argument("--forzar", action="store_true", help="Reprocesar aunque exista el artefacto")
+    args = parser.parse_args()
+
+    huella, destino = ingerir(args.origen, args.procesos, args.forzar)
+    tabla = cargar_tabla(destino)
+    print(f"Tabla larga: {destino} ({len(tabla.valor)} filas, huella {huella})")
+
+    import cubo_ipc
+    import incidencias
+    import nucleo
+    import pronostico
+
+    # Un cubo nuevo se arma con todos sus artefactos en un directorio temporal y se mueve a su sitio
+    # de una vez; uno existente solo completa los artefactos que le falten (cada uno se escribe atómicamente)
+    cubo = cubo_ipc.ruta_cubo(huella)
+    nuevo = args.forzar or not os.path.isdir(cubo)
+    directorio = cubo + ".armando" if nuevo else cubo
+    if nuevo:
+        cubo_ipc.guardar(directorio, *cubo_ipc.construir(tabla))
+    if nuevo or incidencias.cargar(directorio) is None:
+        incidencias.guardar(directorio, incidencias.construir(tabla, cubo_ipc.Cubo(directorio)))
+    if nuevo or nucleo.cargar(directorio) is None:
+        nucleo.guardar(directorio, nucleo.construir(cubo_ipc.Cubo(directorio), incidencias.cargar(directorio)))
+    if nuevo or pronostico.cargar(directorio) is None:
+        pronostico.guardar(directorio, pronostico.construir(cubo_ipc.Cubo(directorio)))
+    # La serie nacional que se publica en el almacén, con la misma estimación
+    if nuevo or pronostico.cargar(directorio, pronostico.ARCHIVO_NACIONAL) is None:
+        pronostico.guardar(directorio, pronostico.ajustar(*serie_nacional(tabla)), pronostico.ARCHIVO_NACIONAL)
+    if nuevo:
+        reemplazar_cubo(directorio, cubo)
+    print(f"Cubo geografía × clase × mes: {cubo}")
+    print("Incidencias, medidas de inflación subyacente y pronósticos guardados junto al cubo")
+
+    # El almacén nacional y el puntero se actualizan al final, con el cubo ya completo
+    cambio = actualizar_almacen_nacional(tabla)
+    print("Almacén nacional actualizado" if cambio else "Almacén nacional sin cambios")
+    publicar(huella, destino)
+    print(f"Ingesta publicada: {PUNTERO}")
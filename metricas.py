@@ -0,0 +1,138 @@
+"""Instrumentación opcional de callbacks con salida en formato Prometheus.
+
+Se activa con ``IPC_METRICAS=1``. Cada callback instrumentado registra su
+tiempo total, el tiempo de sus fases (filtrado de datos y construcción de la
+figura) y el tamaño de la respuesta que envía Dash (leído de la respuesta ya
+serializada, sin volver a serializarla). ``/metrics`` expone los
+histogramas y los contadores de la caché de figuras. Con la variable
+desactivada el decorador devuelve la función sin tocar y las fases no miden.
+
+Los registros son por proceso: con varios workers de gunicorn cada uno
+expone sus propias métricas.
+"""
+
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+ACTIVAS = os.environ.get("IPC_METRICAS", "0") == "1"
+
+BUCKETS_SEGUNDOS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+BUCKETS_BYTES = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Histograma:
+    def __init__(self, nombre, ayuda, etiquetas, buckets):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = etiquetas
+        self.buckets = buckets
+        self._series = {}
+        self._candado = threading.Lock()
+
+    def observar(self, valor, *valores_etiquetas):
+        with self._candado:
+            conteos, suma = self._series.get(valores_etiquetas, ([0] * (len(self.buckets) + 1), 0.0))
+            conteos[bisect_left(self.buckets, valor)] += 1
+            self._series[valores_etiquetas] = (conteos, suma + valor)
+
+    def exponer(self):
+        lineas = [f"# HELP {self.nombre} {self.ayuda}", f"# TYPE {self.nombre} histogram"]
+        with self._candado:
+            series = {clave: (list(conteos), suma) for clave, (conteos, suma) in self._series.items()}
+        for valores_etiquetas, (conteos, suma) in sorted(series.items()):
+            base = ",".join(f'{e}="{v}"' for e, v in zip(self.etiquetas, valores_etiquetas))
+            acumulado = 0
+            for limite, conteo in zip(self.buckets + ("+Inf",), conteos):
+                acumulado += conteo
+                lineas.append(f'{self.nombre}_bucket{{{base},le="{limite}"}} {acumulado}')
+            lineas.append(f"{self.nombre}_sum{{{base}}} {suma}")
+            lineas.append(f"{self.nombre}_count{{{base}}} {acumulado}")
+        return lineas
+
+
+DURACION = Histograma("ipc_callback_duracion_segundos", "Tiempo total del callback",
+                      ("callback",), BUCKETS_SEGUNDOS)
+FASES = Histograma("ipc_callback_fase_segundos", "Tiempo por fase dentro del callback",
+                   ("callback", "fase"), BUCKETS_SEGUNDOS)
+RESPUESTA = Histograma("ipc_callback_respuesta_bytes", "Tamaño de la respuesta serializada",
+                       ("callback",), BUCKETS_BYTES)
+
+# Funciones sin argumentos que devuelven {nombre_metrica: (tipo, ayuda, valor)}
+_fuentes = []
+
+
+def _marcar_peticion(nombre):
+    # El tamaño se lee de la respuesta que Dash ya serializó (ver ``registrar_endpoint``): el callback
+    # solo deja su nombre en la petición
+    from flask import g, has_request_context
+
+    if has_request_context():
+        g.callback_instrumentado = nombre
+
+
+def instrumentar(nombre):
+    def decorador(funcion):
+        if not ACTIVAS:
+            return funcion
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            inicio = time.perf_counter()
+            resultado = funcion(*args, **kwargs)
+            DURACION.observar(time.perf_counter() - inicio, nombre)
+            _marcar_peticion(nombre)
+            return resultado
+        return envoltura
+    return decorador
+
+
+@contextmanager
+def fase(callback, nombre):
+    if not ACTIVAS:
+        yield
+        return
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        FASES.observar(time.perf_counter() - inicio, callback, nombre)
+
+
+def registrar_fuente(fuente):
+    _fuentes.append(fuente)
+
+
+def exponer():
+    lineas = []
+    for histograma in (DURACION, FASES, RESPUESTA):
+        lineas += histograma.exponer()
+    for fuente in _fuentes:
+        for nombre, (tipo, ayuda, valor) in fuente().items():
+            lineas += [f"# HELP {nombre} {ayuda}", f"# TYPE {nombre} {tipo}", f"{nombre} {valor}"]
+    return "\n".join(lineas) + "\n"
+
+
+def registrar_endpoint(server, ruta="/metrics"):
+    """Registra ``ruta`` y la medición del tamaño de las respuestas de los callbacks instrumentados.
+
+    Flask ejecuta los ``after_request`` en orden inverso al de registro: si se
+    llama después de registrar la compresión, se mide el cuerpo sin comprimir.
+    """
+    if not ACTIVAS:
+        return
+
+    from flask import Response, g
+
+    def medir_respuesta(respuesta):
+        nombre = g.pop("callback_instrumentado", None)
+        tamano = None if nombre is None or respuesta.direct_passthrough else respuesta.calculate_content_length()
+        if tamano is not None:
+            RESPUESTA.observar(tamano, nombre)
+        return respuesta
+
+    server.after_request(medir_respuesta)
+    server.add_url_rule(ruta, "metricas", lambda: Response(exponer(), mimetype="text/plain; version=0.0.4"))
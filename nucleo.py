@@ -0,0 +1,145 @@
+"""Medidas de inflación subyacente a partir de los componentes ponderados del IPC.
+
+Cada medida resume en un solo número por mes la distribución de las
+variaciones anuales de los componentes (filas de la matriz componentes ×
+meses), con el peso efectivo de cada componente en la variación general:
+
+    peso_i,t = w_i · I_i,t−12 / Σ_j w_j · I_j,t−12
+
+* ``sin_alimentos``: media ponderada sin los componentes de ``EXCLUIDOS``.
+* ``mediana``: mediana ponderada (la variación en la que el peso acumulado
+  alcanza la mitad).
+* ``media_recortada``: media ponderada sin el ``RECORTE`` del peso en cada
+  cola; un componente que cruza el corte entra con la fracción de su peso que
+  queda dentro.
+
+Todos los meses se resuelven a la vez: se ordenan las variaciones de cada
+mes (``argsort`` sobre el eje de componentes de la matriz traspuesta), se
+acumulan los pesos en ese orden y el resto son operaciones sobre la matriz,
+sin bucles por mes. El coste crece como componentes · log(componentes) · meses.
+
+Las ponderaciones publicadas son las de las doce divisiones CCIF (las mismas
+de ``incidencias.py``), así que los componentes son las divisiones: los
+libros no traen ponderaciones por grupo o clase ni un agregado de energía,
+por eso la medida de exclusión solo quita los alimentos (división 01). Con
+una media recortada sin recorte el resultado es la variación anual general,
+lo que ``verificar`` comprueba. Se calcula en la ingesta y se guarda junto al
+cubo (``nucleo.npz``).
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+import artefactos
+import indicadores
+
+# Nombre de cada medida: etiqueta en el gráfico
+MEDIDAS = {
+    "sin_alimentos": "Sin alimentos (%)",
+    "mediana": "Mediana ponderada (%)",
+    "media_recortada": "Media recortada (%)",
+}
+EXCLUIDOS = ("01",)
+RECORTE = 0.10  # fracción del peso descartada en cada cola
+ARCHIVO = "nucleo.npz"
+TOLERANCIA = 1e-6  # puntos porcentuales
+
+Nucleo = namedtuple("Nucleo", ["ordinales", *MEDIDAS])
+
+
+def pesos_efectivos(pesos, indices, desfase=12):
+    """Variaciones (meses × componentes, en %) y peso de cada una en la variación general.
+
+    ``indices`` viene como componentes × meses; el resultado se traspone una vez
+    para que cada mes sea una fila contigua y ordenar por mes recorra memoria
+    consecutiva.
+    """
+    indices = np.ascontiguousarray(np.asarray(indices, dtype=np.float64).T)
+    variaciones = np.full(indices.shape, np.nan)
+    efectivos = np.zeros(indices.shape)
+    previos = indices[:-desfase]
+    variaciones[desfase:] = (indices[desfase:] / previos - 1) * 100
+    efectivos[desfase:] = np.where(np.isnan(variaciones[desfase:]), 0.0, previos * np.asarray(pesos))
+    total = efectivos.sum(axis=1, keepdims=True)
+    np.divide(efectivos, total, out=efectivos, where=total > 0)
+    return variaciones, efectivos
+
+
+def ordenar(variaciones, efectivos):
+    """Variaciones de cada mes en orden creciente, sus pesos y los pesos acumulados.
+
+    Los NaN quedan al final con peso 0. La mediana y la media recortada de los
+    mismos datos comparten esta ordenación.
+    """
+    orden = np.argsort(variaciones, axis=1)
+    ordenadas = np.nan_to_num(np.take_along_axis(variaciones, orden, axis=1))
+    pesos = np.take_along_axis(efectivos, orden, axis=1)
+    return ordenadas, pesos, np.cumsum(pesos, axis=1)
+
+
+def media_ponderada(variaciones, efectivos, excluir=None):
+    """Media ponderada de cada mes, sin los componentes marcados en ``excluir``."""
+    if excluir is not None:
+        efectivos = np.where(np.asarray(excluir), 0.0, efectivos)
+    total = efectivos.sum(axis=1)
+    suma = (np.nan_to_num(variaciones) * efectivos).sum(axis=1)
+    return np.divide(suma, total, out=np.full(total.shape, np.nan), where=total > 0)
+
+
+def mediana_ponderada(ordenadas, pesos, acumulados):
+    # Primer componente cuyo peso acumulado alcanza la mitad del total del mes
+    total = acumulados[:, -1]
+    posicion = np.argmax(acumulados >= total[:, None] * 0.5, axis=1)
+    mediana = ordenadas[np.arange(len(ordenadas)), posicion]
+    return np.where(total > 0, mediana, np.nan)
+
+
+def media_recortada(ordenadas, pesos, acumulados, recorte=RECORTE):
+    # Fracción del peso de cada componente entre los cortes [recorte, 1 − recorte] del total
+    total = acumulados[:, -1:]
+    dentro = np.minimum(acumulados, total * (1 - recorte))
+    dentro -= np.maximum(acumulados - pesos, total * recorte)
+    np.maximum(dentro, 0.0, out=dentro)
+    suma_dentro = dentro.sum(axis=1)
+    return np.divide((ordenadas * dentro).sum(axis=1), suma_dentro,
+                     out=np.full(suma_dentro.shape, np.nan), where=(total[:, 0] > 0) & (suma_dentro > 0))
+
+
+def calcular(componentes, pesos, indices, desfase=12, recorte=RECORTE):
+    """Cada medida de ``MEDIDAS`` para todos los meses de ``indices`` (componentes × meses)."""
+    variaciones, efectivos = pesos_efectivos(pesos, indices, desfase)
+    ordenado = ordenar(variaciones, efectivos)
+    return {
+        "sin_alimentos": media_ponderada(variaciones, efectivos, np.isin(componentes, EXCLUIDOS)),
+        "mediana": mediana_ponderada(*ordenado),
+        "media_recortada": media_recortada(*ordenado, recorte),
+    }
+
+
+def verificar(ordinales, pesos, indices, general):
+    # Sin recorte, la media recortada reproduce la variación anual del índice general
+    sin_recorte = media_recortada(*ordenar(*pesos_efectivos(pesos, indices)), 0.0)
+    residuo = np.abs(sin_recorte - indicadores.calcular(ordinales, general)["anual"][0])
+    if np.nanmax(residuo, initial=0.0) > TOLERANCIA:
+        raise ValueError(f"La media ponderada de los componentes no reproduce la variación anual "
+                         f"(residuo máximo {np.nanmax(residuo):.2e} pp)")
+
+
+def construir(cubo, incidencias):
+    # Componentes y ponderaciones de las incidencias (divisiones desde el mes base de las ponderaciones)
+    base = int(np.searchsorted(cubo.ordinales, incidencias.ordinales[0]))
+    componentes = incidencias.divisiones.tolist()
+    indices = np.stack([cubo.serie("Nacional", c)[base:] for c in componentes])
+    general = np.array(cubo.serie("Nacional")[base:])
+    verificar(incidencias.ordinales, incidencias.pesos, indices, general)
+    return Nucleo(ordinales=incidencias.ordinales, **calcular(componentes, incidencias.pesos, indices))
+
+
+def guardar(directorio, nucleo):
+    artefactos.guardar(directorio, ARCHIVO, nucleo)
+
+
+def cargar(directorio):
+    # Medidas guardadas junto al cubo, o None si la ingesta no las generó
+    return artefactos.cargar(directorio, ARCHIVO, Nucleo)
@@ -0,0 +1,154 @@
+"""Pronóstico a 12 meses de todas las series del IPC, con intervalos de predicción.
+
+Cada serie se modela sobre su variación mensual logarítmica
+y_t = log I_t − log I_t−1 con un efecto fijo por mes del año y un término
+autorregresivo:
+
+    y_t = s_mes(t) + φ · y_t−1 + ε_t,    ε_t ~ N(0, σ²)
+
+estimado por mínimos cuadrados sobre los últimos ``VENTANA`` meses. Todas
+las series (filas de la matriz series × meses) se ajustan a la vez: las
+ecuaciones normales de cada una se apilan en un arreglo (series × 13 × 13)
+y se resuelven con un solo ``np.linalg.solve`` por lotes, sin bucles por serie; los
+meses sin dato entran con peso 0. El pronóstico se encadena mes a mes para
+todas las series a la vez y el error del nivel en el horizonte h acumula
+los choques con los pesos c_m = 1 + φ + … + φ^m:
+
+    Var[log I_T+h] = σ² · Σ_{m<h} c_m²
+
+Los intervalos no incluyen la incertidumbre de los parámetros. Las series
+con menos de ``MIN_OBSERVACIONES`` meses útiles quedan sin pronóstico (NaN).
+
+El resultado se guarda como cociente I_T+h / I_T respecto al último mes
+observado de cada serie, así que vale igual para la serie rebasada. Todo se
+ajusta en la ingesta: las series del cubo (``pronostico.npz``) y la serie
+nacional que la ingesta publica en el almacén (``pronostico_nacional.npz``),
+ambos junto al cubo. Ni la carga de datos ni las peticiones ajustan modelos.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+import artefactos
+
+HORIZONTE = 12
+VENTANA = 120  # meses de variaciones usados en la estimación
+MIN_OBSERVACIONES = 36
+CRESTA = 1e-10
+ARCHIVO = "pronostico.npz"
+ARCHIVO_NACIONAL = "pronostico_nacional.npz"
+Z = {"80": 1.2815515655446004, "95": 1.959963984540054}
+
+# ultimo: ordinal del último mes observado de cada serie (−1 sin datos); el resto, series × HORIZONTE
+Pronostico = namedtuple("Pronostico", ["ultimo", "media", "inferior_80", "superior_80", "inferior_95", "superior_95"])
+
+
+def _ultimas_posiciones(validos):
+    # Posición de la última columna válida de cada fila (−1 si no hay ninguna)
+    n = validos.shape[1]
+    ultima = n - 1 - np.argmax(validos[:, ::-1], axis=1)
+    return np.where(validos.any(axis=1), ultima, -1)
+
+
+def estimar(ordinales, variaciones):
+    """Coeficientes (series × 13: 12 meses y φ), σ² y observaciones de cada serie.
+
+    ``variaciones`` es la matriz series × meses de y_t y ``ordinales`` el mes
+    de cada columna.
+    """
+    y, previo = variaciones[:, 1:], variaciones[:, :-1]
+    pesos = np.isfinite(y) & np.isfinite(previo)
+    diseno = np.zeros(y.shape + (13,))
+    diseno[:, :, :12] = np.eye(12)[np.asarray(ordinales[1:]) % 12]
+    diseno[:, :, 12] = np.nan_to_num(previo)
+    diseno *= pesos[:, :, None]
+    objetivo = np.where(pesos, y, 0.0)
+
+    # Ecuaciones normales de todas las series con un producto matricial por lotes; el término de cresta
+    # resuelve las series o meses sin datos (coeficiente 0) sin cambiar en la práctica el resto
+    traspuesto = diseno.transpose(0, 2, 1)
+    normales = traspuesto @ diseno + CRESTA * np.eye(13)
+    coeficientes = np.linalg.solve(normales, traspuesto @ objetivo[:, :, None])
+    residuos = objetivo - (diseno @ coeficientes)[:, :, 0]
+    coeficientes = coeficientes[:, :, 0]
+    observaciones = pesos.sum(axis=1)
+    sigma2 = (residuos ** 2).sum(axis=1) / np.maximum(observaciones - 13, 1)
+    return coeficientes, sigma2, observaciones
+
+
+def ajustar(ordinales, indices, ventana=VENTANA, horizonte=HORIZONTE):
+    """Pronóstico de cada fila de ``indices`` (series × meses consecutivos)."""
+    ordinales = np.asarray(ordinales, dtype=np.int64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        logs = np.log(np.atleast_2d(np.asarray(indices, dtype=np.float64)))
+    variaciones = np.full(logs.shape, np.nan)
+    variaciones[:, 1:] = np.diff(logs, axis=1)
+    inicio = max(logs.shape[1] - ventana - 1, 0)
+    coeficientes, sigma2, observaciones = estimar(ordinales[inicio:], variaciones[:, inicio:])
+    estacional, phi = coeficientes[:, :12], coeficientes[:, 12]
+
+    # Se encadena desde el último mes observado de cada serie
+    filas = np.arange(len(logs))
+    ultima = _ultimas_posiciones(np.isfinite(logs))
+    anterior = variaciones[filas, ultima]
+    validas = (ultima >= 0) & (observaciones >= MIN_OBSERVACIONES) & np.isfinite(anterior)
+    ultimo = np.where(ultima >= 0, ordinales[ultima], -1)
+    medias = np.empty((len(logs), horizonte))
+    for h in range(horizonte):
+        anterior = estacional[filas, (ultimo + h + 1) % 12] + phi * anterior
+        medias[:, h] = anterior
+    log_media = np.cumsum(medias, axis=1)
+    pesos_choques = np.cumsum(phi[:, None] ** np.arange(horizonte), axis=1)
+    desvio = np.sqrt(sigma2[:, None] * np.cumsum(pesos_choques ** 2, axis=1))
+
+    def cociente(valores):
+        return np.where(validas[:, None], np.exp(valores), np.nan)
+
+    return Pronostico(
+        ultimo=ultimo.astype(np.int32),
+        media=cociente(log_media),
+        **{f"{lado}_{nivel}": cociente(log_media + signo * z * desvio)
+           for nivel, z in Z.items() for lado, signo in (("inferior", -1), ("superior", 1))},
+    )
+
+
+def evaluar(ordinales, indices, horizonte=HORIZONTE):
+    """Error del pronóstico sobre los últimos ``horizonte`` meses, ajustando sin ellos.
+
+    Devuelve el error porcentual absoluto medio del nivel (modelo y, como
+    referencia, sin cambio respecto al último mes), en el horizonte 1 y en el
+    último, y la cobertura de los intervalos.
+    """
+    indices = np.atleast_2d(np.asarray(indices, dtype=np.float64))
+    reales = indices[:, -horizonte:]
+    pronostico = ajustar(ordinales[:-horizonte], indices[:, :-horizonte], horizonte=horizonte)
+    base = indices[:, -horizonte - 1:-horizonte]
+    evaluables = np.isfinite(pronostico.media).all(axis=1) & np.isfinite(reales).all(axis=1) & np.isfinite(base[:, 0])
+    reales, base = reales[evaluables], base[evaluables]
+    error = np.abs(base * pronostico.media[evaluables] / reales - 1) * 100
+    sin_cambio = np.abs(base / reales - 1) * 100
+    resultado = {"series": int(evaluables.sum())}
+    for h in (1, horizonte):
+        resultado[f"error_h{h}"] = float(error[:, h - 1].mean())
+        resultado[f"error_sin_cambio_h{h}"] = float(sin_cambio[:, h - 1].mean())
+    for nivel in Z:
+        dentro = ((base * getattr(pronostico, f"inferior_{nivel}")[evaluables] <= reales)
+                  & (reales <= base * getattr(pronostico, f"superior_{nivel}")[evaluables]))
+        resultado[f"cobertura_{nivel}"] = float(dentro.mean())
+    return resultado
+
+
+def construir(cubo):
+    # Todas las series del cubo (geografía · clase) en una sola estimación
+    indices = cubo.datos["indice"].reshape(-1, len(cubo.ordinales))
+    return ajustar(cubo.ordinales, indices)
+
+
+def guardar(directorio, pronostico, archivo=ARCHIVO):
+    artefactos.guardar(directorio, archivo, pronostico)
+
+
+def cargar(directorio, archivo=ARCHIVO):
+    # Pronósticos guardados junto al cubo, o None si la ingesta no los generó
+    return artefactos.cargar(directorio, archivo, Pronostico)
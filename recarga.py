@@ -0,0 +1,107 @@
+"""Recarga en caliente de los datos sin reiniciar el servidor.
+
+``Recargador`` guarda la instantánea de datos vigente y la reemplaza cuando
+cambia la huella de los artefactos (``mtime``, tamaño e inodo de los archivos
+que escriben la ingesta y ``agregar_meses``). La huella se revisa como mucho
+una vez por intervalo, en el hilo de la petición que lo detecta; mientras ese
+hilo carga la instantánea nueva, los demás siguen sirviendo la anterior.
+
+Los lectores no toman candados: la instantánea nueva se construye completa y
+se publica con una sola asignación, así que un callback que obtuvo la suya al
+empezar la sigue viendo entera aunque entre tanto se publique otra. Si la
+carga falla (por ejemplo, una ingesta a medio escribir) se conserva la
+instantánea anterior y se reintenta en la siguiente revisión.
+"""
+
+import logging
+import os
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+
+def huella_archivos(rutas):
+    # (mtime, tamaño, inodo) de cada ruta, o None si no existe; reemplazar un archivo con
+    # os.replace cambia el inodo aunque el mtime coincida
+    huella = []
+    for ruta in rutas:
+        try:
+            st = os.stat(ruta)
+        except OSError:
+            huella.append(None)
+        else:
+            huella.append((st.st_mtime_ns, st.st_size, st.st_ino))
+    return tuple(huella)
+
+
+class Recargador:
+    """Instantánea vigente de ``cargar()``, recargada cuando cambia ``huella()``.
+
+    ``intervalo`` son los segundos mínimos entre revisiones (0 o negativo
+    desactiva la recarga automática). ``al_publicar`` recibe cada instantánea
+    nueva después de publicarla (p. ej. para vaciar cachés).
+    """
+
+    def __init__(self, cargar, huella, intervalo=5.0, al_publicar=None):
+        self._cargar = cargar
+        self._huella = huella
+        self.intervalo = intervalo
+        self._al_publicar = al_publicar
+        # (huella, instantánea) en una sola referencia: se leen y se reemplazan juntas
+        self._publicada = None
+        self._proxima_revision = 0.0
+        self._candado = threading.Lock()
+        self.recargas = 0
+        self.errores = 0
+
+    def actual(self):
+        publicada = self._publicada
+        if publicada is None:
+            return self._primera_carga()
+        if self.intervalo > 0 and time.monotonic() >= self._proxima_revision:
+            self._revisar(publicada[0])
+            publicada = self._publicada
+        return publicada[1]
+
+    def vigente(self):
+        # La instantánea publicada sin revisar la huella (None antes de la primera carga); p. ej. para
+        # que ``cargar`` reutilice lo que no cambió
+        publicada = self._publicada
+        return None if publicada is None else publicada[1]
+
+    def _primera_carga(self):
+        with self._candado:
+            if self._publicada is None:
+                huella = self._huella()
+                self._asignar(huella, self._cargar())
+        return self._publicada[1]
+
+    def _revisar(self, huella_publicada):
+        # Solo un hilo revisa; los demás no esperan y siguen con la instantánea publicada
+        if not self._candado.acquire(blocking=False):
+            return
+        try:
+            self._proxima_revision = time.monotonic() + self.intervalo
+            # La huella se toma antes de cargar: un cambio durante la carga provoca otra recarga
+            huella = self._huella()
+            if huella != huella_publicada:
+                self._asignar(huella, self._cargar())
+                self.recargas += 1
+        except Exception:
+            self.errores += 1
+            log.exception("No se pudo recargar los datos; se mantiene la instantánea anterior")
+        finally:
+            self._candado.release()
+
+    def publicar(self, instantanea):
+        # Publicación explícita (p. ej. tras una actualización hecha por este mismo proceso)
+        with self._candado:
+            self._asignar(self._huella(), instantanea)
+            self.recargas += 1
+
+    def _asignar(self, huella, instantanea):
+        self._publicada = (huella, instantanea)
+        self._proxima_revision = time.monotonic() + self.intervalo
+        if self._al_publicar is not None:
+            self._al_publicar(instantanea)
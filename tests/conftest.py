@@ -0,0 +1,36 @@
+import base64
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Los módulos del dashboard viven en la raíz del repositorio
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Las pruebas que importan app no usan la caché compartida de datos/cache, el pool ni la recarga automática
+os.environ.setdefault("IPC_CACHE_COMPARTIDA", "")
+os.environ.setdefault("IPC_PROCESOS_FIGURAS", "0")
+os.environ.setdefault("IPC_INTERVALO_RECARGA", "0")
+
+
+def tabla_pandas(meses, ipc):
+    # La tabla de la versión original del dashboard: año y variación anual calculados con pandas
+    df = pd.DataFrame({"Mes": meses, "IPC": ipc})
+    df["Año"] = df["Mes"].dt.year
+    df["anual"] = df["IPC"].div(df["IPC"].shift(12)).subtract(1).multiply(100)
+    return df
+
+
+def decodificar(arreglo):
+    # Arreglo de NumPy de una traza serializada en binario (``bdata``)
+    return np.frombuffer(base64.b64decode(arreglo["bdata"]), dtype=arreglo["dtype"])
+
+
+@pytest.fixture
+def df():
+    # Paseo aleatorio mensual de 2006 a mediados de 2025, como la serie nacional
+    fechas = pd.date_range("2006-01-01", "2025-06-01", freq="MS")
+    rng = np.random.default_rng(11)
+    return tabla_pandas(fechas, 80 * np.exp(np.cumsum(rng.normal(0.002, 0.004, len(fechas)))))
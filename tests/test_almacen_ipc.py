@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from almacen_ipc import agregar_meses, cargar_serie, escribir_serie, fechas_a_ordinales, ordinal, ordinales_a_fechas
+
+
+@pytest.fixture
+def almacen(tmp_path):
+    meses = np.arange(ordinal(2020, 1), ordinal(2022, 1))
+    valores = 100 + np.arange(len(meses)) * 0.5
+    escribir_serie(tmp_path, meses, valores)
+    return tmp_path, pd.Series(valores, index=meses)
+
+
+def test_agregar_meses_igual_que_reescribir(almacen, tmp_path_factory):
+    directorio, serie = almacen
+    # Revisa dos meses existentes y añade tres nuevos, en desorden
+    meses = [ordinal(2022, 2), ordinal(2020, 3), ordinal(2022, 1), ordinal(2021, 12), ordinal(2022, 3)]
+    valores = [120.0, 99.0, 119.5, 118.0, 121.25]
+    agregar_meses(directorio, meses, valores)
+
+    esperada = serie.copy()
+    for mes, valor in zip(meses, valores):
+        esperada.loc[mes] = valor
+    esperada = esperada.sort_index()
+
+    actualizada = cargar_serie(directorio)
+    assert actualizada.meses.tolist() == esperada.index.tolist()
+    assert actualizada.valores.tolist() == esperada.tolist()
+
+    # El mismo resultado que reescribir la serie entera
+    completo = tmp_path_factory.mktemp("completo")
+    escribir_serie(completo, esperada.index, esperada.values)
+    reescrita = cargar_serie(completo)
+    assert np.array_equal(actualizada.meses, reescrita.meses)
+    assert np.array_equal(actualizada.valores, reescrita.valores)
+
+
+def test_agregar_meses_errores(almacen):
+    directorio, serie = almacen
+    with pytest.raises(ValueError):
+        agregar_meses(directorio, [ordinal(2022, 1), ordinal(2022, 1)], [1.0, 2.0])
+    with pytest.raises(ValueError):
+        agregar_meses(directorio, [ordinal(2019, 12)], [1.0])
+    # Un hueco tras el último mes, o entre los nuevos, desplazaría los indicadores
+    with pytest.raises(ValueError):
+        agregar_meses(directorio, [ordinal(2022, 2)], [1.0])
+    with pytest.raises(ValueError):
+        agregar_meses(directorio, [ordinal(2021, 6), ordinal(2022, 1), ordinal(2022, 3)], [1.0, 2.0, 3.0])
+    assert cargar_serie(directorio).valores.tolist() == serie.tolist()
+
+
+def test_revision(almacen):
+    directorio, _ = almacen
+    revision = cargar_serie(directorio).revision
+    escribir_serie(directorio, [ordinal(2020, 1)], [100.0])
+    assert cargar_serie(directorio).revision == revision + 1
+
+
+def test_ordinales_y_fechas():
+    fechas = pd.date_range("1999-11-01", periods=30, freq="MS")
+    ordinales = fechas_a_ordinales(fechas.values)
+    assert ordinales.tolist() == [f.year * 12 + f.month - 1 for f in fechas]
+    assert (ordinales_a_fechas(ordinales) == fechas.values).all()
@@ -0,0 +1,157 @@
+import gzip
+import io
+
+import numpy as np
+import pytest
+from flask import Flask
+
+import api
+import compresion
+from calculadora import TablaPeriodos
+from indice_meses import SerieIndexada
+
+ORDINALES = np.arange(2020 * 12, 2025 * 12)
+INDICES = 100 * 1.004 ** np.arange(len(ORDINALES))
+
+
+class Instantanea:
+    def __init__(self, version):
+        self.version = version
+
+    def obtener_serie(self, geografia="Nacional", clase="0", base=None):
+        if (geografia, clase) != ("Nacional", "0"):
+            raise KeyError(geografia)
+        anual = np.full(len(INDICES), np.nan)
+        anual[12:] = (INDICES[12:] / INDICES[:-12] - 1) * 100
+        return SerieIndexada(ORDINALES, IPC=INDICES, anual=anual)
+
+    def tabla_periodos(self, geografia="Nacional", clase="0"):
+        self.obtener_serie(geografia, clase)
+        return TablaPeriodos(ORDINALES, INDICES)
+
+    def dimensiones(self):
+        return {"geografias": ["Nacional"], "clases": ["0"]}
+
+    def ultimo(self):
+        return {"fecha": "2024-12", "IPC": float(INDICES[-1])}
+
+
+def cliente(instantanea):
+    server = Flask(__name__)
+    api.registrar_api(server, instantanea, ["anual"])
+    return server.test_client()
+
+
+@pytest.fixture
+def c():
+    return cliente(lambda: Instantanea("v1"))
+
+
+def test_200_y_304(c):
+    r = c.get("/api/v1/series?desde=2024-01&hasta=2024-12")
+    assert r.status_code == 200
+    datos = r.get_json()
+    assert datos["version"] == "v1" and len(datos["datos"]["fecha"]) == 12
+    assert datos["datos"]["IPC"] == pytest.approx(INDICES[-12:].tolist())
+    etiqueta = r.headers["ETag"]
+
+    r = c.get("/api/v1/series?desde=2024-01&hasta=2024-12", headers={"If-None-Match": etiqueta})
+    assert r.status_code == 304 and r.data == b"" and r.headers["ETag"] == etiqueta
+
+    # Otra consulta u otra versión de datos: otro ETag
+    assert c.get("/api/v1/series?desde=2023-01", headers={"If-None-Match": etiqueta}).status_code == 200
+    otra = cliente(lambda: Instantanea("v2"))
+    assert otra.get("/api/v1/series?desde=2024-01&hasta=2024-12", headers={"If-None-Match": etiqueta}).status_code == 200
+
+
+def test_una_instantanea_por_peticion():
+    # Aunque se publique una versión a mitad de la petición, ETag y cuerpo usan la misma
+    versiones = iter(f"v{i}" for i in range(100))
+    c = cliente(lambda: Instantanea(next(versiones)))
+    for ruta in ("/api/v1/series", "/api/v1/ultimo", "/api/v1/dimensiones", "/api/v1/inflacion?desde=2020-01&hasta=2024-12"):
+        r = c.get(ruta)
+        assert r.status_code == 200
+        assert r.headers["ETag"].strip('"').startswith(r.get_json()["version"] + "-")
+
+
+def test_inflacion(c):
+    r = c.get("/api/v1/inflacion?desde=2020-01&hasta=2024-12&monto=100")
+    datos = r.get_json()
+    assert datos["factor"] == pytest.approx(INDICES[-1] / INDICES[0])
+    assert datos["monto_ajustado"] == pytest.approx(100 * INDICES[-1] / INDICES[0])
+    assert c.get("/api/v1/inflacion?geografia=Quito&desde=2020-01&hasta=2024-12").status_code == 404
+    assert c.get("/api/v1/inflacion?desde=2020-01").status_code == 400
+
+
+def test_errores(c):
+    assert c.get("/api/v1/series?geografia=Quito").status_code == 404
+    assert c.get("/api/v1/series?indicadores=nada").status_code == 400
+    assert c.get("/api/v1/series?formato=xml").status_code == 400
+
+
+def test_csv(c):
+    r = c.get("/api/v1/series?desde=2024-11&hasta=2024-12&formato=csv&indicadores=anual")
+    lineas = r.data.decode().splitlines()
+    assert lineas[0] == "fecha,IPC,anual"
+    assert [l.split(",")[0] for l in lineas[1:]] == ["2024-11-01", "2024-12-01"]
+    assert float(lineas[-1].split(",")[1]) == INDICES[-1]
+
+
+def test_arrow(c, monkeypatch):
+    pa = pytest.importorskip("pyarrow")
+    r = c.get("/api/v1/series?formato=arrow")
+    assert r.status_code == 200
+    tabla = pa.ipc.open_stream(r.data).read_all()
+    assert tabla.column_names == ["fecha", "IPC", "anual"]
+    assert tabla.column("IPC").to_pylist() == INDICES.tolist()
+
+    # Sin pyarrow, el formato arrow se rechaza y los demás siguen disponibles
+    monkeypatch.setattr(api, "pa", None)
+    assert c.get("/api/v1/series?formato=arrow").status_code == 406
+    assert c.get("/api/v1/series?formato=csv").status_code == 200
+
+
+def test_compresion(c, monkeypatch):
+    sin_comprimir = c.get("/api/v1/series").data
+    assert len(sin_comprimir) >= compresion.TAMANO_MIN_COMPRESION
+
+    r = c.get("/api/v1/series", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["Content-Encoding"] == "gzip" and gzip.decompress(r.data) == sin_comprimir
+
+    brotli = pytest.importorskip("brotli")
+    r = c.get("/api/v1/series", headers={"Accept-Encoding": "gzip, br"})
+    assert r.headers["Content-Encoding"] == "br" and brotli.decompress(r.data) == sin_comprimir
+    etiqueta_br = r.headers["ETag"]
+
+    # Sin brotli se responde con gzip y con otro ETag
+    monkeypatch.setattr(compresion, "brotli", None)
+    r = c.get("/api/v1/series", headers={"Accept-Encoding": "gzip, br", "If-None-Match": etiqueta_br})
+    assert r.status_code == 200 and r.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(r.data) == sin_comprimir
+
+
+def test_lote_csv(c):
+    cuerpo = "desde,hasta,monto\n2020-01,2024-12,100\n2019-01,2024-12,100\n"
+    r = c.post("/api/v1/inflacion", data=cuerpo, content_type="text/csv")
+    filas = r.data.decode().splitlines()
+    assert r.status_code == 200 and len(filas) == 3
+    assert float(filas[1].split(",")[-2]) == pytest.approx(100 * INDICES[-1] / INDICES[0])
+    assert filas[2].split(",")[-1] != ""
+    r = c.post("/api/v1/inflacion", data={"archivo": (io.BytesIO(cuerpo.encode()), "a.csv")})
+    assert r.data.decode().splitlines() == filas
+
+
+def test_umbral_configurado_y_etag_debil():
+    # Con el mismo umbral bajo en la API y en la compresión global, las respuestas pequeñas se comprimen
+    # y la revalidación sigue dando 304 aunque el ETag llegue débil
+    server = Flask(__name__)
+    api.registrar_api(server, lambda: Instantanea("v1"), ["anual"], minimo=10)
+    compresion.registrar_compresion(server, minimo=10)
+    c = server.test_client()
+    r = c.get("/api/v1/ultimo", headers={"Accept-Encoding": "gzip"})
+    assert len(gzip.decompress(r.data)) < compresion.TAMANO_MIN_COMPRESION
+    assert r.headers["Content-Encoding"] == "gzip"
+    etiqueta = r.headers["ETag"]
+    for enviada in (etiqueta, "W/" + etiqueta):
+        r = c.get("/api/v1/ultimo", headers={"Accept-Encoding": "gzip", "If-None-Match": enviada})
+        assert r.status_code == 304
@@ -0,0 +1,158 @@
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from almacen_ipc import escribir_serie
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_importar_no_carga_datos():
+    # Importar app no lee el almacén ni importa pandas: la instantánea se carga al pedirla
+    codigo = "import sys, app; print('pandas' in sys.modules, app.recargador._publicada is None)"
+    salida = subprocess.run([sys.executable, "-c", codigo], cwd=RAIZ, capture_output=True, text=True, check=True,
+                            env=dict(os.environ, IPC_CACHE_COMPARTIDA=""))
+    assert salida.stdout.split() == ["False", "True"]
+
+
+@pytest.mark.skipif(not os.path.exists(os.path.join(RAIZ, "datos", "ipc_nacional", "meta.json")),
+                    reason="sin almacén local")
+def test_wsgi_precarga_antes_de_la_primera_peticion():
+    # Importar wsgi deja cargada la instantánea, el layout y la figura inicial: la primera petición no construye
+    codigo = (
+        "import wsgi, app\n"
+        "app.construir_layout = None\n"
+        "print(app.recargador._publicada is not None, app.cache_figuras.estadisticas()['entradas'],\n"
+        "      wsgi.server.test_client().get('/_dash-layout').status_code)"
+    )
+    salida = subprocess.run([sys.executable, "-c", codigo], cwd=RAIZ, capture_output=True, text=True, check=True,
+                            env=dict(os.environ, IPC_CACHE_COMPARTIDA="", IPC_PRECOMPRIMIR="0"))
+    assert salida.stdout.split() == ["True", "1", "200"]
+
+
+@pytest.fixture
+def d(df, tmp_path, monkeypatch):
+    import app
+
+    # Solo la serie nacional del almacén de prueba, sin el cubo de la ingesta local
+    monkeypatch.setattr(app, "cargar_cubo", lambda: None)
+    escribir_serie(tmp_path, (df["Mes"].dt.year * 12 + df["Mes"].dt.month - 1).to_numpy(), df["IPC"].to_numpy())
+    return app.DatosApp(str(tmp_path))
+
+
+def test_serie_nacional_como_pandas(d, df):
+    nacional = d.series["Nacional"]
+    assert d.anios == sorted(df["Año"].unique().tolist())
+    assert np.array_equal(nacional.fechas, df["Mes"].to_numpy())
+    assert np.allclose(nacional.columnas["anual"], df["anual"], rtol=1e-12, equal_nan=True)
+    assert d.version.endswith("-sin-cubo") and d.pronostico_serie() is None
+
+
+@pytest.mark.parametrize("anios", [[2025], [2006, 2010], list(range(2017, 2022))])
+def test_vista_por_anios_como_pandas(d, df, anios):
+    fechas, columnas = d.series["Nacional"].vista(anios)
+    filtrado = df[df["Año"].isin(anios)].sort_values(by="Mes")
+    assert np.array_equal(fechas, filtrado["Mes"].to_numpy())
+    assert np.allclose(columnas["IPC"], filtrado["IPC"], rtol=0)
+    assert np.allclose(columnas["anual"], filtrado["anual"], rtol=1e-12, equal_nan=True)
+
+
+def test_tarjetas_como_pandas(d, df):
+    ultimo = d.ultimo()
+    assert ultimo["ipc"] == df["IPC"].iloc[-1]
+    assert ultimo["anual"] == pytest.approx(df["anual"].iloc[-1], rel=1e-12)
+    assert ultimo["etiqueta"] == df["Mes"].iloc[-1].strftime("%b-%Y")
+    # Clic en un punto del gráfico: la fila del mes, como el filtro por fecha del DataFrame
+    etiqueta, fila = d.series["Nacional"].fila("2012-07-01")
+    esperada = df[df["Mes"] == pd.Timestamp("2012-07-01")].iloc[0]
+    assert etiqueta == "Jul-2012" and fila["IPC"] == esperada["IPC"]
+    assert fila["anual"] == pytest.approx(esperada["anual"], rel=1e-12)
+
+
+def test_datos_del_modo_cliente_como_pandas(d, df):
+    # Lo que filtra assets/ipc_cliente.js en el navegador: JSON estricto (sin NaN) con la tabla original
+    datos = json.loads(json.dumps(d.datos_cliente(), allow_nan=False))
+    assert datos["fechas"] == df["Mes"].dt.strftime("%Y-%m-%d").tolist()
+    assert datos["anios"] == df["Año"].tolist() and datos["ipc"] == df["IPC"].tolist()
+    assert datos["anual"][:12] == [None] * 12
+    assert np.allclose(datos["anual"][12:], df["anual"].iloc[12:], rtol=1e-12)
+    assert datos["ultimo_anio"] == 2025 and len(datos["etiquetas"]) == len(df)
+
+
+def test_series_rebasadas_acotadas(df, tmp_path, monkeypatch):
+    import app
+
+    monkeypatch.setattr(app, "cargar_cubo", lambda: None)
+    monkeypatch.setattr(app, "SERIES_MAX", 4)
+    meses = (df["Mes"].dt.year * 12 + df["Mes"].dt.month - 1).to_numpy()
+    escribir_serie(tmp_path, meses, df["IPC"].to_numpy())
+    d = app.DatosApp(str(tmp_path))
+    for base in meses[:20]:
+        serie = d.obtener_serie("Nacional", "0", int(base))
+        assert serie.columnas["IPC"][meses.tolist().index(base)] == pytest.approx(100)
+    assert d.series_pedidas.estadisticas()["entradas"] == 4
+    esperado = df["IPC"] / df["IPC"].iloc[19] * 100
+    assert np.allclose(d.obtener_serie("Nacional", "0", int(meses[19])).columnas["IPC"], esperado, rtol=1e-12)
+
+
+def test_actualizar_datos_recalcula_desde_el_primer_mes_tocado(d, df, tmp_path, monkeypatch):
+    import app
+    import indicadores
+    from recarga import Recargador
+
+    recargador = Recargador(lambda: None, lambda: None, 0)
+    recargador.publicar(d)
+    monkeypatch.setattr(app, "recargador", recargador)
+    tramos = []
+    calcular = indicadores.calcular
+    monkeypatch.setattr(indicadores, "calcular", lambda o, x: tramos.append(len(o)) or calcular(o, x))
+
+    # Revisa un mes de 2024 y añade los dos siguientes al último
+    ultimo = int(d.serie.meses[-1])
+    meses = [ultimo - 10, ultimo + 1, ultimo + 2]
+    nuevos = app.actualizar_datos(meses, [150.0, 151.0, 152.0], str(tmp_path))
+    assert recargador.vigente() is nuevos and nuevos.serie.revision == d.serie.revision + 1
+    # Solo el tramo desde el mes revisado, con los 24 meses de contexto
+    assert tramos == [10 + 2 + 1 + indicadores.CONTEXTO]
+
+    completo = indicadores.Indicadores(nuevos.serie.meses, nuevos.serie.valores, 0)
+    for nombre in indicadores.NOMBRES:
+        assert np.allclose(nuevos.indicadores_nacional.valores[nombre], completo.valores[nombre], rtol=1e-13,
+                           equal_nan=True)
+    assert nuevos.ultimo()["ipc"] == 152.0
+
+
+@pytest.fixture
+def cliente(d, monkeypatch):
+    import app
+    from recarga import Recargador
+
+    recargador = Recargador(lambda: None, lambda: None, 0)
+    recargador.publicar(d)
+    monkeypatch.setattr(app, "recargador", recargador)
+    return app.app.server.test_client()
+
+
+def test_callbacks_con_selectores_invalidos(cliente):
+    from benchmarks.micro import peticion_grafico, peticion_tarjetas
+
+    # Una ciudad o clase que no está en los datos vigentes no cambia el gráfico (sin error 500)
+    for serie in [("anual", None, "Sierra", "Atlantis", "0"), ("anual", None, "Nacional", None, "99")]:
+        r = cliente.post("/_dash-update-component", json=peticion_grafico([2024], "selector-anios.value", serie))
+        assert r.status_code == 200 and r.get_json()["response"] == {}
+        r = cliente.post("/_dash-update-component", json=peticion_tarjetas("2024-01-01", serie))
+        assert r.status_code == 200 and r.get_json()["response"]["valor-ipc"]["children"] == "Seleccione punto"
+
+    # Un mes base fuera de la serie vuelve a la base por defecto
+    def figura(serie):
+        r = cliente.post("/_dash-update-component", json=peticion_grafico([2024], "selector-anios.value", serie))
+        assert r.status_code == 200
+        return r.get_json()["response"]["grafico-lineas"]["figure"]
+
+    assert figura(("anual", 1, "Nacional", None, "0")) == figura(("anual", None, "Nacional", None, "0"))
+    assert figura(("no-existe", None, "Nacional", None, "0")) == figura(("anual", None, "Nacional", None, "0"))
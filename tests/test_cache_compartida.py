@@ -0,0 +1,98 @@
+import threading
+import time
+
+import pytest
+
+from cache_compartida import CacheCompartida
+
+
+@pytest.fixture
+def ruta(tmp_path):
+    return str(tmp_path / "figuras.sqlite")
+
+
+def test_compartida_entre_procesos(ruta):
+    # Dos instancias sobre la misma base, como dos workers: lo que construye una lo lee la otra
+    uno, otro = CacheCompartida(ruta), CacheCompartida(ruta)
+    assert uno.obtener_o_construir(("v1", "a"), lambda: "figura") == "figura"
+    assert otro.obtener_o_construir(("v1", "a"), lambda: pytest.fail("no debía construir")) == "figura"
+    assert (uno.fallos, otro.aciertos) == (1, 1)
+    # Otra versión de datos u otro espacio (código) es otra clave
+    assert otro.obtener_o_construir(("v2", "a"), lambda: "nueva") == "nueva"
+    assert CacheCompartida(ruta, espacio="codigo-2").obtener_o_construir(("v1", "a"), lambda: "otra") == "otra"
+
+
+def test_purgar_otras_versiones(ruta):
+    cache = CacheCompartida(ruta)
+    for version in ("v1", "v2"):
+        cache.obtener_o_construir((version, "a"), lambda: b"x" * 10)
+    cache.purgar("v2")
+    assert cache.estadisticas()["entradas"] == 1
+    assert cache.obtener_o_construir(("v2", "a"), lambda: pytest.fail("no debía construir")) == b"x" * 10
+
+
+def test_estampida_una_sola_construccion(ruta):
+    # Mientras un proceso construye una clave, el otro espera su valor en lugar de construirla
+    uno, otro = CacheCompartida(ruta), CacheCompartida(ruta)
+    empezo, seguir = threading.Event(), threading.Event()
+    construcciones = []
+
+    def lenta():
+        construcciones.append("uno")
+        empezo.set()
+        seguir.wait(5)
+        return "figura"
+
+    resultados = {}
+    hilo = threading.Thread(target=lambda: resultados.update(uno=uno.obtener_o_construir(("v1", "a"), lenta)))
+    hilo.start()
+    assert empezo.wait(5)
+    espera = threading.Thread(target=lambda: resultados.update(
+        otro=otro.obtener_o_construir(("v1", "a"), lambda: construcciones.append("otro") or "duplicada")))
+    espera.start()
+    time.sleep(0.05)
+    seguir.set()
+    hilo.join(5)
+    espera.join(5)
+    assert resultados == {"uno": "figura", "otro": "figura"} and construcciones == ["uno"]
+    assert otro.esperas == 1 and otro.fallos == 0
+
+
+def test_reserva_vencida(ruta):
+    # Si quien reservó la clave no la guarda a tiempo (murió o tarda), otro proceso la toma
+    uno, otro = CacheCompartida(ruta, espera=0.05), CacheCompartida(ruta, espera=0.05)
+    clave = '["", "v1", "a"]'
+    assert uno._reservar(uno._conexion(), clave)
+    assert not otro._reservar(otro._conexion(), clave)
+    inicio = time.monotonic()
+    assert otro.obtener_o_construir(("v1", "a"), lambda: "figura") == "figura"
+    assert time.monotonic() - inicio >= 0.04 and otro.fallos == 1
+
+
+def test_error_al_construir_libera_la_reserva(ruta):
+    uno, otro = CacheCompartida(ruta, espera=30), CacheCompartida(ruta, espera=30)
+    with pytest.raises(RuntimeError):
+        uno.obtener_o_construir(("v1", "a"), lambda: (_ for _ in ()).throw(RuntimeError("falla")))
+    # Sin esperar los 30 s de la reserva
+    inicio = time.monotonic()
+    assert otro.obtener_o_construir(("v1", "a"), lambda: "figura") == "figura"
+    assert time.monotonic() - inicio < 1
+
+
+def test_desaloja_las_menos_usadas(ruta, monkeypatch):
+    cache = CacheCompartida(ruta, capacidad_bytes=1000)
+    reloj = iter(range(1, 100))
+    monkeypatch.setattr(time, "time", lambda: float(next(reloj)))
+    for i in range(5):
+        cache.obtener_o_construir(("v1", i), lambda: b"x" * 300)
+    estadisticas = cache.estadisticas()
+    assert estadisticas["bytes"] <= 900 and estadisticas["desalojadas"] == 2
+    # Se conservan las más recientes
+    assert cache.obtener_o_construir(("v1", 4), lambda: pytest.fail("no debía construir")) == b"x" * 300
+
+
+def test_sin_base_construye_sin_cache(tmp_path):
+    # Una ruta que SQLite no puede abrir (un directorio) degrada a construir sin caché
+    cache = CacheCompartida(str(tmp_path))
+    assert cache.obtener_o_construir(("v1", "a"), lambda: "figura") == "figura"
+    assert cache.errores == 1
@@ -0,0 +1,65 @@
+import threading
+import time
+
+import pytest
+
+from cache_compartida import CacheCompartida
+from cache_figuras import CacheFiguras
+
+
+def test_desaloja_la_menos_usada():
+    cache = CacheFiguras(capacidad=2)
+    cache.guardar("a", 1)
+    cache.guardar("b", 2)
+    assert cache.obtener("a") == 1  # "b" pasa a ser la menos usada
+    cache.guardar("c", 3)
+    assert cache.obtener("b") is None
+    assert (cache.obtener("a"), cache.obtener("c")) == (1, 3)
+    assert cache.estadisticas()["entradas"] == 2
+
+
+def test_agrupa_construcciones_simultaneas():
+    cache = CacheFiguras()
+    empezo, seguir = threading.Event(), threading.Event()
+    construcciones = []
+
+    def lenta():
+        construcciones.append(1)
+        empezo.set()
+        seguir.wait(5)
+        return "figura"
+
+    resultados = []
+    hilos = [threading.Thread(target=lambda: resultados.append(cache.obtener_o_construir("a", lenta)))]
+    hilos[0].start()
+    assert empezo.wait(5)
+    hilos += [threading.Thread(target=lambda: resultados.append(cache.obtener_o_construir("a", lenta)))
+              for _ in range(3)]
+    for hilo in hilos[1:]:
+        hilo.start()
+    while cache.estadisticas()["agrupadas"] < 3:
+        time.sleep(0.001)
+    seguir.set()
+    for hilo in hilos:
+        hilo.join(5)
+    assert resultados == ["figura"] * 4 and construcciones == [1]
+    assert cache.obtener_o_construir("a", lambda: pytest.fail("no debía construir")) == "figura"
+
+
+def test_error_al_construir_no_se_guarda():
+    cache = CacheFiguras()
+    with pytest.raises(RuntimeError):
+        cache.obtener_o_construir("a", lambda: (_ for _ in ()).throw(RuntimeError("falla")))
+    assert cache.obtener_o_construir("a", lambda: "figura") == "figura"
+
+
+def test_invalidar_purga_la_compartida(tmp_path):
+    compartida = CacheCompartida(str(tmp_path / "figuras.sqlite"))
+    cache = CacheFiguras(compartida=compartida)
+    cache.obtener_o_construir(("v1", "a"), lambda: "vieja")
+    cache.invalidar("v2")
+    assert cache.estadisticas()["entradas"] == 0 and compartida.estadisticas()["entradas"] == 0
+    # Otra caché de proceso sobre la misma compartida ve lo que construyó esta
+    cache.obtener_o_construir(("v2", "a"), lambda: "nueva")
+    otra = CacheFiguras(compartida=compartida)
+    assert otra.obtener_o_construir(("v2", "a"), lambda: pytest.fail("no debía construir")) == "nueva"
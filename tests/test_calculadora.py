@@ -0,0 +1,89 @@
+import csv
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from calculadora import TablaPeriodos, ordinales_meses, resolver_csv
+
+# Serie con un hueco (marzo de 2021 sin dato) y otra de otra geografía
+FECHAS = pd.date_range("2020-01-01", "2023-12-01", freq="MS")
+INDICE = pd.Series(100 * 1.003 ** np.arange(len(FECHAS)), index=FECHAS).drop(pd.Timestamp("2021-03-01"))
+QUITO = INDICE * 1.1 + 2
+
+
+def ordinales(serie):
+    return serie.index.year * 12 + serie.index.month - 1
+
+
+def tabla(geografia="Nacional", clase="0"):
+    series = {("Nacional", "0"): INDICE, ("Quito", "0"): QUITO}
+    serie = series[(geografia, clase)]
+    return TablaPeriodos(ordinales(serie), serie.values)
+
+
+def esperado(serie, desde, hasta, monto=None):
+    # Cálculo directo con pandas, como lo haría la versión con DataFrame
+    try:
+        factor = serie.loc[pd.Timestamp(hasta)] / serie.loc[pd.Timestamp(desde)]
+    except KeyError:
+        return None
+    return {"factor": factor, "inflacion": (factor - 1) * 100, "monto_ajustado": None if monto is None else monto * factor}
+
+
+def test_calcular_como_pandas():
+    t = tabla()
+    rng = np.random.default_rng(1)
+    desde = rng.choice(FECHAS, 200)
+    hasta = rng.choice(FECHAS, 200)
+    montos = rng.uniform(1, 1000, 200)
+    d, _ = ordinales_meses(pd.DatetimeIndex(desde).strftime("%Y-%m"))
+    h, _ = ordinales_meses(pd.DatetimeIndex(hasta).strftime("%Y-%m-%d"))
+    resultado = t.calcular(d, h, montos)
+    for i in range(200):
+        e = esperado(INDICE, desde[i], hasta[i], montos[i])
+        if e is None:
+            assert np.isnan(resultado["factor"][i])
+        else:
+            assert resultado["factor"][i] == pytest.approx(e["factor"], rel=1e-12)
+            assert resultado["inflacion"][i] == pytest.approx(e["inflacion"], rel=1e-9)
+            assert resultado["monto_ajustado"][i] == pytest.approx(e["monto_ajustado"], rel=1e-12)
+
+
+def test_fuera_de_la_serie():
+    t = tabla()
+    resultado = t.calcular(np.array([2019 * 12, 2020 * 12]), np.array([2020 * 12, 2030 * 12]))
+    assert np.isnan(resultado["factor"]).all()
+
+
+def test_ordinales_meses():
+    ordinales_, validas = ordinales_meses(["2020-01", "2020-02-15", "", "2020-13", "mal"])
+    assert validas.tolist() == [True, True, False, False, False]
+    assert ordinales_[:2].tolist() == [2020 * 12, 2020 * 12 + 1]
+
+
+def test_resolver_csv():
+    texto = ("desde,hasta,monto,geografia\n"
+             "2020-01,2023-12,100,\n"
+             "2020-01,2023-12,100,Quito\n"
+             "2021-03,2023-12,100,\n"
+             "2020-01,2023-12,abc,\n"
+             "ayer,2023-12,100,\n"
+             "2020-01,2023-12,100,Marte\n")
+    filas = list(csv.DictReader(io.StringIO(resolver_csv(texto, tabla))))
+    assert len(filas) == 6
+    nacional, quito = esperado(INDICE, "2020-01", "2023-12", 100), esperado(QUITO, "2020-01", "2023-12", 100)
+    assert float(filas[0]["monto_ajustado"]) == pytest.approx(nacional["monto_ajustado"], rel=1e-12)
+    assert float(filas[1]["monto_ajustado"]) == pytest.approx(quito["monto_ajustado"], rel=1e-12)
+    assert float(filas[1]["inflacion"]) == pytest.approx(quito["inflacion"], rel=1e-9)
+    assert [f["error"] for f in filas] == ["", "", "mes sin dato", "monto no válido", "fecha no válida",
+                                           "serie no disponible"]
+    assert filas[3]["monto_ajustado"] == "" and filas[3]["factor"] != ""
+
+
+def test_resolver_csv_errores():
+    with pytest.raises(ValueError):
+        resolver_csv("desde,monto\n2020-01,1\n", tabla)
+    with pytest.raises(ValueError):
+        resolver_csv("desde,hasta\n" + "2020-01,2020-02\n" * 3, tabla, max_filas=2)
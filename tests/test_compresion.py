@@ -0,0 +1,112 @@
+import gzip
+import os
+
+import pytest
+from flask import Flask, Response, send_from_directory
+
+import compresion
+
+GRANDE = ("{" + ",".join(f'"{i}":{i * 1.5}' for i in range(500)) + "}").encode("utf-8")
+
+
+@pytest.fixture
+def assets(tmp_path):
+    (tmp_path / "ipc.js").write_text("var x = 1;\n" * 500)
+    return tmp_path
+
+
+@pytest.fixture
+def c(assets):
+    server = Flask(__name__)
+    server.add_url_rule("/grande", "grande", lambda: Response(GRANDE, mimetype="application/json"))
+    server.add_url_rule("/chica", "chica", lambda: Response(b'{"a":1}', mimetype="application/json"))
+    server.add_url_rule("/imagen", "imagen", lambda: Response(GRANDE, mimetype="image/png"))
+    server.add_url_rule("/assets/<path:ruta>", "assets", lambda ruta: send_from_directory(assets, ruta))
+    compresion.registrar_compresion(server, minimo=1024, carpeta_assets=str(assets))
+    return server.test_client()
+
+
+def test_gzip(c):
+    r = c.get("/grande", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["Content-Encoding"] == "gzip" and "Accept-Encoding" in r.headers["Vary"]
+    assert gzip.decompress(r.data) == GRANDE
+    assert len(r.data) < len(GRANDE)
+
+
+def test_brotli(c, monkeypatch):
+    brotli = pytest.importorskip("brotli")
+    r = c.get("/grande", headers={"Accept-Encoding": "gzip, br"})
+    assert r.headers["Content-Encoding"] == "br" and brotli.decompress(r.data) == GRANDE
+    monkeypatch.setattr(compresion, "brotli", None)
+    r = c.get("/grande", headers={"Accept-Encoding": "gzip, br"})
+    assert r.headers["Content-Encoding"] == "gzip" and gzip.decompress(r.data) == GRANDE
+
+
+def test_sin_comprimir(c):
+    assert "Content-Encoding" not in c.get("/grande").headers
+    assert "Content-Encoding" not in c.get("/chica", headers={"Accept-Encoding": "gzip"}).headers
+    assert "Content-Encoding" not in c.get("/imagen", headers={"Accept-Encoding": "gzip"}).headers
+
+
+def test_assets_con_huella(c, assets):
+    huella = str(os.path.getmtime(assets / "ipc.js"))
+    r = c.get(f"/assets/ipc.js?m={huella}", headers={"Accept-Encoding": "gzip"})
+    assert r.status_code == 200
+    assert r.cache_control.immutable and r.cache_control.max_age == compresion.UN_ANIO
+    assert gzip.decompress(r.data) == (assets / "ipc.js").read_bytes()
+
+    # Una huella que no es la del archivo actual, o ninguna, no se fija
+    for ruta in ("/assets/ipc.js?m=1", "/assets/ipc.js"):
+        r = c.get(ruta, headers={"Accept-Encoding": "gzip"})
+        assert not r.cache_control.immutable
+
+    # El ETag comprimido es débil y revalida con 304
+    r = c.get("/assets/ipc.js", headers={"Accept-Encoding": "gzip"})
+    etiqueta = r.headers["ETag"]
+    assert etiqueta.startswith("W/")
+    assert c.get("/assets/ipc.js", headers={"Accept-Encoding": "gzip", "If-None-Match": etiqueta}).status_code == 304
+
+
+def test_cache_de_comprimidos(assets, monkeypatch):
+    server = Flask(__name__)
+    server.add_url_rule("/assets/<path:ruta>", "assets", lambda ruta: send_from_directory(assets, ruta))
+    precomprimir = compresion.registrar_compresion(server, minimo=1024, carpeta_assets=str(assets))
+    c = server.test_client()
+    llamadas = []
+    original = compresion.comprimir
+    monkeypatch.setattr(compresion, "comprimir", lambda *a, **k: llamadas.append(k) or original(*a, **k))
+
+    # El resto de la query no cuenta en la clave: cambiarla no vuelve a comprimir
+    huella = str(os.path.getmtime(assets / "ipc.js"))
+    for extra in ("", "&x=1", "&x=2", "&y=3"):
+        r = c.get(f"/assets/ipc.js?m={huella}{extra}", headers={"Accept-Encoding": "gzip"})
+        assert gzip.decompress(r.data) == (assets / "ipc.js").read_bytes()
+    assert llamadas == [{"estatico": True}]
+
+
+
+def test_precomprimir(assets, monkeypatch):
+    server = Flask(__name__)
+    server.add_url_rule("/estatico/v/<path:ruta>", "estatico", lambda ruta: send_from_directory(assets, ruta))
+    precomprimir = compresion.registrar_compresion(server, minimo=1024, inmutables=("/estatico/v/",))
+    precomprimir([("/estatico/v/ipc.js", str(assets / "ipc.js"))])
+    monkeypatch.setattr(compresion, "comprimir", lambda *a, **k: pytest.fail("no debía comprimir en la petición"))
+    r = server.test_client().get("/estatico/v/ipc.js?x=1", headers={"Accept-Encoding": "gzip"})
+    assert r.cache_control.immutable and gzip.decompress(r.data) == (assets / "ipc.js").read_bytes()
+
+
+def test_cache_de_comprimidos_acotada(assets, monkeypatch):
+    monkeypatch.setattr(compresion, "COMPRIMIDOS_MAX", 3)
+    server = Flask(__name__)
+    server.add_url_rule("/estatico/v/<path:ruta>", "estatico", lambda ruta: send_from_directory(assets, "ipc.js"))
+    compresion.registrar_compresion(server, minimo=1024, inmutables=("/estatico/v/",))
+    c = server.test_client()
+    llamadas = []
+    original = compresion.comprimir
+    monkeypatch.setattr(compresion, "comprimir", lambda *a, **k: llamadas.append(a[0]) or original(*a, **k))
+    for i in range(5):
+        c.get(f"/estatico/v/{i}.js", headers={"Accept-Encoding": "gzip"})
+    # Las dos primeras salieron de la caché: se vuelven a comprimir; la última sigue en ella
+    c.get("/estatico/v/0.js", headers={"Accept-Encoding": "gzip"})
+    c.get("/estatico/v/4.js", headers={"Accept-Encoding": "gzip"})
+    assert len(llamadas) == 6
@@ -0,0 +1,56 @@
+import json
+
+import numpy as np
+import pytest
+
+import cubo_ipc
+
+
+@pytest.fixture
+def cubo(tmp_path):
+    # Dos geografías × tres clases × 14 meses desde enero de 2020; cada celda codifica su posición
+    forma = (2, 3, 14)
+    indice = np.arange(np.prod(forma), dtype=np.float64).reshape(forma)
+    indice[1, 2, :5] = np.nan
+    dimensiones = {
+        "geografias": ["Nacional", "Quito"],
+        "clases": [{"codigo": "0", "nivel": "General", "descripcion": "General"},
+                   {"codigo": "01", "nivel": "División", "descripcion": "Alimentos"},
+                   {"codigo": "011", "nivel": "Grupo", "descripcion": "Alimentos y bebidas"}],
+        "mes_inicio": 2020 * 12,
+        "meses": forma[2],
+    }
+    directorio = str(tmp_path / "cubo_prueba")
+    cubo_ipc.guardar(directorio, {"indice": indice, "variacion_mensual": -indice}, dimensiones)
+    return cubo_ipc.Cubo(directorio), indice
+
+
+def test_series_son_vistas_del_cubo(cubo):
+    cubo, indice = cubo
+    assert cubo.ordinales[0] == 2020 * 12 and len(cubo.ordinales) == 14
+    serie = cubo.serie("Quito", "011")
+    assert np.array_equal(serie, indice[1, 2], equal_nan=True)
+    assert np.shares_memory(serie, cubo.datos["indice"])
+    assert np.array_equal(cubo.serie("Nacional", "01", "variacion_mensual"), -indice[0, 1])
+    # La fila de la serie en el cubo aplanado
+    assert cubo.posicion("Quito", "01") == 4
+    assert np.array_equal(cubo.datos["indice"].reshape(6, 14)[cubo.posicion("Quito", "01")], indice[1, 1])
+    assert cubo.descripcion("01") == "Alimentos"
+
+
+def test_geografia_o_clase_desconocida(cubo):
+    cubo, _ = cubo
+    with pytest.raises(KeyError):
+        cubo.serie("Lima")
+    with pytest.raises(KeyError):
+        cubo.posicion("Quito", "99")
+
+
+def test_cargar_cubo_sigue_el_puntero(cubo, tmp_path, monkeypatch):
+    cubo, indice = cubo
+    puntero = tmp_path / "ultimo.json"
+    monkeypatch.setattr(cubo_ipc, "PUNTERO", str(puntero))
+    monkeypatch.setattr(cubo_ipc, "DIR_CACHE", str(tmp_path))
+    assert cubo_ipc.cargar_cubo() is None
+    puntero.write_text(json.dumps({"huella": "prueba"}))
+    assert np.array_equal(cubo_ipc.cargar_cubo().serie("Nacional"), indice[0, 0])
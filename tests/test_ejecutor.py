@@ -0,0 +1,38 @@
+import os
+
+import pytest
+
+from ejecutor import EjecutorFiguras
+
+
+def morir_en_el_pool(pid_padre):
+    # Simula un proceso del pool que muere a mitad de una figura; en el hilo devuelve su pid
+    if os.getpid() != pid_padre:
+        os._exit(1)
+    return os.getpid()
+
+
+@pytest.fixture
+def ejecutor():
+    ejecutor = EjecutorFiguras(procesos=1, umbral=100, cola=1)
+    yield ejecutor
+    ejecutor.cerrar()
+
+
+def test_por_peso_en_hilo_o_en_pool(ejecutor):
+    assert ejecutor.ejecutar(os.getpid, peso=99) == os.getpid()
+    assert ejecutor.ejecutar(os.getpid, peso=None) == os.getpid()
+    assert ejecutor.ejecutar(os.getpid, peso=100) != os.getpid()
+    assert (ejecutor.en_hilo, ejecutor.en_pool) == (2, 1)
+
+
+def test_sin_procesos_todo_en_hilo():
+    ejecutor = EjecutorFiguras(procesos=0)
+    assert ejecutor.ejecutar(os.getpid, peso=10 ** 9) == os.getpid()
+    assert ejecutor.en_pool == 0 and ejecutor._pool is None
+
+
+def test_proceso_muerto_construye_en_hilo_y_recrea_el_pool(ejecutor):
+    assert ejecutor.ejecutar(morir_en_el_pool, os.getpid(), peso=100) == os.getpid()
+    assert ejecutor.fallos_pool == 1 and ejecutor._pool is None
+    assert ejecutor.ejecutar(os.getpid, peso=100) != os.getpid()
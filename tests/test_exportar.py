@@ -0,0 +1,75 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import exportar
+from almacen_ipc import RUTA_NACIONAL, cargar_serie
+from conftest import decodificar, tabla_pandas
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="module")
+def exportacion(tmp_path_factory):
+    # exportar() fija el modo estático antes de importar app: se ejecuta en otro proceso
+    destino = tmp_path_factory.mktemp("estatico")
+    entorno = dict(os.environ, IPC_CACHE_COMPARTIDA="", IPC_PROCESOS_FIGURAS="0")
+    salida = subprocess.run([sys.executable, "exportar.py", "--destino", str(destino), "--procesos", "1"],
+                            cwd=RAIZ, env=entorno, capture_output=True, text=True, check=True)
+    resumen = json.loads(salida.stdout)
+    return destino, resumen, os.path.join(destino, "v", resumen["version"])
+
+
+@pytest.fixture(scope="module")
+def df():
+    # La serie del almacén con la variación anual como la calculaba la versión con pandas
+    serie = cargar_serie(RUTA_NACIONAL)
+    meses = (np.asarray(serie.meses, dtype=np.int64) - 1970 * 12).astype("datetime64[M]").astype("datetime64[ns]")
+    return tabla_pandas(pd.Series(meses), np.array(serie.valores))
+
+
+def test_todos_los_estados(exportacion, df):
+    destino, resumen, directorio = exportacion
+    anios = sorted(df["Año"].unique().tolist())
+    # Cada año, las tres tarjetas, los últimos 2, 3, 5 y 10 años y todos, por indicador
+    esperados = len(anios) + 3 + sum(n < len(anios) for n in (2, 3, 5, 10)) + 1
+    for indicador in ("anual", "mensual", "acumulada", "promedio_12m"):
+        assert len(os.listdir(os.path.join(directorio, "grafico", indicador))) == esperados
+    # El layout publicado apunta al navegador a los archivos de esta versión
+    layout = json.loads((destino / "layout.json").read_text())
+    assert f"/estatico/v/{resumen['version']}/" in json.dumps(layout)
+
+
+@pytest.mark.parametrize("clave, anios", [("anios-2020", [2020]), ("rango-2006-2016", list(range(2006, 2017)))])
+def test_figuras_como_pandas(exportacion, df, clave, anios):
+    _, _, directorio = exportacion
+    with open(os.path.join(directorio, "grafico", "anual", f"{clave}.json"), encoding="utf-8") as f:
+        figura = json.load(f)
+    filtrado = df[df["Año"].isin(anios)].sort_values(by="Mes")
+    ipc, anual = figura["data"][:2]
+    assert np.array_equal(decodificar(ipc["x"]).astype("datetime64[ms]"), filtrado["Mes"].to_numpy().astype("datetime64[ms]"))
+    assert np.array_equal(decodificar(ipc["y"]), filtrado["IPC"].to_numpy())
+    assert np.allclose(decodificar(anual["y"]), filtrado["anual"], rtol=1e-12, equal_nan=True)
+
+
+def test_serie(exportacion, df):
+    _, _, directorio = exportacion
+    with open(os.path.join(directorio, "serie.json"), encoding="utf-8") as f:
+        serie = json.load(f)
+    assert serie["IPC"] == df["IPC"].tolist()
+    assert np.allclose(np.array(serie["anual"], dtype=float), df["anual"], rtol=1e-12, equal_nan=True)
+    assert serie["etiquetas"][-1] == df["Mes"].iloc[-1].strftime("%b-%Y")
+
+
+def test_podar(tmp_path):
+    for i, nombre in enumerate(["a", "b", "c", "d"]):
+        (tmp_path / "v" / nombre).mkdir(parents=True)
+        os.utime(tmp_path / "v" / nombre, (time.time() + i, time.time() + i))
+    assert sorted(exportar._podar(str(tmp_path), "b", 2)) == ["a", "c"]
+    assert sorted(os.listdir(tmp_path / "v")) == ["b", "d"]
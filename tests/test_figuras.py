@@ -0,0 +1,76 @@
+import json
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+
+import figuras
+import indicadores
+from conftest import decodificar
+from indice_meses import SerieIndexada
+
+FECHAS = pd.date_range("2015-01-01", "2024-12-01", freq="MS")
+
+
+@pytest.fixture
+def serie(df):
+    ordinales = df["Mes"].dt.year * 12 + df["Mes"].dt.month - 1
+    return SerieIndexada(ordinales.to_numpy(), IPC=df["IPC"].to_numpy(),
+                         **{n: v[0] for n, v in indicadores.calcular(ordinales.to_numpy(), df["IPC"].to_numpy()).items()})
+
+
+def figura_original(df, anios):
+    # Trazas como las construía el callback original con go.Scatter sobre el DataFrame filtrado
+    filtrado = df[df["Año"].isin(anios)].sort_values(by="Mes")
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=filtrado["Mes"], y=filtrado["IPC"], mode="lines+markers", name="IPC General",
+                             yaxis="y1", line=dict(color="#FFDE21")))
+    fig.add_trace(go.Scatter(x=filtrado["Mes"], y=filtrado["anual"], mode="lines+markers", name="Variación Anual (%)",
+                             yaxis="y2", line=dict(color="#00FFFF", dash="dash")))
+    return fig
+
+
+@pytest.mark.parametrize("anios", [[2024], [2016, 2019, 2020], list(range(2015, 2025))])
+def test_mismos_datos_que_la_figura_original(df, serie, anios):
+    fechas, columnas = serie.vista(anios)
+    nueva = json.loads(figuras.figura_json(fechas, columnas, "IPC General", "anual"))
+    original = figura_original(df, anios)
+    assert len(nueva["data"]) == 2
+    for traza, referencia in zip(nueva["data"], original.data):
+        assert (traza["type"], traza["mode"], traza["name"]) == ("scatter", referencia.mode, referencia.name)
+        # Los meses sin variación anual quedan como huecos (NaN) en las dos
+        assert np.array_equal(decodificar(traza["x"]).astype("datetime64[ms]"),
+                              np.asarray(referencia.x, dtype="datetime64[ms]"))
+        assert np.allclose(decodificar(traza["y"]), np.asarray(referencia.y, dtype=np.float64), rtol=1e-12, equal_nan=True)
+
+
+def test_layout_precompilado_igual_al_de_plotly():
+    for indicador in figuras.INDICADORES:
+        layout = json.loads(figuras.layout_serie(indicador))
+        completo = figuras.construir_figura([], {}, indicador=indicador).to_plotly_json()["layout"]
+        datos_plantilla = completo["template"].pop("data")
+        layout_datos = layout["template"].pop("data")
+        assert layout == json.loads(json.dumps(completo))
+        assert set(layout_datos) == set(figuras.TIPOS_TRAZA) & set(datos_plantilla)
+
+
+def test_vista_larga_submuestreada():
+    n = 3000
+    fechas = (np.arange(n) + 1800 * 12 - 1970 * 12).astype("datetime64[M]").astype("datetime64[ns]")
+    columnas = {"IPC": np.linspace(100, 200, n), "anual": np.sin(np.arange(n) / 50)}
+    figura = json.loads(figuras.figura_json(fechas, columnas, "IPC General", "anual", puntos=300))
+    for traza in figura["data"]:
+        assert traza["type"] == "scattergl" and traza["mode"] == "lines"
+        x = decodificar(traza["x"])
+        assert len(x) == 300 and np.all(np.diff(x) > 0)
+    ipc = figura["data"][0]
+    assert decodificar(ipc["y"])[[0, -1]].tolist() == [100.0, 200.0]
+
+
+def test_ventana_de_zoom():
+    fechas = FECHAS.values
+    columnas = {"IPC": np.arange(len(fechas), dtype=float), "anual": np.zeros(len(fechas))}
+    ventana = (np.datetime64("2020-01-01"), np.datetime64("2021-06-30"))
+    figura = json.loads(figuras.figura_json(fechas, columnas, "IPC General", "anual", ventana))
+    assert figura["layout"]["xaxis"]["range"] == ["2020-01-01", "2021-06-30"]
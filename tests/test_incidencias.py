@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+import incidencias
+
+
+@pytest.fixture
+def laspeyres():
+    # Índice general de Laspeyres: suma ponderada de doce divisiones con base 100 en diciembre de 2014
+    rng = np.random.default_rng(5)
+    meses = 60
+    ordinales = np.arange(2014 * 12 + 11, 2014 * 12 + 11 + meses)
+    pesos = rng.dirichlet(np.ones(12))
+    indices = 100 * np.exp(np.cumsum(rng.normal(0.002, 0.01, (12, meses)), axis=1))
+    indices[:, 0] = 100
+    return ordinales, pesos, indices, pesos @ indices
+
+
+def test_suman_la_variacion_general(laspeyres):
+    ordinales, pesos, indices, general = laspeyres
+    resultado = incidencias.descomponer(ordinales, pesos, indices, general)
+    incidencias.verificar(ordinales, resultado, general)
+    # Anual a mano para un mes: (G_t / G_t−12 − 1) · 100
+    assert resultado["anual"][:, 30].sum() == pytest.approx((general[30] / general[18] - 1) * 100)
+    # La primera acumulada es la de enero frente al diciembre base; antes del primer mes con referencia, NaN
+    assert np.isnan(resultado["mensual"][:, 0]).all() and np.isnan(resultado["anual"][:, :12]).all()
+    assert resultado["acumulada"][:, 1].sum() == pytest.approx((general[1] / general[0] - 1) * 100)
+
+
+def test_verificar_detecta_una_division_alterada(laspeyres):
+    ordinales, pesos, indices, general = laspeyres
+    resultado = incidencias.descomponer(ordinales, pesos, indices, general)
+    resultado["mensual"][3, 20] += 0.01
+    with pytest.raises(ValueError, match="mensual"):
+        incidencias.verificar(ordinales, resultado, general)
+
+
+def test_guardar_y_cargar(laspeyres, tmp_path):
+    ordinales, pesos, indices, general = laspeyres
+    guardadas = incidencias.Incidencias(ordinales=ordinales, divisiones=np.array(incidencias.DIVISIONES), pesos=pesos,
+                                        **incidencias.descomponer(ordinales, pesos, indices, general))
+    assert incidencias.cargar(str(tmp_path)) is None
+    incidencias.guardar(str(tmp_path), guardadas)
+    cargadas = incidencias.cargar(str(tmp_path))
+    assert cargadas.divisiones.tolist() == list(incidencias.DIVISIONES)
+    assert np.array_equal(cargadas.anual, guardadas.anual, equal_nan=True)
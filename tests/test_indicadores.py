@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import indicadores
+from almacen_ipc import ordinal
+
+
+@pytest.fixture
+def paneles():
+    # Tres series de 2005 a 2024 con meses sin dato al principio, al final y en medio de una de ellas
+    rng = np.random.default_rng(3)
+    ordinales = np.arange(ordinal(2005, 1), ordinal(2025, 1))
+    indices = 100 * np.exp(np.cumsum(rng.normal(0.003, 0.01, (3, len(ordinales))), axis=1))
+    indices[1, :30] = np.nan
+    indices[2, 100:103] = np.nan
+    indices[2, -5:] = np.nan
+    return ordinales, indices
+
+
+def como_pandas(ordinales, fila):
+    # Las mismas variaciones con pandas sobre una serie mensual, como las calcularía la versión original
+    serie = pd.Series(fila, index=pd.PeriodIndex.from_ordinals(ordinales - 1970 * 12, freq="M"))
+    diciembre = serie[serie.index.month == 12]
+    anterior = pd.Series(diciembre.to_numpy(), index=diciembre.index.year + 1).reindex(serie.index.year).to_numpy()
+    medias = serie.rolling(12).mean()
+    return {
+        "mensual": serie.div(serie.shift(1)).sub(1).mul(100),
+        "acumulada": (serie / anterior - 1) * 100,
+        "anual": serie.div(serie.shift(12)).sub(1).mul(100),
+        "promedio_12m": medias.div(medias.shift(12)).sub(1).mul(100),
+    }
+
+
+def test_como_pandas(paneles):
+    ordinales, indices = paneles
+    valores = indicadores.calcular(ordinales, indices)
+    for fila in range(len(indices)):
+        esperados = como_pandas(ordinales, indices[fila])
+        for nombre in indicadores.NOMBRES:
+            assert np.allclose(valores[nombre][fila], esperados[nombre], rtol=1e-12, equal_nan=True), nombre
+
+
+def test_series_cortas():
+    ordinales = np.arange(ordinal(2024, 3), ordinal(2024, 9))
+    valores = indicadores.calcular(ordinales, 100 + np.arange(len(ordinales)))
+    assert np.isnan(valores["anual"]).all() and np.isnan(valores["promedio_12m"]).all()
+    assert valores["mensual"][0, 1] == pytest.approx(1.0)
+    # Sin el diciembre anterior no hay variación acumulada
+    assert np.isnan(valores["acumulada"]).all()
+
+
+def test_rebasado(paneles):
+    ordinales, indices = paneles
+    motor = indicadores.Indicadores(ordinales, indices, "v")
+    base = ordinal(2015, 6)
+    posicion = int(base - ordinales[0])
+    rebasados = motor.rebasado(base)
+    assert np.allclose(rebasados[:, posicion], 100) and np.allclose(rebasados, indices / indices[:, [posicion]] * 100,
+                                                                    equal_nan=True)
+    # Una fila, igual que la del cubo completo; las variaciones no dependen de la base
+    columnas = motor.fila(1, base)
+    assert np.array_equal(columnas["IPC"], rebasados[1], equal_nan=True)
+    assert np.array_equal(columnas["anual"], motor.valores["anual"][1], equal_nan=True)
+    for fuera in (ordinales[0] - 1, ordinales[-1] + 1):
+        with pytest.raises(ValueError):
+            motor.rebasado(fuera)
+
+
+@pytest.mark.parametrize("desde", [0, 5, 30, 101, 230, 239, 240])
+def test_recalcular_desde_una_columna(paneles, desde):
+    ordinales, indices = paneles
+    anteriores = indices.copy()
+    anteriores[:, desde:] *= 1.02
+    motor = indicadores.Indicadores(ordinales, anteriores, "v1").actualizado(ordinales, indices, desde, "v2")
+    completos = indicadores.calcular(ordinales, indices)
+    for nombre in indicadores.NOMBRES:
+        assert np.allclose(motor.valores[nombre], completos[nombre], rtol=1e-13, equal_nan=True), nombre
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from indice_meses import IndiceMeses, SerieIndexada
+
+
+@pytest.fixture
+def meses():
+    return pd.date_range("2006-01-01", "2025-06-01", freq="MS")
+
+
+def ordinales(meses):
+    return (meses.year * 12 + meses.month - 1).to_numpy()
+
+
+@pytest.mark.parametrize("fecha", ["2006-01-01", "2012-07-01", "2012-07-15", "2012-07-17T00:00:00",
+                                   "2019-02-28", "1990-05-01", "2030-01-01"])
+def test_posicion_del_mes_mas_cercano(meses, fecha):
+    # Lo mismo que restar la fecha a toda la columna y tomar el mínimo de la diferencia absoluta
+    esperada = int(np.argmin(np.abs(meses - pd.Timestamp(fecha))))
+    assert IndiceMeses(ordinales(meses)).posicion(fecha) == esperada
+
+
+def test_indice_vacio():
+    with pytest.raises(LookupError):
+        IndiceMeses([]).posicion("2020-01-01")
+
+
+@pytest.mark.parametrize("anios", [[2006], [2008, 2007], [2006, 2010, 2025], [1999, 2030], []])
+def test_vista_por_anios(meses, anios):
+    serie = SerieIndexada(ordinales(meses), IPC=np.arange(len(meses), dtype=float))
+    fechas, columnas = serie.vista(anios)
+    mascara = meses.year.isin(anios)
+    assert np.array_equal(fechas, meses[mascara].to_numpy())
+    assert np.array_equal(columnas["IPC"], np.flatnonzero(mascara))
+
+
+def test_anios_contiguos_sin_copia(meses):
+    serie = SerieIndexada(ordinales(meses), IPC=np.arange(len(meses), dtype=float))
+    assert serie.anios.posiciones([2011, 2010, 2012]) == slice(48, 84)
+    assert np.shares_memory(serie.vista([2010, 2011])[1]["IPC"], serie.columnas["IPC"])
+
+
+def test_vista_rango_y_fechas(meses):
+    serie = SerieIndexada(ordinales(meses), IPC=np.arange(len(meses), dtype=float))
+    fechas, _ = serie.vista_rango(2020, 2030)
+    assert np.array_equal(fechas, meses[meses.year >= 2020].to_numpy())
+    assert serie.vista_rango(2020, 2030) is serie.vista_rango(2020, 2030)
+    fechas, columnas = serie.vista_fechas(np.datetime64("2012-06-15"), np.datetime64("2013-02-01"))
+    esperadas = meses[(meses >= "2012-06-15") & (meses <= "2013-02-01")]
+    assert np.array_equal(fechas, esperadas.to_numpy()) and len(columnas["IPC"]) == 8
@@ -0,0 +1,95 @@
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+import indicadores
+import ingesta_excel
+from almacen_ipc import cargar_serie, escribir_serie
+
+# El libro más liviano de la publicación: la serie nacional y sus variaciones publicadas
+LIBRO = next(r for r in ingesta_excel.libros_origen() if "indicadores_descriptivos" in r)
+
+
+@pytest.fixture(scope="module")
+def ingesta(tmp_path_factory):
+    origen = tmp_path_factory.mktemp("origen")
+    shutil.copy(LIBRO, origen)
+    with pytest.MonkeyPatch.context() as parche:
+        parche.setattr(ingesta_excel, "DIR_CACHE", str(tmp_path_factory.mktemp("cache")))
+        huella, destino = ingesta_excel.ingerir(str(origen), procesos=1)
+        yield str(origen), huella, destino, ingesta_excel.cargar_tabla(destino)
+
+
+def test_serie_nacional_reproduce_las_variaciones_publicadas(ingesta):
+    *_, tabla = ingesta
+    meses, valores = ingesta_excel.serie_nacional(tabla)
+    assert np.all(np.diff(meses) == 1) and np.all(valores > 0)
+    # La variación anual calculada del índice es la que publica el mismo libro
+    publicados, anual = ingesta_excel.seleccionar(tabla, "variacion_anual")
+    calculada = indicadores.calcular(meses, valores)["anual"][0][np.searchsorted(meses, publicados)]
+    assert np.allclose(calculada, anual, atol=1e-9)
+
+
+def test_misma_huella_no_vuelve_a_procesar(ingesta, monkeypatch):
+    origen, huella, destino, _ = ingesta
+    monkeypatch.setattr(ingesta_excel, "DIR_CACHE", os.path.dirname(destino))
+    monkeypatch.setattr(ingesta_excel, "construir_tabla", lambda *a: pytest.fail("no debía procesar los libros"))
+    assert ingesta_excel.ingerir(origen) == (huella, destino)
+
+
+def test_almacen_nacional_incremental(ingesta, tmp_path, monkeypatch):
+    *_, tabla = ingesta
+    meses, valores = ingesta_excel.serie_nacional(tabla)
+    # Un almacén de la publicación anterior: tres meses menos y uno que luego se revisó
+    anteriores = valores[:-3].copy()
+    anteriores[100] += 1
+    escribir_serie(tmp_path, meses[:-3], anteriores)
+    monkeypatch.setattr(ingesta_excel, "escribir_serie", lambda *a: pytest.fail("debía actualizar sin reescribir"))
+    assert ingesta_excel.actualizar_almacen_nacional(tabla, str(tmp_path))
+    serie = cargar_serie(str(tmp_path))
+    assert np.array_equal(serie.meses, meses) and np.array_equal(serie.valores, valores)
+    assert not ingesta_excel.actualizar_almacen_nacional(tabla, str(tmp_path))
+
+
+def armar(directorio, contenido):
+    os.makedirs(directorio)
+    with open(os.path.join(directorio, "dimensiones.json"), "w") as f:
+        f.write(contenido)
+
+
+def leer(directorio):
+    with open(os.path.join(directorio, "dimensiones.json")) as f:
+        return f.read()
+
+
+def test_reemplazar_cubo(tmp_path):
+    cubo = str(tmp_path / "cubo_h")
+    armar(cubo, "viejo")
+    armar(cubo + ".armando", "nuevo")
+    ingesta_excel.reemplazar_cubo(cubo + ".armando", cubo)
+    assert leer(cubo) == "nuevo" and sorted(os.listdir(tmp_path)) == ["cubo_h"]
+    # Sin cubo previo (primera ingesta de esa huella) solo se mueve
+    armar(str(tmp_path / "otro.armando"), "primero")
+    ingesta_excel.reemplazar_cubo(str(tmp_path / "otro.armando"), str(tmp_path / "otro"))
+    assert leer(str(tmp_path / "otro")) == "primero"
+
+
+def test_reemplazar_cubo_restaura_el_anterior_si_falla(tmp_path, monkeypatch):
+    cubo = str(tmp_path / "cubo_h")
+    armar(cubo, "viejo")
+    armar(cubo + ".armando", "nuevo")
+    reemplazar = os.replace
+
+    def fallar_con_el_nuevo(origen, destino):
+        if origen.endswith(".armando"):
+            # Entre los dos renombrados no hay cubo: una recarga en este punto falla y conserva la anterior
+            assert not os.path.exists(cubo)
+            raise OSError("disco lleno")
+        reemplazar(origen, destino)
+
+    monkeypatch.setattr(os, "replace", fallar_con_el_nuevo)
+    with pytest.raises(OSError):
+        ingesta_excel.reemplazar_cubo(cubo + ".armando", cubo)
+    assert leer(cubo) == "viejo" and not os.path.exists(cubo + ".anterior")
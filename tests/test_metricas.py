@@ -0,0 +1,49 @@
+import pytest
+from flask import Flask, jsonify
+
+import metricas
+
+
+@pytest.fixture
+def cliente(monkeypatch):
+    monkeypatch.setattr(metricas, "ACTIVAS", True)
+    monkeypatch.setattr(metricas, "_fuentes", [])
+    server = Flask(__name__)
+
+    @metricas.instrumentar("prueba_callback")
+    def callback():
+        with metricas.fase("prueba_callback", "figura"):
+            return "x" * 5000
+
+    server.add_url_rule("/callback", "callback", lambda: jsonify(figura=callback()))
+    metricas.registrar_fuente(lambda: {"ipc_prueba_aciertos": ("counter", "Aciertos de prueba", 3)})
+    metricas.registrar_endpoint(server)
+    return server.test_client()
+
+
+def lineas(texto, prefijo):
+    return [linea for linea in texto.splitlines() if linea.startswith(prefijo)]
+
+
+def test_expone_tiempos_tamanos_y_fuentes(cliente):
+    cuerpo = cliente.get("/callback").data
+    texto = cliente.get("/metrics").get_data(as_text=True)
+    assert lineas(texto, 'ipc_callback_duracion_segundos_count{callback="prueba_callback"}') != []
+    assert lineas(texto, 'ipc_callback_fase_segundos_count{callback="prueba_callback",fase="figura"}') != []
+    # El tamaño es el del cuerpo que se envió, en el bucket acumulado que lo contiene
+    assert f'ipc_callback_respuesta_bytes_sum{{callback="prueba_callback"}} {float(len(cuerpo))}' in texto
+    assert 'ipc_callback_respuesta_bytes_bucket{callback="prueba_callback",le="4096"} 0' in texto
+    assert 'ipc_callback_respuesta_bytes_bucket{callback="prueba_callback",le="16384"} 1' in texto
+    assert "# TYPE ipc_prueba_aciertos counter\nipc_prueba_aciertos 3" in texto
+
+
+def test_desactivadas_no_tocan_la_funcion(monkeypatch):
+    monkeypatch.setattr(metricas, "ACTIVAS", False)
+
+    def callback():
+        return 1
+
+    assert metricas.instrumentar("otro")(callback) is callback
+    server = Flask(__name__)
+    metricas.registrar_endpoint(server)
+    assert server.test_client().get("/metrics").status_code == 404
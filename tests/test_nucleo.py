@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+import indicadores
+import nucleo
+
+
+def referencia(pesos, indices, desfase=12, recorte=nucleo.RECORTE):
+    # Cada mes por separado, con listas ordenadas en Python
+    meses = indices.shape[1]
+    mediana, recortada = np.full(meses, np.nan), np.full(meses, np.nan)
+    for t in range(desfase, meses):
+        filas = [(indices[i, t] / indices[i, t - desfase] - 1) * 100 for i in range(len(pesos))]
+        efectivos = [pesos[i] * indices[i, t - desfase] for i in range(len(pesos))]
+        datos = sorted((v, e) for v, e in zip(filas, efectivos) if not np.isnan(v))
+        total = sum(e for _, e in datos)
+        if not datos or total <= 0:
+            continue
+        acumulado = 0.0
+        for v, e in datos:
+            acumulado += e
+            if acumulado >= total / 2:
+                mediana[t] = v
+                break
+        suma = peso = acumulado = 0.0
+        for v, e in datos:
+            dentro = max(min(acumulado + e, total * (1 - recorte)) - max(acumulado, total * recorte), 0.0)
+            suma, peso, acumulado = suma + v * dentro, peso + dentro, acumulado + e
+        recortada[t] = suma / peso
+    return mediana, recortada
+
+
+def test_ejemplo_a_mano():
+    # Con el índice previo igual en todos, los pesos efectivos son las ponderaciones
+    pesos = np.array([0.1, 0.2, 0.3, 0.2, 0.2])
+    variaciones = np.array([5.0, 1.0, 3.0, 2.0, 4.0])
+    indices = np.stack([np.full(len(pesos), 100.0), 100 + variaciones], axis=1)
+    resultado = nucleo.calcular(np.array(["01", "02", "03", "04", "05"]), pesos, indices, desfase=1)
+    # Acumulado en orden: 0.2 (1 %), 0.4 (2 %), 0.7 (3 %) -> mediana 3 %
+    assert resultado["mediana"][1] == pytest.approx(3.0)
+    # Sin el 10 % de cada cola: la mitad del peso de 1 % (0.2) y todo el de 5 % (0.1)
+    assert resultado["media_recortada"][1] == pytest.approx((1 * 0.1 + 2 * 0.2 + 3 * 0.3 + 4 * 0.2) / 0.8)
+    # Sin alimentos (01): media ponderada de los demás
+    assert resultado["sin_alimentos"][1] == pytest.approx((1 * 0.2 + 3 * 0.3 + 2 * 0.2 + 4 * 0.2) / 0.9)
+    assert np.isnan(resultado["mediana"][0])
+
+
+@pytest.mark.parametrize("recorte", [0.0, 0.1, 0.25])
+def test_coincide_con_referencia(recorte):
+    rng = np.random.default_rng(7)
+    componentes, meses = 12, 60
+    pesos = rng.random(componentes)
+    pesos /= pesos.sum()
+    indices = 100 * np.exp(np.cumsum(rng.normal(0.003, 0.01, (componentes, meses)), axis=1))
+    indices[3, 20:26] = np.nan  # meses sin dato de un componente
+    resultado = nucleo.calcular(np.array([f"{i:02d}" for i in range(1, componentes + 1)]), pesos, indices,
+                                recorte=recorte)
+    mediana, recortada = referencia(pesos, indices, recorte=recorte)
+    assert np.allclose(resultado["mediana"], mediana, equal_nan=True)
+    assert np.allclose(resultado["media_recortada"], recortada, equal_nan=True)
+
+
+def test_sin_recorte_reproduce_la_variacion_general():
+    rng = np.random.default_rng(3)
+    pesos = np.array([0.3, 0.5, 0.2])
+    indices = 100 * np.exp(np.cumsum(rng.normal(0.002, 0.01, (3, 40)), axis=1))
+    general = (pesos[:, None] * indices).sum(axis=0) / pesos.sum()
+    ordinales = np.arange(2020 * 12, 2020 * 12 + 40)
+    nucleo.verificar(ordinales, pesos, indices, general)
+    anual = indicadores.calcular(ordinales, general)["anual"][0]
+    sin_recorte = nucleo.media_recortada(*nucleo.ordenar(*nucleo.pesos_efectivos(pesos, indices)), 0.0)
+    assert np.allclose(sin_recorte, anual, equal_nan=True)
+    with pytest.raises(ValueError):
+        nucleo.verificar(ordinales, pesos, indices, general * 1.01 ** np.arange(40))
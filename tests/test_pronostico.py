@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+import pronostico
+
+ORDINALES = np.arange(2010 * 12, 2025 * 12)
+
+
+def series(n_series, semilla=0):
+    rng = np.random.default_rng(semilla)
+    estacional = rng.normal(0.003, 0.004, (n_series, 12))
+    variaciones = estacional[:, ORDINALES % 12] + rng.normal(0, 0.002, (n_series, len(ORDINALES)))
+    return 100 * np.exp(np.cumsum(variaciones, axis=1))
+
+
+def referencia(indices, ventana=pronostico.VENTANA):
+    # Mínimos cuadrados de una serie con la matriz de diseño explícita (np.linalg.lstsq): ``ventana``
+    # ecuaciones, cada variación con la anterior
+    y = np.diff(np.log(indices))[-ventana - 1:]
+    meses = ORDINALES[1:][-ventana - 1:]
+    diseno = np.column_stack([np.eye(12)[meses[1:] % 12], y[:-1]])
+    coeficientes, *_ = np.linalg.lstsq(diseno, y[1:], rcond=None)
+    return coeficientes
+
+
+def test_coeficientes_como_lstsq():
+    indices = series(3)
+    y = np.full(indices.shape, np.nan)
+    y[:, 1:] = np.diff(np.log(indices), axis=1)
+    inicio = len(ORDINALES) - pronostico.VENTANA - 1
+    coeficientes, _, observaciones = pronostico.estimar(ORDINALES[inicio:], y[:, inicio:])
+    for fila in range(3):
+        assert np.allclose(coeficientes[fila], referencia(indices[fila]), atol=1e-8)
+    assert observaciones.tolist() == [pronostico.VENTANA] * 3
+
+
+def test_por_lotes_igual_que_una_por_una():
+    indices = series(20, semilla=1)
+    indices[4, :100] = np.nan  # serie que empieza más tarde
+    indices[7, -3:] = np.nan  # serie con los últimos meses sin publicar
+    lote = pronostico.ajustar(ORDINALES, indices)
+    for fila in range(len(indices)):
+        sola = pronostico.ajustar(ORDINALES, indices[fila])
+        for campo in pronostico.Pronostico._fields:
+            assert np.allclose(getattr(lote, campo)[fila], getattr(sola, campo)[0], rtol=1e-9, equal_nan=True)
+    assert lote.ultimo[7] == ORDINALES[-4] and lote.ultimo[0] == ORDINALES[-1]
+
+
+def test_serie_sin_ruido():
+    # Efecto estacional puro: el pronóstico lo repite y las bandas se cierran sobre la media
+    estacional = np.linspace(-0.004, 0.008, 12)
+    indices = 100 * np.exp(np.cumsum(estacional[ORDINALES % 12]))
+    p = pronostico.ajustar(ORDINALES, indices)
+    futuros = ORDINALES[-1] + np.arange(1, pronostico.HORIZONTE + 1)
+    assert np.allclose(p.media[0], np.exp(np.cumsum(estacional[futuros % 12])), rtol=1e-9)
+    assert np.allclose(p.inferior_95[0], p.media[0], rtol=1e-6) and np.allclose(p.superior_95[0], p.media[0], rtol=1e-6)
+
+
+def test_bandas_y_series_cortas():
+    indices = series(2, semilla=2)
+    indices[1, :-pronostico.MIN_OBSERVACIONES] = np.nan
+    p = pronostico.ajustar(ORDINALES, indices)
+    assert np.all(p.inferior_95[0] < p.inferior_80[0]) and np.all(p.inferior_80[0] < p.media[0])
+    assert np.all(p.media[0] < p.superior_80[0]) and np.all(p.superior_80[0] < p.superior_95[0])
+    # Las bandas se abren con el horizonte
+    assert np.all(np.diff(p.superior_95[0] / p.inferior_95[0]) > 0)
+    assert np.isnan(p.media[1]).all()
+
+
+def test_guardar_y_cargar(tmp_path):
+    p = pronostico.ajustar(ORDINALES, series(2))
+    assert pronostico.cargar(tmp_path) is None
+    pronostico.guardar(tmp_path, p)
+    pronostico.guardar(tmp_path, p._replace(ultimo=p.ultimo + 1), pronostico.ARCHIVO_NACIONAL)
+    assert np.array_equal(pronostico.cargar(tmp_path).media, p.media, equal_nan=True)
+    assert np.array_equal(pronostico.cargar(tmp_path, pronostico.ARCHIVO_NACIONAL).ultimo, p.ultimo + 1)
+    assert sorted(f.name for f in tmp_path.iterdir()) == [pronostico.ARCHIVO, pronostico.ARCHIVO_NACIONAL]
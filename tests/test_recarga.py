@@ -0,0 +1,78 @@
+import json
+
+import numpy as np
+import pytest
+
+import cubo_ipc
+from almacen_ipc import escribir_serie, ordinal
+from recarga import Recargador
+
+
+def test_recarga_al_cambiar_la_huella():
+    huella = {"valor": 1}
+    cargas = []
+    recargador = Recargador(lambda: cargas.append(len(cargas)) or f"v{len(cargas)}", lambda: huella["valor"], 1e-9)
+    assert recargador.vigente() is None
+    assert recargador.actual() == "v1" and recargador.actual() == "v1"
+    huella["valor"] = 2
+    assert recargador.actual() == "v2" and recargador.recargas == 1
+
+
+def test_conserva_la_instantanea_si_la_carga_falla():
+    huella = {"valor": 1}
+    estado = {"falla": False}
+
+    def cargar():
+        if estado["falla"]:
+            raise OSError("ingesta a medio escribir")
+        return f"v{huella['valor']}"
+
+    recargador = Recargador(cargar, lambda: huella["valor"], 1e-9)
+    assert recargador.actual() == "v1"
+    huella["valor"], estado["falla"] = 2, True
+    assert recargador.actual() == "v1" and recargador.errores == 1
+    # Se reintenta en la revisión siguiente
+    estado["falla"] = False
+    assert recargador.actual() == "v2"
+
+
+def _cubo(directorio, valor):
+    dimensiones = {"geografias": ["Nacional", "Quito"],
+                   "clases": [{"codigo": "0", "nivel": "General", "descripcion": "General"}],
+                   "mes_inicio": ordinal(2020, 1), "meses": 36}
+    datos = {medida: np.full((2, 1, 36), valor) for medida in cubo_ipc.MEDIDAS}
+    cubo_ipc.guardar(str(directorio), datos, dimensiones)
+
+
+def test_cubo_ilegible_no_publica_una_instantanea_sin_cubo(tmp_path, monkeypatch):
+    import app
+
+    monkeypatch.setattr(cubo_ipc, "DIR_CACHE", str(tmp_path))
+    monkeypatch.setattr(cubo_ipc, "PUNTERO", str(tmp_path / "actual.json"))
+    almacen = tmp_path / "nacional"
+    escribir_serie(almacen, np.arange(ordinal(2020, 1), ordinal(2023, 1)), np.linspace(100, 110, 36))
+
+    def apuntar(huella):
+        (tmp_path / "actual.json").write_text(json.dumps({"huella": huella}))
+
+    _cubo(cubo_ipc.ruta_cubo("a"), 100.0)
+    apuntar("a")
+    recargador = Recargador(lambda: app.DatosApp(str(almacen), anterior=recargador.vigente()),
+                            lambda: (tmp_path / "actual.json").read_text(), 1e-9)
+    primera = recargador.actual()
+    assert primera.cubo.directorio == cubo_ipc.ruta_cubo("a")
+
+    # Un puntero a un cubo que no existe (o no se puede leer) falla la carga: sigue la instantánea anterior
+    apuntar("b")
+    with pytest.raises(OSError):
+        cubo_ipc.cargar_cubo()
+    assert recargador.actual() is primera and recargador.errores == 1
+
+    # Cuando el cubo aparece, la recarga lo publica
+    _cubo(cubo_ipc.ruta_cubo("b"), 120.0)
+    segunda = recargador.actual()
+    assert segunda is not primera and segunda.cubo.directorio == cubo_ipc.ruta_cubo("b")
+    assert segunda.obtener_serie("Quito").columnas["IPC"][0] == 120.0
+    # La serie nacional no cambió: se reutilizan sus indicadores
+    assert np.array_equal(segunda.indicadores_nacional.valores["anual"], primera.indicadores_nacional.valores["anual"],
+                          equal_nan=True)
@@ -0,0 +1,65 @@
+import math
+
+import numpy as np
+import pytest
+
+from submuestreo import lttb
+
+
+def lttb_referencia(x, y, puntos):
+    # Algoritmo original (Steinarsson, 2013) punto a punto, sin NumPy
+    n = len(x)
+    if n <= puntos:
+        return list(range(n))
+    cada = (n - 2) / (puntos - 2)
+    elegidos, anterior = [0], 0
+    for i in range(puntos - 2):
+        inicio_prom = math.floor((i + 1) * cada) + 1
+        fin_prom = min(math.floor((i + 2) * cada) + 1, n)
+        prom_x = sum(x[inicio_prom:fin_prom]) / (fin_prom - inicio_prom)
+        prom_y = sum(y[inicio_prom:fin_prom]) / (fin_prom - inicio_prom)
+        inicio, fin = math.floor(i * cada) + 1, math.floor((i + 1) * cada) + 1
+        mejor, area_max = inicio, -1.0
+        for j in range(inicio, fin):
+            area = abs((x[anterior] - prom_x) * (y[j] - y[anterior]) - (x[anterior] - x[j]) * (prom_y - y[anterior]))
+            if area > area_max:
+                mejor, area_max = j, area
+        elegidos.append(mejor)
+        anterior = mejor
+    return elegidos + [n - 1]
+
+
+@pytest.mark.parametrize("n, puntos", [(50, 10), (1000, 100), (5000, 1000), (20000, 100), (3001, 3)])
+def test_coincide_con_referencia(n, puntos):
+    # Cubetas pequeñas (recorridas en Python) y grandes (con NumPy)
+    rng = np.random.default_rng(n)
+    x = np.arange(n, dtype=np.float64) * 30.4
+    y = np.cumsum(rng.normal(size=n))
+    assert lttb(x, y, puntos).tolist() == lttb_referencia(x.tolist(), y.tolist(), puntos)
+
+
+def test_serie_corta_devuelve_todo():
+    y = np.array([1.0, 2.0, 3.0])
+    assert lttb(np.arange(3), y, 10).tolist() == [0, 1, 2]
+
+
+def test_descarta_nan():
+    rng = np.random.default_rng(0)
+    y = rng.normal(size=500)
+    y[::7] = np.nan
+    x = np.arange(500, dtype=np.float64)
+    posiciones = lttb(x, y, 50)
+    validas = np.flatnonzero(~np.isnan(y))
+    assert len(posiciones) == 50
+    assert not np.isnan(y[posiciones]).any()
+    assert posiciones[0] == validas[0] and posiciones[-1] == validas[-1]
+    esperadas = lttb_referencia(x[validas].tolist(), y[validas].tolist(), 50)
+    assert posiciones.tolist() == validas[esperadas].tolist()
+
+
+def test_conserva_picos():
+    y = np.zeros(10000)
+    y[1234], y[8765] = 50.0, -50.0
+    posiciones = lttb(np.arange(10000, dtype=np.float64), y, 100)
+    assert 1234 in posiciones and 8765 in posiciones
+    assert np.all(np.diff(posiciones) > 0)
@@ -0,0 +1,16 @@
+"""Punto de entrada WSGI para producción.
+
+    gunicorn -c gunicorn.conf.py wsgi:server
+
+Importar ``app`` no lee datos; ``precargar()`` carga la instantánea (serie,
+cubo, índices), el layout y la figura inicial. Con ``preload_app`` esto se
+ejecuta una sola vez en el proceso maestro antes del fork, de modo que los
+workers arrancan con todo construido y lo comparten en copy-on-write. En modo
+estático (``IPC_ESTATICO``, ver ``exportar.py``) solo se lee el layout exportado.
+"""
+
+from app import app, precargar
+
+precargar()
+
+server = app.server